@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BlogConfig(AppConfig):
     name = "apps.blog"
+
+    def ready(self) -> None:
+        from apps.blog.search import restore_sqlite_search
+
+        post_migrate.connect(restore_sqlite_search, sender=self)
@@ -0,0 +1,273 @@
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.urls import URLPattern, re_path
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.blog.cache import (
+    aget_comments_token,
+    aget_fragments,
+    aget_fresh,
+    aget_post_detail,
+    alist_page_cache_key,
+    aset_fragments,
+    aset_post_detail,
+    cache_language,
+    comments_token_datetime,
+    fragment_version,
+    list_modified_datetime,
+    payload_counters,
+)
+from apps.blog.filters import PostFeedFilter
+from apps.blog.formatting import localize_post_dates, resolve_date_locale
+from apps.blog.models import Post
+from apps.blog.pagination import CachedPageNumberPagination, KeysetPagination
+from apps.blog.serializers import CommentReadSerializer, PostReadSerializer
+from apps.core.conditional import conditional_response, make_etag, set_validators
+
+logger = logging.getLogger("blog")
+
+# Native async GET handlers for the hottest PostViewSet reads. They only
+# cover the cached, JSON, happy path; anything else (cache misses that need
+# a rebuild, drafts, invalid pages, bad tokens, browsable API) raises
+# UseSyncView and the request is handed to the sync viewset unchanged, so
+# responses stay identical to the sync ones.
+
+
+class UseSyncView(Exception):
+    pass
+
+
+async def _authenticate(request: HttpRequest) -> Any:
+    # JWTAuthentication.authenticate() with the user lookup done through the
+    # async ORM. Any failure is left to DRF so the error response matches.
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return AnonymousUser()
+    user_model = get_user_model()
+    try:
+        token = authenticator.get_validated_token(raw_token)
+        user = await user_model.objects.aget(
+            **{jwt_settings.USER_ID_FIELD: token[jwt_settings.USER_ID_CLAIM]}
+        )
+    except (InvalidToken, TokenError, KeyError, user_model.DoesNotExist):
+        raise UseSyncView from None
+    if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise UseSyncView
+    if jwt_settings.CHECK_REVOKE_TOKEN and token.get(
+        jwt_settings.REVOKE_TOKEN_CLAIM
+    ) != get_md5_hash_password(user.password):
+        raise UseSyncView
+    return user
+
+
+async def _drf_request(request: HttpRequest) -> Request:
+    drf_request = Request(request)
+    drf_request.user = await _authenticate(request)
+    return drf_request
+
+
+def _render(data: Any, etag: str | None, last_modified: Any) -> HttpResponseBase:
+    response = HttpResponse(JSONRenderer().render(data), content_type="application/json")
+    patch_vary_headers(response, ["Accept"])
+    return set_validators(response, etag, last_modified)
+
+
+async def _assemble_post_fragments(
+    request: Request, entries: list[tuple[int, str]], lang: str
+) -> list[dict]:
+    fragments = await aget_fragments(entries, lang)
+    versions = {
+        post_id: version for post_id, version in entries if post_id not in fragments
+    }
+    if versions:
+        built = await PostReadSerializer.afast_data(
+            Post.objects.filter(id__in=list(versions)),
+            context={"request": request, "lang": lang, "canonical_dates": True},
+        )
+        await aset_fragments({(item["id"], versions[item["id"]]): item for item in built}, lang)
+        fragments.update({item["id"]: item for item in built})
+    return [fragments[post_id] for post_id, _ in entries if post_id in fragments]
+
+
+async def post_list(request: HttpRequest) -> HttpResponseBase:
+    drf_request = await _drf_request(request)
+    if KeysetPagination.is_requested(drf_request):
+        paginator = KeysetPagination()
+    else:
+        paginator = CachedPageNumberPagination()
+    position = ":".join(
+        (
+            paginator.get_cache_position(drf_request),
+            PostFeedFilter().get_cache_fragment(drf_request),
+        )
+    )
+    lang = cache_language(getattr(request, "LANGUAGE_CODE", None))
+
+    entry = await aget_fresh(await alist_page_cache_key(position))
+    if entry is None:
+        raise UseSyncView
+    fragments = await _assemble_post_fragments(drf_request, entry["ids"], lang)
+    etag = make_etag(
+        request.get_full_path(),
+        lang,
+        *resolve_date_locale(drf_request),
+        entry["ids"],
+        entry["page"],
+        [payload_counters(item) for item in fragments],
+    )
+    last_modified = list_modified_datetime(entry)
+    not_modified = conditional_response(request, etag, None)
+    if not_modified is not None:
+        return not_modified
+
+    data = localize_post_dates(fragments, drf_request)
+    response = paginator.get_cached_paginated_response(drf_request, entry["page"], data)
+    return _render(response.data, etag, last_modified)
+
+
+async def post_detail(request: HttpRequest, slug: str) -> HttpResponseBase:
+    drf_request = await _drf_request(request)
+    lang = cache_language(getattr(request, "LANGUAGE_CODE", None))
+    entry = await aget_post_detail(slug, lang)
+    if entry is None:
+        visible = Q(status=Post.Status.PUBLISHED)
+        if drf_request.user.is_authenticated:
+            visible |= Q(author_id=drf_request.user.id)
+        instance = (
+            await Post.objects.select_related("author", "category")
+            .filter(visible, slug=slug)
+            .afirst()
+        )
+        if instance is None:
+            raise UseSyncView
+        serializer = PostReadSerializer(
+            instance, context={"request": drf_request, "lang": lang, "canonical_dates": True}
+        )
+        entry = {"version": fragment_version(instance), "data": serializer.data}
+        if instance.status == Post.Status.PUBLISHED:
+            await aset_post_detail(slug, lang, entry)
+
+    etag = make_etag(
+        slug,
+        entry["version"],
+        payload_counters(entry["data"]),
+        lang,
+        *resolve_date_locale(drf_request),
+    )
+    not_modified = conditional_response(request, etag, None)
+    if not_modified is not None:
+        return not_modified
+
+    data = localize_post_dates([entry["data"]], drf_request)[0]
+    return _render(data, etag, None)
+
+
+async def post_comments(request: HttpRequest, slug: str) -> HttpResponseBase:
+    drf_request = await _drf_request(request)
+    if KeysetPagination.is_requested(drf_request):
+        raise UseSyncView
+    post = (
+        await Post.objects.filter(slug=slug)
+        .only("id", "slug", "status", "author_id")
+        .afirst()
+    )
+    if post is None or (
+        post.status != Post.Status.PUBLISHED
+        and post.author_id != getattr(drf_request.user, "id", None)
+    ):
+        raise UseSyncView
+
+    token = await aget_comments_token(post.id)
+    etag = make_etag(post.id, token, request.get_full_path())
+    last_modified = comments_token_datetime(token)
+    not_modified = conditional_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    paginator = CachedPageNumberPagination()
+    page_number = drf_request.query_params.get(paginator.page_query_param, "1")
+    if not page_number.isdigit():
+        raise UseSyncView
+    number = int(page_number)
+    queryset = post.comments.select_related("author").order_by("-created_at", "-id")
+    count = await queryset.acount()
+    num_pages = max(1, -(-count // paginator.page_size))
+    if not 1 <= number <= num_pages:
+        raise UseSyncView
+    offset = (number - 1) * paginator.page_size
+    comments = [
+        comment async for comment in queryset[offset : offset + paginator.page_size]
+    ]
+    state = {
+        "count": count,
+        "number": number,
+        "has_next": number < num_pages,
+        "has_previous": number > 1,
+    }
+    data = CommentReadSerializer(comments, many=True).data
+    response = paginator.get_cached_paginated_response(drf_request, state, data)
+    return _render(response.data, etag, last_modified)
+
+
+def _wants_json(request: HttpRequest) -> bool:
+    return "format" not in request.GET and "text/html" not in request.headers.get("Accept", "")
+
+
+def dispatch_reads(
+    async_view: Callable[..., Awaitable[HttpResponseBase]], sync_view: Callable
+) -> Callable:
+    run_sync_view = sync_to_async(sync_view)
+
+    @csrf_exempt
+    async def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        if request.method == "GET" and "format" not in kwargs and _wants_json(request):
+            try:
+                return await async_view(request, *args, **kwargs)
+            except UseSyncView:
+                logger.debug("Async read handed to sync view path=%s", request.path)
+        return await run_sync_view(request, *args, **kwargs)
+
+    view.cls = getattr(sync_view, "cls", None)
+    view.actions = getattr(sync_view, "actions", None)
+    view.initkwargs = getattr(sync_view, "initkwargs", None)
+    return view
+
+
+ASYNC_READ_VIEWS = {
+    "post-list": post_list,
+    "post-detail": post_detail,
+    "post-comments": post_comments,
+}
+
+
+def with_async_reads(patterns: list[URLPattern]) -> list[URLPattern]:
+    # Reroutes the router's list/detail/comments URLs through dispatch_reads;
+    # every other route (search, facets, comment detail) is left as is.
+    routed = []
+    for pattern in patterns:
+        async_view = ASYNC_READ_VIEWS.get(getattr(pattern, "name", None))
+        if async_view is not None:
+            pattern = re_path(
+                pattern.pattern.regex.pattern,
+                dispatch_reads(async_view, pattern.callback),
+                pattern.default_args,
+                name=pattern.name,
+            )
+        routed.append(pattern)
+    return routed
@@ -0,0 +1,417 @@
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from apps.core.async_cache import async_cache
+from apps.core.local_cache import MISSING, get_local_cache
+from apps.core.metrics import record_list_cache_event
+
+logger = logging.getLogger("blog")
+
+LIST_CACHE_KEY_PREFIX = "post:list:published"
+LIST_CACHE_TTL_SECONDS = 60
+LIST_CACHE_SOFT_TTL_SECONDS = 30
+LIST_CACHE_STALE_TTL_SECONDS = 60 * 5
+LIST_CACHE_GENERATION_KEY = f"{LIST_CACHE_KEY_PREFIX}:generation"
+LIST_CACHE_MODIFIED_KEY = f"{LIST_CACHE_KEY_PREFIX}:modified"
+
+FRAGMENT_CACHE_KEY_PREFIX = "post:fragment"
+FRAGMENT_CACHE_TTL_SECONDS = 60 * 10
+
+DETAIL_CACHE_KEY_PREFIX = "post:detail"
+DETAIL_CACHE_TTL_SECONDS = 60 * 5
+
+COMMENTS_TOKEN_KEY_PREFIX = "post:comments:token"
+COMMENTS_TOKEN_TTL_SECONDS = 60 * 60 * 24 * 7
+
+REBUILD_LOCK_TIMEOUT_SECONDS = 10
+REBUILD_WAIT_SECONDS = 2.0
+REBUILD_POLL_INTERVAL_SECONDS = 0.05
+
+
+def cache_language(lang: str | None) -> str:
+    # Fold whatever the request negotiated onto a configured language so keys
+    # stay bounded and targeted deletes over settings.LANGUAGES hit them.
+    codes = [code for code, _ in settings.LANGUAGES]
+    base = (lang or "").lower().split("-")[0].split("_")[0]
+    return base if base in codes else codes[0]
+
+
+def _cached_get(key: str) -> Any:
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        value = local_cache.get(key)
+        if value is not MISSING:
+            return value
+    value = cache.get(key)
+    if value is not None and local_cache is not None:
+        local_cache.set(key, value)
+    return value
+
+
+def _cached_get_many(keys: list[str]) -> dict[str, Any]:
+    local_cache = get_local_cache()
+    if local_cache is None:
+        return cache.get_many(keys)
+    found = {}
+    for key in keys:
+        value = local_cache.get(key)
+        if value is not MISSING:
+            found[key] = value
+    remote = cache.get_many([key for key in keys if key not in found])
+    for key, value in remote.items():
+        local_cache.set(key, value)
+    found.update(remote)
+    return found
+
+
+def _cached_set(key: str, value: Any, timeout: int | None) -> None:
+    cache.set(key, value, timeout)
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        local_cache.set(key, value)
+
+
+def _cached_set_many(values: dict[str, Any], timeout: int | None) -> None:
+    cache.set_many(values, timeout)
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        for key, value in values.items():
+            local_cache.set(key, value)
+
+
+def _invalidate_local(keys: Iterable[str] = (), prefixes: Iterable[str] = ()) -> None:
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        local_cache.invalidate(keys=keys, prefixes=prefixes)
+
+
+def get_list_cache_generation() -> int:
+    generation = _cached_get(LIST_CACHE_GENERATION_KEY)
+    if generation is not None:
+        return int(generation)
+    # Seed from the clock so a lost counter never reuses a generation whose
+    # entries may still be alive.
+    cache.add(LIST_CACHE_GENERATION_KEY, int(time.time()), timeout=None)
+    return int(cache.get(LIST_CACHE_GENERATION_KEY) or 0)
+
+
+def get_list_cache_modified() -> float:
+    # When the list last changed. Unlike the newest updated_at on a page it
+    # never moves back when a post is deleted or unpublished.
+    modified = cache.get(LIST_CACHE_MODIFIED_KEY)
+    if modified is None:
+        cache.add(LIST_CACHE_MODIFIED_KEY, time.time(), timeout=None)
+        modified = cache.get(LIST_CACHE_MODIFIED_KEY) or time.time()
+    return float(modified)
+
+
+def list_modified_datetime(entry: dict) -> datetime | None:
+    modified = entry.get("modified")
+    return None if modified is None else datetime.fromtimestamp(modified, tz=UTC)
+
+
+def bump_list_cache_generation() -> int:
+    # Stamp before bumping: a page rebuilt in between gets a newer date for
+    # an older generation, never the other way round.
+    cache.set(LIST_CACHE_MODIFIED_KEY, time.time(), timeout=None)
+    try:
+        generation = cache.incr(LIST_CACHE_GENERATION_KEY)
+    except ValueError:
+        get_list_cache_generation()
+        generation = cache.incr(LIST_CACHE_GENERATION_KEY)
+    _invalidate_local(keys=[LIST_CACHE_GENERATION_KEY])
+    record_list_cache_event("invalidation")
+    return generation
+
+
+def list_page_cache_key(position: str) -> str:
+    generation = get_list_cache_generation()
+    return f"{LIST_CACHE_KEY_PREFIX}:gen:{generation}:{position}"
+
+
+def list_page_stale_key(position: str) -> str:
+    return f"{LIST_CACHE_KEY_PREFIX}:stale:{position}"
+
+
+def fragment_version(post: Any) -> str:
+    # Only moves on saves. comment_count and tag_names change without one;
+    # their writers delete that post's fragments and details instead, and
+    # ETags read them from the payload through payload_counters().
+    return str(int(post.updated_at.timestamp() * 1_000_000))
+
+
+def payload_counters(data: dict) -> tuple[int, list[str]]:
+    return data["comment_count"], data["tags"]
+
+
+def fragment_cache_key(post_id: int, version: str, lang: str) -> str:
+    return f"{FRAGMENT_CACHE_KEY_PREFIX}:{post_id}:{version}:lang:{lang}"
+
+
+def get_fragments(entries: list[tuple[int, str]], lang: str) -> dict[int, dict]:
+    keys = {
+        fragment_cache_key(post_id, version, lang): post_id
+        for post_id, version in entries
+    }
+    cached = _cached_get_many(list(keys))
+    return {keys[key]: value for key, value in cached.items()}
+
+
+def set_fragments(fragments: dict[tuple[int, str], dict], lang: str) -> None:
+    _cached_set_many(
+        {
+            fragment_cache_key(post_id, version, lang): data
+            for (post_id, version), data in fragments.items()
+        },
+        FRAGMENT_CACHE_TTL_SECONDS,
+    )
+
+
+def delete_post_fragments(post_id: int, version: str) -> None:
+    cache.delete_many(
+        [fragment_cache_key(post_id, version, code) for code, _ in settings.LANGUAGES]
+    )
+    _invalidate_local(prefixes=[f"{FRAGMENT_CACHE_KEY_PREFIX}:{post_id}:"])
+
+
+def detail_cache_key(slug: str, lang: str) -> str:
+    return f"{DETAIL_CACHE_KEY_PREFIX}:{slug}:lang:{lang}"
+
+
+def get_post_detail(slug: str, lang: str) -> dict | None:
+    return _cached_get(detail_cache_key(slug, lang))
+
+
+def set_post_detail(slug: str, lang: str, entry: dict) -> None:
+    _cached_set(detail_cache_key(slug, lang), entry, DETAIL_CACHE_TTL_SECONDS)
+
+
+def delete_post_detail(*slugs: str) -> None:
+    cache.delete_many(
+        [detail_cache_key(slug, code) for slug in set(slugs) for code, _ in settings.LANGUAGES]
+    )
+    _invalidate_local(prefixes=[f"{DETAIL_CACHE_KEY_PREFIX}:{slug}:" for slug in set(slugs)])
+
+
+def get_comments_token(post_id: int) -> int:
+    key = f"{COMMENTS_TOKEN_KEY_PREFIX}:{post_id}"
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, time.time_ns(), COMMENTS_TOKEN_TTL_SECONDS)
+        token = cache.get(key) or time.time_ns()
+    return int(token)
+
+
+def comments_token_datetime(token: int) -> datetime:
+    return datetime.fromtimestamp(token / 1_000_000_000, tz=UTC)
+
+
+def touch_comments_token(post_id: int) -> None:
+    cache.set(
+        f"{COMMENTS_TOKEN_KEY_PREFIX}:{post_id}", time.time_ns(), COMMENTS_TOKEN_TTL_SECONDS
+    )
+
+
+def _acquire_rebuild_lock(key: str, token: str) -> bool | None:
+    # None when Redis is unreachable: IGNORE_EXCEPTIONS makes django-redis
+    # swallow the error. False when another worker holds the lock.
+    return cache.add(f"{key}:lock", token, REBUILD_LOCK_TIMEOUT_SECONDS)
+
+
+def _release_rebuild_lock(key: str, token: str) -> None:
+    if cache.get(f"{key}:lock") == token:
+        cache.delete(f"{key}:lock")
+
+
+def _store(key: str, stale_key: str | None, value: Any, soft_ttl: int, ttl: int) -> None:
+    entry = {"value": value, "fresh_until": time.time() + soft_ttl}
+    _cached_set(key, entry, ttl)
+    if stale_key is not None:
+        cache.set(stale_key, entry, LIST_CACHE_STALE_TTL_SECONDS)
+
+
+def _refresh_in_background(
+    key: str, stale_key: str | None, token: str, rebuild: Callable[[], Any], soft_ttl: int, ttl: int
+) -> None:
+    def run() -> None:
+        try:
+            _store(key, stale_key, rebuild(), soft_ttl, ttl)
+        except Exception:
+            logger.exception("Background cache refresh failed key=%s", key)
+        finally:
+            _release_rebuild_lock(key, token)
+            connection.close()
+
+    threading.Thread(target=run, name=f"cache-refresh:{key}", daemon=True).start()
+
+
+def get_or_rebuild(
+    key: str,
+    rebuild: Callable[[], Any],
+    *,
+    stale_key: str | None = None,
+    soft_ttl: int = LIST_CACHE_SOFT_TTL_SECONDS,
+    ttl: int = LIST_CACHE_TTL_SECONDS,
+) -> Any:
+    # Single-flight read-through: one worker per key runs ``rebuild`` while
+    # the others wait for its result or fall back to the last stale copy.
+    # Entries past ``soft_ttl`` are served stale while one background
+    # refresh runs.
+    entry = _cached_get(key)
+    if entry is not None:
+        if entry["fresh_until"] < time.time():
+            record_list_cache_event("stale")
+            token = uuid.uuid4().hex
+            if _acquire_rebuild_lock(key, token):
+                _refresh_in_background(key, stale_key, token, rebuild, soft_ttl, ttl)
+        else:
+            record_list_cache_event("hit")
+        return entry["value"]
+
+    record_list_cache_event("miss")
+    token = uuid.uuid4().hex
+    acquired = _acquire_rebuild_lock(key, token)
+    if acquired is None:
+        # Fail open like RATELIMIT_FAIL_OPEN: nobody can publish a result
+        # through a dead cache, so waiting for one only adds latency.
+        return rebuild()
+    if not acquired:
+        deadline = time.monotonic() + REBUILD_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(REBUILD_POLL_INTERVAL_SECONDS)
+            # Checked before the reads: the holder stores before it releases.
+            held = cache.has_key(f"{key}:lock")
+            entry = cache.get(key)
+            if entry is None and stale_key is not None:
+                entry = cache.get(stale_key)
+            if entry is not None:
+                return entry["value"]
+            if not held:
+                # False: the holder gave up without storing; None: the
+                # cache went away while we waited. Neither is worth waiting on.
+                break
+        else:
+            logger.warning("Cache rebuild wait timed out key=%s", key)
+        return rebuild()
+
+    try:
+        value = rebuild()
+        _store(key, stale_key, value, soft_ttl, ttl)
+        return value
+    finally:
+        _release_rebuild_lock(key, token)
+
+
+# Async read path. Mirrors the getters above over apps.core.async_cache; the
+# write side (invalidation, rebuilds, single-flight) stays sync only.
+
+
+async def _acached_get(key: str) -> Any:
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        value = local_cache.get(key)
+        if value is not MISSING:
+            return value
+    value = await async_cache.get(key)
+    if value is not None and local_cache is not None:
+        local_cache.set(key, value)
+    return value
+
+
+async def _acached_get_many(keys: list[str]) -> dict[str, Any]:
+    local_cache = get_local_cache()
+    found = {}
+    if local_cache is not None:
+        for key in keys:
+            value = local_cache.get(key)
+            if value is not MISSING:
+                found[key] = value
+    remote = await async_cache.get_many([key for key in keys if key not in found])
+    if local_cache is not None:
+        for key, value in remote.items():
+            local_cache.set(key, value)
+    found.update(remote)
+    return found
+
+
+async def _acached_set(key: str, value: Any, timeout: int | None) -> None:
+    await async_cache.set(key, value, timeout)
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        local_cache.set(key, value)
+
+
+async def _acached_set_many(values: dict[str, Any], timeout: int | None) -> None:
+    await async_cache.set_many(values, timeout)
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        for key, value in values.items():
+            local_cache.set(key, value)
+
+
+async def aget_list_cache_generation() -> int:
+    generation = await _acached_get(LIST_CACHE_GENERATION_KEY)
+    if generation is not None:
+        return int(generation)
+    await async_cache.add(LIST_CACHE_GENERATION_KEY, int(time.time()), None)
+    return int(await async_cache.get(LIST_CACHE_GENERATION_KEY) or 0)
+
+
+async def alist_page_cache_key(position: str) -> str:
+    generation = await aget_list_cache_generation()
+    return f"{LIST_CACHE_KEY_PREFIX}:gen:{generation}:{position}"
+
+
+async def aget_fresh(key: str) -> Any:
+    # Value of a get_or_rebuild() entry, or None when it is missing or past
+    # its soft TTL and the sync path has to rebuild or refresh it.
+    entry = await _acached_get(key)
+    if entry is None or entry["fresh_until"] < time.time():
+        return None
+    record_list_cache_event("hit")
+    return entry["value"]
+
+
+async def aget_fragments(entries: list[tuple[int, str]], lang: str) -> dict[int, dict]:
+    keys = {
+        fragment_cache_key(post_id, version, lang): post_id
+        for post_id, version in entries
+    }
+    cached = await _acached_get_many(list(keys))
+    return {keys[key]: value for key, value in cached.items()}
+
+
+async def aset_fragments(fragments: dict[tuple[int, str], dict], lang: str) -> None:
+    await _acached_set_many(
+        {
+            fragment_cache_key(post_id, version, lang): data
+            for (post_id, version), data in fragments.items()
+        },
+        FRAGMENT_CACHE_TTL_SECONDS,
+    )
+
+
+async def aget_post_detail(slug: str, lang: str) -> dict | None:
+    return await _acached_get(detail_cache_key(slug, lang))
+
+
+async def aset_post_detail(slug: str, lang: str, entry: dict) -> None:
+    await _acached_set(detail_cache_key(slug, lang), entry, DETAIL_CACHE_TTL_SECONDS)
+
+
+async def aget_comments_token(post_id: int) -> int:
+    key = f"{COMMENTS_TOKEN_KEY_PREFIX}:{post_id}"
+    token = await async_cache.get(key)
+    if token is None:
+        await async_cache.add(key, time.time_ns(), COMMENTS_TOKEN_TTL_SECONDS)
+        token = await async_cache.get(key) or time.time_ns()
+    return int(token)
@@ -0,0 +1,165 @@
+import zlib
+from collections.abc import AsyncIterator, Iterable, Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.blog.models import Comment, Post
+
+EXPORT_CHUNK_SIZE = 2000
+# Lines are joined into blocks of about this size before they are yielded so
+# the response is not written one tiny chunk per record.
+EXPORT_BUFFER_BYTES = 64 * 1024
+
+POST_EXPORT_FIELDS = (
+    "id",
+    "slug",
+    "title",
+    "body",
+    "status",
+    "author__email",
+    "category__slug",
+    "tag_names",
+    "comment_count",
+    "created_at",
+    "updated_at",
+    "counters_updated_at",
+)
+COMMENT_EXPORT_FIELDS = ("id", "post_id", "post__slug", "author__email", "body", "created_at")
+
+
+def parse_since(value: str | None) -> datetime | None:
+    # Raises ValueError for anything that is not an ISO 8601 datetime.
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(f"Invalid datetime {value!r}")
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, UTC)
+    return since
+
+
+def iter_export_records(
+    since: datetime | None = None,
+    include_comments: bool = True,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    # Published posts edited (updated_at) or recounted (counters_updated_at)
+    # at or after `since`, then their comments created at or after it, then a
+    # trailer whose started_at is the next `since`. A stream without the
+    # trailer was cut short. Deletions are not exported.
+    started_at = timezone.now()
+    posts = Post.objects.filter(status=Post.Status.PUBLISHED)
+    comments = Comment.objects.filter(post__status=Post.Status.PUBLISHED)
+    if since is not None:
+        posts = posts.filter(Q(updated_at__gte=since) | Q(counters_updated_at__gte=since))
+        comments = comments.filter(created_at__gte=since)
+
+    post_total = 0
+    for row in posts.order_by("id").values(*POST_EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        post_total += 1
+        yield {
+            "type": "post",
+            "id": row["id"],
+            "slug": row["slug"],
+            "title": row["title"],
+            "body": row["body"],
+            "status": row["status"],
+            "author": row["author__email"],
+            "category": row["category__slug"],
+            "tags": row["tag_names"],
+            "comment_count": row["comment_count"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "counters_updated_at": row["counters_updated_at"],
+        }
+
+    comment_total = 0
+    if include_comments:
+        for row in (
+            comments.order_by("id").values(*COMMENT_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+        ):
+            comment_total += 1
+            yield {
+                "type": "comment",
+                "id": row["id"],
+                "post_id": row["post_id"],
+                "post": row["post__slug"],
+                "author": row["author__email"],
+                "body": row["body"],
+                "created_at": row["created_at"],
+            }
+
+    yield {
+        "type": "export",
+        "started_at": started_at,
+        "since": since,
+        "posts": post_total,
+        "comments": comment_total,
+    }
+
+
+def iter_ndjson(records: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    buffer: list[str] = []
+    size = 0
+    for record in records:
+        line = encoder.encode(record) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_BYTES:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def iter_gzip(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    # Accept-Encoding with q-values: "gzip;q=0" refuses gzip, and "*" only
+    # applies when gzip is not listed by name.
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+_EXHAUSTED = object()
+
+
+async def aiter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    # Under ASGI a StreamingHttpResponse reads a sync iterator to the end
+    # before sending anything; pull one chunk at a time on the sync thread
+    # instead, where the export's database cursor lives.
+    iterator = iter(chunks)
+    pull = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await pull(iterator, _EXHAUSTED)) is not _EXHAUSTED:
+        yield chunk
@@ -0,0 +1,135 @@
+import logging
+from collections import Counter
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django_redis import get_redis_connection
+
+from apps.blog.models import Post
+
+logger = logging.getLogger("blog")
+
+FACET_CATEGORY_KEY = "post:facets:category"
+FACET_TAG_KEY = "post:facets:tag"
+# Counters are rebuilt with GROUP BY once a day so any drift heals itself.
+FACET_TTL_SECONDS = 60 * 60 * 24
+# Keeps an otherwise empty hash alive so "no posts" is not read as "missing".
+FACET_SENTINEL_FIELD = "_"
+
+# HINCRBY only when the hash exists: increments against a missing hash would
+# create a partial one that is never rebuilt.
+INCREMENT_IF_EXISTS_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    for i = 1, #ARGV, 2 do
+        redis.call("hincrby", KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+"""
+
+# (category_id, tag names) of a published post; None for drafts and deletions.
+FacetState = tuple[int | None, tuple[str, ...]]
+
+
+def facet_state(post: Post | None) -> FacetState | None:
+    if post is None or post.status != Post.Status.PUBLISHED:
+        return None
+    return post.category_id, tuple(post.tag_names)
+
+
+def _contributions(state: FacetState | None) -> tuple[Counter, Counter]:
+    if state is None:
+        return Counter(), Counter()
+    category_id, tag_names = state
+    categories = Counter({category_id: 1}) if category_id is not None else Counter()
+    return categories, Counter(set(tag_names))
+
+
+def record_facet_change(before: FacetState | None, after: FacetState | None) -> None:
+    record_facet_changes([(before, after)])
+
+
+def record_facet_changes(
+    changes: Iterable[tuple[FacetState | None, FacetState | None]],
+) -> None:
+    # Folds any number of post changes into one round trip per hash.
+    category_totals: Counter = Counter()
+    tag_totals: Counter = Counter()
+    for before, after in changes:
+        if before == after:
+            continue
+        old_categories, old_tags = _contributions(before)
+        new_categories, new_tags = _contributions(after)
+        category_totals.update(new_categories)
+        category_totals.subtract(old_categories)
+        tag_totals.update(new_tags)
+        tag_totals.subtract(old_tags)
+    category_deltas = {key: delta for key, delta in category_totals.items() if delta}
+    tag_deltas = {key: delta for key, delta in tag_totals.items() if delta}
+    if category_deltas or tag_deltas:
+        transaction.on_commit(lambda: _apply_deltas(category_deltas, tag_deltas))
+
+
+def _apply_deltas(category_deltas: dict[int, int], tag_deltas: dict[str, int]) -> None:
+    try:
+        redis_connection = get_redis_connection("default")
+        increment = redis_connection.register_script(INCREMENT_IF_EXISTS_SCRIPT)
+        for key, deltas in ((FACET_CATEGORY_KEY, category_deltas), (FACET_TAG_KEY, tag_deltas)):
+            if deltas:
+                args = [item for field, delta in deltas.items() for item in (field, delta)]
+                increment(keys=[cache.make_key(key)], args=args)
+    except Exception:
+        logger.exception("Post facet counters update failed")
+
+
+def count_facets_from_db() -> tuple[dict[int, int], dict[str, int]]:
+    published = Post.objects.filter(status=Post.Status.PUBLISHED)
+    categories = dict(
+        published.exclude(category=None)
+        .values("category_id")
+        .annotate(total=Count("id"))
+        .values_list("category_id", "total")
+    )
+    tags: Counter = Counter()
+    for names in published.values_list("tag_names", flat=True).iterator(chunk_size=2000):
+        tags.update(set(names))
+    return categories, dict(tags)
+
+
+def rebuild_facet_counts() -> tuple[dict[int, int], dict[str, int]]:
+    categories, tags = count_facets_from_db()
+    pipe = get_redis_connection("default").pipeline(transaction=True)
+    for key, counts in ((FACET_CATEGORY_KEY, categories), (FACET_TAG_KEY, tags)):
+        redis_key = cache.make_key(key)
+        pipe.delete(redis_key)
+        pipe.hset(redis_key, mapping={FACET_SENTINEL_FIELD: 0, **counts})
+        pipe.expire(redis_key, FACET_TTL_SECONDS)
+    pipe.execute()
+    return categories, tags
+
+
+def _decode_counts(raw: dict[bytes, bytes]) -> dict[str, int]:
+    counts = {field.decode(): int(value) for field, value in raw.items()}
+    return {
+        field: value
+        for field, value in counts.items()
+        if field != FACET_SENTINEL_FIELD and value > 0
+    }
+
+
+def get_facet_counts() -> tuple[dict[int, int], dict[str, int]]:
+    # Returns ({category_id: published posts}, {tag name: published posts}).
+    try:
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        pipe.hgetall(cache.make_key(FACET_CATEGORY_KEY))
+        pipe.hgetall(cache.make_key(FACET_TAG_KEY))
+        raw_categories, raw_tags = pipe.execute()
+        if not raw_categories or not raw_tags:
+            logger.debug("Post facet counters rebuild")
+            return rebuild_facet_counts()
+    except Exception:
+        logger.exception("Post facet counters read failed")
+        return count_facets_from_db()
+    categories = {int(key): value for key, value in _decode_counts(raw_categories).items()}
+    return categories, _decode_counts(raw_tags)
@@ -0,0 +1,76 @@
+import zoneinfo
+from collections.abc import Iterable
+from datetime import UTC, datetime, tzinfo
+from functools import lru_cache
+from typing import Any
+
+from babel import Locale, UnknownLocaleError
+from babel.dates import (
+    DateTimePattern,
+    get_date_format,
+    get_datetime_format,
+    get_time_format,
+)
+
+POST_DATE_FIELDS = ("created_at", "updated_at")
+DEFAULT_DATE_LOCALE = "en"
+
+
+class DateTimeFormatter:
+    __slots__ = ("date_pattern", "datetime_format", "locale", "time_pattern")
+
+    def __init__(self, locale: Locale, format: str) -> None:
+        self.locale = locale
+        self.datetime_format = get_datetime_format(format, locale=locale).replace("'", "")
+        self.date_pattern: DateTimePattern = get_date_format(format, locale=locale)
+        self.time_pattern: DateTimePattern = get_time_format(format, locale=locale)
+
+    def format(self, dt_local: datetime) -> str:
+        # Same composition as babel.dates.format_datetime for the predefined
+        # formats, minus the per-call locale and pattern parsing.
+        time_part = self.time_pattern.apply(
+            dt_local.timetz(), self.locale, reference_date=dt_local.date()
+        )
+        date_part = self.date_pattern.apply(dt_local.date(), self.locale)
+        return self.datetime_format.replace("{0}", time_part).replace("{1}", date_part)
+
+
+@lru_cache(maxsize=64)
+def get_datetime_formatter(lang: str, format: str = "long") -> DateTimeFormatter:
+    try:
+        locale = Locale.parse(lang.replace("-", "_"))
+    except (UnknownLocaleError, ValueError):
+        locale = Locale.parse(DEFAULT_DATE_LOCALE)
+    return DateTimeFormatter(locale, format)
+
+
+@lru_cache(maxsize=512)
+def get_tzinfo(tz_name: str) -> tzinfo:
+    return zoneinfo.ZoneInfo(tz_name)
+
+
+def resolve_date_locale(request: Any) -> tuple[str, str]:
+    if request and request.user.is_authenticated:
+        return request.LANGUAGE_CODE, request.user.timezone or "UTC"
+    return DEFAULT_DATE_LOCALE, "UTC"
+
+
+def to_canonical(dt: datetime) -> str:
+    return dt.astimezone(UTC).isoformat()
+
+
+def format_dt(dt: datetime, lang: str, tz_name: str) -> str:
+    return get_datetime_formatter(lang).format(dt.astimezone(get_tzinfo(tz_name)))
+
+
+def localize_post_dates(items: Iterable[dict], request: Any) -> list[dict]:
+    lang, tz_name = resolve_date_locale(request)
+    formatter = get_datetime_formatter(lang)
+    tz = get_tzinfo(tz_name)
+    localized = []
+    for item in items:
+        item = dict(item)
+        for field in POST_DATE_FIELDS:
+            item[field] = formatter.format(datetime.fromisoformat(item[field]).astimezone(tz))
+        localized.append(item)
+    return localized
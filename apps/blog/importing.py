@@ -0,0 +1,108 @@
+import logging
+from typing import Any
+
+from django.db import transaction
+from django.utils.translation import gettext as _
+from rest_framework import serializers
+
+from apps.blog.facets import facet_state, record_facet_changes
+from apps.blog.models import Category, Post, Tag
+from apps.blog.serializers import PostImportItemSerializer
+from apps.core.stats import STATS_POSTS_KEY, record_stat_change
+
+logger = logging.getLogger("blog")
+
+BULK_CREATE_BATCH_SIZE = 500
+
+
+def _item_errors(items: list[Any]) -> tuple[list[dict], dict[int, dict]]:
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[index] = {"non_field_errors": [_("Expected an object.")]}
+            continue
+        serializer = PostImportItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors[index] = serializer.errors
+    return valid, errors
+
+
+def validate_import_items(items: list[Any]) -> tuple[list[dict], list[dict]]:
+    # Returns (validated items, [{"index": n, "errors": {...}}]). Database
+    # checks run once for the batch: one query each for categories, tags and
+    # already taken slugs.
+    valid, errors = _item_errors(items)
+    category_ids = {data["category_id"] for index, data in valid if data.get("category_id")}
+    tag_ids = {tag_id for index, data in valid for tag_id in data.get("tag_ids", [])}
+    slugs = [data["slug"] for index, data in valid]
+
+    known_categories = set(
+        Category.objects.filter(id__in=category_ids).values_list("id", flat=True)
+    )
+    tag_names = dict(Tag.objects.filter(id__in=tag_ids).values_list("id", "name"))
+    taken_slugs = set(Post.objects.filter(slug__in=slugs).values_list("slug", flat=True))
+
+    does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages["does_not_exist"]
+    accepted, seen_slugs = [], set()
+    for index, data in valid:
+        item_errors = {}
+        category_id = data.get("category_id")
+        if category_id and category_id not in known_categories:
+            item_errors["category_id"] = [str(does_not_exist).format(pk_value=category_id)]
+        missing_tags = [tag_id for tag_id in data.get("tag_ids", []) if tag_id not in tag_names]
+        if missing_tags:
+            item_errors["tag_ids"] = [
+                str(does_not_exist).format(pk_value=tag_id) for tag_id in missing_tags
+            ]
+        if data["slug"] in taken_slugs:
+            item_errors["slug"] = [_("post with this slug already exists.")]
+        elif data["slug"] in seen_slugs:
+            item_errors["slug"] = [_("Duplicate slug in this import.")]
+        seen_slugs.add(data["slug"])
+        if item_errors:
+            errors[index] = item_errors
+        else:
+            data["tag_ids"] = list(dict.fromkeys(data.get("tag_ids", [])))
+            data["tag_names"] = [tag_names[tag_id] for tag_id in data["tag_ids"]]
+            accepted.append(data)
+
+    return accepted, [
+        {"index": index, "errors": item_errors} for index, item_errors in sorted(errors.items())
+    ]
+
+
+@transaction.atomic
+def bulk_import_posts(author: Any, items: list[dict]) -> list[Post]:
+    # items come from validate_import_items(). The caller invalidates the
+    # list cache once after the transaction.
+    posts = Post.objects.bulk_create(
+        [
+            Post(
+                author=author,
+                title=data["title"],
+                slug=data["slug"],
+                body=data["body"],
+                category_id=data.get("category_id"),
+                status=data.get("status", Post.Status.DRAFT),
+                tag_names=data["tag_names"],
+            )
+            for data in items
+        ],
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
+    Post.tags.through.objects.bulk_create(
+        [
+            Post.tags.through(post_id=post.id, tag_id=tag_id)
+            for post, data in zip(posts, items, strict=True)
+            for tag_id in data["tag_ids"]
+        ],
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
+    record_facet_changes((None, facet_state(post)) for post in posts)
+    record_stat_change(
+        STATS_POSTS_KEY, sum(post.status == Post.Status.PUBLISHED for post in posts)
+    )
+    logger.info("Post bulk import created count=%s author_id=%s", len(posts), author.id)
+    return posts
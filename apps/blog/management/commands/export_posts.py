@@ -0,0 +1,51 @@
+import sys
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.blog.exporting import (
+    EXPORT_CHUNK_SIZE,
+    iter_export_records,
+    iter_gzip,
+    iter_ndjson,
+    parse_since,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream published posts and their comments as NDJSON, in constant memory. "
+        "The last line is a trailer whose started_at can be passed as --since "
+        "for the next incremental export."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--output", "-o", help="File to write; stdout when omitted.")
+        parser.add_argument("--since", help="ISO 8601 datetime; only changes at or after it.")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--no-comments", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            since = parse_since(options["since"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        chunks = iter_ndjson(
+            iter_export_records(
+                since,
+                include_comments=not options["no_comments"],
+                chunk_size=options["chunk_size"],
+            )
+        )
+        if options["gzip"]:
+            chunks = iter_gzip(chunks)
+
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -1,23 +1,36 @@
 import asyncio
 import json
+import os
+import socket
+import time
 from typing import Any
 
 import httpx
 import redis.asyncio as aioredis
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from redis.exceptions import ResponseError
 
-from apps.blog.redis_events import CHANNEL_NAME
+from apps.blog.redis_events import (
+    CHANNEL_NAME,
+    COMMENT_EVENTS_PUBSUB,
+    COMMENT_EVENTS_STREAM,
+    STREAM_CONSUMER_GROUP,
+    STREAM_DATA_FIELD,
+    STREAM_DEAD_LETTER_NAME,
+)
 
 WEBHOOK_URL = "https://httpbin.org/post"
 
 
-async def notify(client: httpx.AsyncClient, payload: dict) -> None:
+async def notify(client: httpx.AsyncClient, payload: dict) -> bool:
     try:
         response = await client.post(WEBHOOK_URL, json=payload, timeout=5)
         print(f"Webhook sent: {response.status_code}")
+        return response.is_success
     except Exception as e:
         print(f"Webhook failed: {e}")
+        return False
 
 
 async def listen(stdout) -> None:
@@ -38,8 +51,208 @@ async def listen(stdout) -> None:
                 stdout.write(str(message["data"]))
 
 
+class StreamConsumer:
+    # One member of the listen_comments consumer group. Redis hands each new
+    # entry to exactly one member, so throughput scales by running more
+    # processes with distinct --consumer names. An entry is acked only after
+    # its webhook succeeded; failed ones stay pending and are retried once
+    # they have been idle for claim_idle_ms, whichever consumer notices
+    # first (this also recovers entries of consumers that died mid-batch).
+    # After max_deliveries attempts an entry moves to the dead-letter stream.
+    # Members that stopped reading with nothing pending are removed from the
+    # group, so restarts under new names do not pile up idle consumers.
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        client: httpx.AsyncClient,
+        stdout: Any,
+        *,
+        group: str,
+        consumer: str,
+        batch: int,
+        block_ms: int,
+        claim_idle_ms: int,
+        max_deliveries: int,
+    ) -> None:
+        self.redis = redis
+        self.client = client
+        self.stdout = stdout
+        self.group = group
+        self.consumer = consumer
+        self.batch = batch
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+
+    async def ensure_group(self) -> None:
+        # Starting at id 0 delivers everything still in the stream, including
+        # events published before the first consumer ever ran.
+        try:
+            await self.redis.xgroup_create(CHANNEL_NAME, self.group, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def run(self) -> None:
+        await self.ensure_group()
+        self.stdout.write(
+            f"Consuming Redis stream: {CHANNEL_NAME} group={self.group} consumer={self.consumer}"
+        )
+        # Our own entries left pending by a previous run with the same name.
+        last_id = "0"
+        while entries := await self.read(last_id):
+            await self.process(entries)
+            last_id = entries[-1][0]
+        next_claim = 0.0
+        while True:
+            if time.monotonic() >= next_claim:
+                await self.reclaim()
+                await self.prune_consumers()
+                next_claim = time.monotonic() + self.claim_idle_ms / 1000 / 2
+            await self.process(await self.read(">"))
+
+    async def read(self, last_id: str) -> list[tuple[str, dict | None]]:
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {CHANNEL_NAME: last_id},
+            count=self.batch,
+            block=self.block_ms if last_id == ">" else None,
+        )
+        return response[0][1] if response else []
+
+    async def reclaim(self) -> None:
+        while True:
+            pending = await self.redis.xpending_range(
+                CHANNEL_NAME, self.group, min="-", max="+", count=self.batch, idle=self.claim_idle_ms
+            )
+            if not pending:
+                return
+            deliveries = {entry["message_id"]: entry["times_delivered"] for entry in pending}
+            # XCLAIM re-checks the idle time, so a consumer that is merely
+            # slow and acks in the meantime keeps its entries.
+            claimed = await self.redis.xclaim(
+                CHANNEL_NAME, self.group, self.consumer, self.claim_idle_ms, list(deliveries)
+            )
+            retry = []
+            for entry_id, fields in claimed:
+                if fields is not None and deliveries[entry_id] >= self.max_deliveries:
+                    await self.dead_letter(entry_id, fields, deliveries[entry_id])
+                else:
+                    retry.append((entry_id, fields))
+            await self.process(retry)
+            if len(pending) < self.batch:
+                return
+
+    async def prune_consumers(self) -> None:
+        # Live members read at least every block_ms, well inside claim_idle_ms.
+        # One deleted while merely slow is re-created by its next XREADGROUP;
+        # members with pending entries are left for reclaim() to drain first.
+        for info in await self.redis.xinfo_consumers(CHANNEL_NAME, self.group):
+            if (
+                info["name"] != self.consumer
+                and not info["pending"]
+                and info["idle"] >= self.claim_idle_ms
+            ):
+                await self.redis.xgroup_delconsumer(CHANNEL_NAME, self.group, info["name"])
+                self.stdout.write(f"Removed idle consumer {info['name']}")
+
+    async def process(self, entries: list[tuple[str, dict | None]]) -> None:
+        if not entries:
+            return
+        # Pending entries trimmed away by MAXLEN come back from XREADGROUP
+        # "0" and XCLAIM without fields; there is nothing to deliver, ack them.
+        done = [entry_id for entry_id, fields in entries if fields is None]
+        entries = [(entry_id, fields) for entry_id, fields in entries if fields is not None]
+        results = await asyncio.gather(*(self.handle(fields) for _, fields in entries))
+        done += [entry_id for (entry_id, _), ok in zip(entries, results, strict=True) if ok]
+        if done:
+            await self.redis.xack(CHANNEL_NAME, self.group, *done)
+
+    async def handle(self, fields: dict) -> bool:
+        data = fields.get(STREAM_DATA_FIELD)
+        try:
+            obj = json.loads(data)
+        except (TypeError, ValueError):
+            # Retrying cannot fix a malformed entry; ack it.
+            self.stdout.write(str(data))
+            return True
+        self.stdout.write(json.dumps(obj, ensure_ascii=False))
+        return await notify(self.client, obj)
+
+    async def dead_letter(self, entry_id: str, fields: dict, deliveries: int) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                STREAM_DEAD_LETTER_NAME,
+                {**fields, "id": entry_id, "deliveries": deliveries},
+                maxlen=settings.COMMENT_EVENTS_STREAM_MAXLEN,
+                approximate=True,
+            )
+            pipe.xack(CHANNEL_NAME, self.group, entry_id)
+            await pipe.execute()
+        self.stdout.write(f"Dead-lettered {entry_id} after {deliveries} deliveries")
+
+
+async def consume(stdout, options: dict[str, Any]) -> None:
+    redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    limits = httpx.Limits(max_connections=options["batch"])
+    async with httpx.AsyncClient(limits=limits) as client:
+        consumer = StreamConsumer(
+            redis,
+            client,
+            stdout,
+            group=options["group"],
+            consumer=options["consumer"],
+            batch=options["batch"],
+            block_ms=options["block_ms"],
+            claim_idle_ms=options["claim_idle_ms"],
+            max_deliveries=options["max_deliveries"],
+        )
+        await consumer.run()
+
+
 class Command(BaseCommand):
-    help = "Subscribe to Redis comments channel (async)."
+    help = (
+        "Consume comment events and forward them to the webhook. With the stream backend "
+        "(BLOG_COMMENT_EVENTS_BACKEND=stream) this process joins a Redis consumer group; "
+        "run several for more throughput. With pubsub it subscribes to the channel."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--backend",
+            choices=[COMMENT_EVENTS_STREAM, COMMENT_EVENTS_PUBSUB],
+            default=None,
+            help="Defaults to BLOG_COMMENT_EVENTS_BACKEND.",
+        )
+        parser.add_argument("--group", default=STREAM_CONSUMER_GROUP)
+        parser.add_argument(
+            "--consumer",
+            default=f"{socket.gethostname()}-{os.getpid()}",
+            help=(
+                "Consumer name, unique per process. The default includes the pid, so a "
+                "restart joins as a new member; entries the old one left pending are "
+                "reclaimed after --claim-idle-ms and the idle member is then removed. "
+                "Pass a fixed name to resume its pending entries right away instead."
+            ),
+        )
+        parser.add_argument("--batch", type=int, default=50, help="Entries per XREADGROUP.")
+        parser.add_argument("--block-ms", type=int, default=5000)
+        parser.add_argument(
+            "--claim-idle-ms",
+            type=int,
+            default=60000,
+            help=(
+                "Retry pending entries (failed or from dead consumers) idle this long, and "
+                "remove members idle this long with nothing pending. Keep it above --block-ms."
+            ),
+        )
+        parser.add_argument("--max-deliveries", type=int, default=5)
 
     def handle(self, *args: Any, **options: Any) -> None:
-        asyncio.run(listen(self.stdout))
+        backend = options["backend"] or settings.COMMENT_EVENTS_BACKEND
+        if backend == COMMENT_EVENTS_STREAM:
+            asyncio.run(consume(self.stdout, options))
+        else:
+            asyncio.run(listen(self.stdout))
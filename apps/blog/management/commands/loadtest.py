@@ -0,0 +1,213 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.blog.management.commands.seed_blog import SEED_PASSWORD
+from apps.blog.models import Post
+from apps.users.models import User
+
+DEFAULT_MIX = "list=55,retrieve=30,comment=10,login=5"
+SCENARIOS = ("list", "retrieve", "comment", "login")
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    # Seconds in, milliseconds out; nearest-rank percentiles.
+    if not latencies:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(latencies)
+
+    def percentile(value: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * value))] * 1000
+
+    return {
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS or not weight.strip().isdigit():
+            raise CommandError(
+                f"Invalid mix entry {part!r}; expected name=weight with name in {SCENARIOS}"
+            )
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise CommandError("The mix needs at least one non-zero weight")
+    return mix
+
+
+class LoadTest:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        slugs: list[str],
+        emails: list[str],
+        password: str,
+        rng: random.Random,
+    ) -> None:
+        self.client = client
+        self.slugs = slugs
+        self.emails = emails
+        self.password = password
+        self.rng = rng
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.tokens: dict[str, str] = {}
+
+    async def request(
+        self, scenario: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.statuses[scenario][type(exc).__name__] += 1
+            return None
+        self.latencies[scenario].append(time.perf_counter() - started)
+        self.statuses[scenario][str(response.status_code)] += 1
+        return response
+
+    async def login(self, email: str) -> str | None:
+        response = await self.request(
+            "login", "POST", "/api/auth/token/", json={"email": email, "password": self.password}
+        )
+        if response is None or response.status_code != 200:
+            return None
+        return response.json()["access"]
+
+    async def run_scenario(self, scenario: str) -> None:
+        if scenario == "list":
+            page = self.rng.choices((1, 2, 3), (70, 20, 10))[0]
+            await self.request("list", "GET", "/api/posts/", params={"page": page} if page > 1 else None)
+        elif scenario == "retrieve":
+            await self.request("retrieve", "GET", f"/api/posts/{self.rng.choice(self.slugs)}/")
+        elif scenario == "login":
+            email = self.rng.choice(self.emails)
+            token = await self.login(email)
+            if token:
+                self.tokens[email] = token
+        else:
+            email = self.rng.choice(self.emails)
+            token = self.tokens.get(email) or await self.login(email)
+            if not token:
+                return
+            self.tokens[email] = token
+            response = await self.request(
+                "comment",
+                "POST",
+                f"/api/posts/{self.rng.choice(self.slugs)}/comments/",
+                json={"body": f"Load test comment {self.rng.random():.6f}"},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            if response is not None and response.status_code == 401:
+                self.tokens.pop(email, None)
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        scenarios = {}
+        for name in sorted(self.statuses):
+            latencies = self.latencies[name]
+            ok = sum(count for status, count in self.statuses[name].items() if status.startswith("2"))
+            scenarios[name] = {
+                "requests": sum(self.statuses[name].values()),
+                "errors": sum(self.statuses[name].values()) - ok,
+                "rps": len(latencies) / elapsed,
+                "status": dict(self.statuses[name]),
+                **latency_summary(latencies),
+            }
+        every = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {
+            "duration_s": elapsed,
+            "requests": sum(item["requests"] for item in scenarios.values()),
+            "errors": sum(item["errors"] for item in scenarios.values()),
+            "rps": len(every) / elapsed,
+            **latency_summary(every),
+            "scenarios": scenarios,
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server with a weighted mix of post list, post retrieve, "
+        "comment create and login requests from async httpx workers, and print "
+        "throughput and p50/p95/p99 latency per scenario as JSON. Slugs and users "
+        "come from the local database (see seed_blog). Comment and login traffic "
+        "hits the rate limits unless the server runs with BLOG_RATELIMIT_ENABLE=False."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run after warmup.")
+        parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of unrecorded traffic first.")
+        parser.add_argument("--mix", default=DEFAULT_MIX)
+        parser.add_argument("--user-prefix", default="seed", help="seed_blog --prefix of the users to log in as.")
+        parser.add_argument("--password", default=SEED_PASSWORD)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", "-o", help="Also write the JSON report to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        mix = parse_mix(options["mix"])
+        slugs = list(
+            Post.objects.filter(status=Post.Status.PUBLISHED)
+            .order_by("-created_at")
+            .values_list("slug", flat=True)[:1000]
+        )
+        emails = list(
+            User.objects.filter(email__startswith=f"{options['user_prefix']}-user-")
+            .order_by("id")
+            .values_list("email", flat=True)[:200]
+        )
+        if not slugs:
+            raise CommandError("No published posts; run seed_blog first")
+        if not emails and (mix.get("comment") or mix.get("login")):
+            raise CommandError(f"No {options['user_prefix']!r} users; run seed_blog first")
+
+        report = asyncio.run(self.run(options, mix, slugs, emails))
+        report.update(
+            base_url=options["base_url"],
+            concurrency=options["concurrency"],
+            mix=mix,
+        )
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output + "\n")
+        self.stdout.write(output)
+
+    async def run(
+        self, options: dict[str, Any], mix: dict[str, int], slugs: list[str], emails: list[str]
+    ) -> dict[str, Any]:
+        limits = httpx.Limits(max_connections=options["concurrency"])
+        async with httpx.AsyncClient(base_url=options["base_url"], limits=limits, timeout=30) as client:
+            rng = random.Random(options["seed"])
+            names, weights = zip(*mix.items(), strict=True)
+
+            async def drive(test: LoadTest, seconds: float) -> float:
+                deadline = time.perf_counter() + seconds
+
+                async def worker() -> None:
+                    while time.perf_counter() < deadline:
+                        await test.run_scenario(rng.choices(names, weights)[0])
+
+                started = time.perf_counter()
+                await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+                return time.perf_counter() - started
+
+            warmup = LoadTest(client, slugs, emails, options["password"], rng)
+            await drive(warmup, options["warmup"])
+            test = LoadTest(client, slugs, emails, options["password"], rng)
+            test.tokens = warmup.tokens
+            return test.report(await drive(test, options["duration"]))
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.blog.cache import delete_post_detail, delete_post_fragments, fragment_version
+from apps.blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.comment_count and Post.tag_names from the source tables."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        chunk_size = options["chunk_size"]
+        last_id, scanned, changed = 0, 0, 0
+
+        while True:
+            posts = list(
+                Post.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", "slug", "updated_at", "comment_count", "tag_names")[:chunk_size]
+            )
+            if not posts:
+                break
+            post_ids, last_id = [post.id for post in posts], posts[-1].id
+
+            comment_counts = dict(
+                Comment.objects.filter(post_id__in=post_ids)
+                .values("post_id")
+                .annotate(total=Count("id"))
+                .values_list("post_id", "total")
+            )
+            tag_names: dict[int, list[str]] = defaultdict(list)
+            for post_id, name in (
+                Post.tags.through.objects.filter(post_id__in=post_ids)
+                .order_by("id")
+                .values_list("post_id", "tag__name")
+            ):
+                tag_names[post_id].append(name)
+
+            stale, now = [], timezone.now()
+            for post in posts:
+                comment_count = comment_counts.get(post.id, 0)
+                names = tag_names.get(post.id, [])
+                if post.comment_count != comment_count or post.tag_names != names:
+                    post.comment_count, post.tag_names = comment_count, names
+                    post.counters_updated_at = now
+                    stale.append(post)
+            if stale:
+                Post.objects.bulk_update(
+                    stale, ["comment_count", "tag_names", "counters_updated_at"]
+                )
+                # Neither field is in the fragment version or the list pages.
+                for post in stale:
+                    delete_post_fragments(post.id, fragment_version(post))
+                delete_post_detail(*(post.slug for post in stale))
+
+            scanned += len(posts)
+            changed += len(stale)
+        self.stdout.write(f"scanned={scanned} updated={changed}")
@@ -0,0 +1,22 @@
+from typing import Any
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from apps.core.stats import STATS_KEYS, reconcile_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount published posts, users and comments and overwrite the Redis stats "
+        "counters. Run periodically (e.g. from cron) to correct drift from writes "
+        "that bypass the API, such as admin edits or cascading user deletes."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        before = cache.get_many(list(STATS_KEYS.values()))
+        counts = reconcile_stats()
+        for name, value in counts.items():
+            previous = before.get(STATS_KEYS[name])
+            drift = "missing" if previous is None else f"drift={previous - value:+d}"
+            self.stdout.write(f"{name}={value} {drift}")
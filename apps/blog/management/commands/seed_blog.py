@@ -0,0 +1,204 @@
+import random
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.blog.cache import bump_list_cache_generation
+from apps.blog.facets import rebuild_facet_counts
+from apps.blog.models import Category, Comment, Post, Tag
+from apps.core.stats import reconcile_stats
+from apps.users.models import User
+
+SEED_PASSWORD = "seed-password-123"
+WORDS = (
+    "django", "api", "cache", "redis", "query", "index", "latency", "async", "python", "server",
+    "request", "response", "database", "post", "comment", "author", "review", "release",
+    "deploy", "profile", "stream", "queue", "worker", "metric", "trace", "budget", "plan",
+    "search", "feed", "page", "token", "the", "a", "of", "and", "to", "in", "is", "for", "on",
+    "with", "that", "this", "it", "as", "are", "be", "at", "by", "from",
+)
+LANGUAGES = (("en", 70), ("ru", 20), ("kk", 10))
+TIMEZONES = ("UTC", "Europe/Moscow", "Asia/Almaty", "America/New_York")
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> list[float]:
+    # A few authors, tags and posts get most of the activity, like real blogs.
+    return [1 / (rank**exponent) for rank in range(1, count + 1)]
+
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate users, categories, tags, posts and comments with bulk inserts for "
+        "load tests and profiling. Authors, tags and commented posts follow a Zipf "
+        f"distribution; every seeded user logs in with password {SEED_PASSWORD!r}."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--posts", type=int, default=5000)
+        parser.add_argument("--comments", type=int, default=20000)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument("--categories", type=int, default=10)
+        parser.add_argument("--draft-ratio", type=float, default=0.1)
+        parser.add_argument("--days", type=int, default=365, help="Spread created_at over this many days.")
+        parser.add_argument("--prefix", default="seed", help="Prefix for emails, slugs and names.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        prefix = options["prefix"]
+        if User.objects.filter(email__startswith=f"{prefix}-user-").exists():
+            raise CommandError(f"Prefix {prefix!r} was already seeded; pass another --prefix")
+        if options["users"] < 1 or (options["comments"] and options["posts"] < 1):
+            raise CommandError("Need at least one user, and posts to attach comments to")
+
+        rng = random.Random(options["seed"])
+        started = time.perf_counter()
+        with transaction.atomic():
+            users = self.seed_users(rng, options)
+            categories, tags = self.seed_taxonomy(options)
+            posts = self.seed_posts(rng, options, users, categories, tags)
+            comments = self.seed_comments(rng, options, users, posts)
+        bump_list_cache_generation()
+        rebuild_facet_counts()
+        reconcile_stats()
+        self.stdout.write(
+            f"Seeded users={len(users)} posts={len(posts)} comments={comments} "
+            f"tags={len(tags)} categories={len(categories)} "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def seed_users(self, rng: random.Random, options: dict[str, Any]) -> list[User]:
+        # One hash for everyone; hashing per user would dominate the run.
+        password = make_password(SEED_PASSWORD)
+        languages, weights = zip(*LANGUAGES, strict=True)
+        return User.objects.bulk_create(
+            (
+                User(
+                    email=f"{options['prefix']}-user-{index}@example.com",
+                    first_name=f"Seed{index}",
+                    last_name="User",
+                    password=password,
+                    language=rng.choices(languages, weights)[0],
+                    timezone=rng.choice(TIMEZONES),
+                )
+                for index in range(options["users"])
+            ),
+            batch_size=options["batch_size"],
+        )
+
+    def seed_taxonomy(self, options: dict[str, Any]) -> tuple[list[Category], list[Tag]]:
+        prefix = options["prefix"]
+        categories = Category.objects.bulk_create(
+            Category(
+                name=f"{prefix.title()} category {index}",
+                name_ru=f"Категория {index}",
+                name_kk=f"Санат {index}",
+                slug=f"{prefix}-category-{index}",
+            )
+            for index in range(options["categories"])
+        )
+        tags = Tag.objects.bulk_create(
+            Tag(name=f"{prefix}-tag-{index}", slug=f"{prefix}-tag-{index}")
+            for index in range(options["tags"])
+        )
+        return categories, tags
+
+    def seed_posts(
+        self,
+        rng: random.Random,
+        options: dict[str, Any],
+        users: list[User],
+        categories: list[Category],
+        tags: list[Tag],
+    ) -> list[Post]:
+        now = timezone.now()
+        author_weights = zipf_weights(len(users))
+        tag_weights = zipf_weights(len(tags))
+        posts, post_tags = [], []
+        for index in range(options["posts"]):
+            # Skewed towards recent posts; body length is roughly log-normal.
+            created_at = now - timedelta(days=options["days"] * rng.random() ** 2)
+            edited = rng.random() < 0.3
+            chosen_tags = []
+            if tags:
+                count = min(len(tags), rng.choices((0, 1, 2, 3, 4, 5), (5, 20, 30, 25, 15, 5))[0])
+                while len(chosen_tags) < count:
+                    tag = rng.choices(tags, tag_weights)[0]
+                    if tag not in chosen_tags:
+                        chosen_tags.append(tag)
+            posts.append(
+                Post(
+                    author=rng.choices(users, author_weights)[0],
+                    category=rng.choice(categories) if categories and rng.random() < 0.9 else None,
+                    title=sentence(rng, 3, 10),
+                    slug=f"{options['prefix']}-post-{index}",
+                    body="\n\n".join(
+                        sentence(rng, 20, 80)
+                        for _ in range(max(1, int(rng.lognormvariate(1.2, 0.6))))
+                    ),
+                    status=(
+                        Post.Status.DRAFT
+                        if rng.random() < options["draft_ratio"]
+                        else Post.Status.PUBLISHED
+                    ),
+                    tag_names=[tag.name for tag in chosen_tags],
+                    created_at=created_at,
+                    updated_at=created_at + timedelta(hours=rng.random() * 48 if edited else 0),
+                )
+            )
+            post_tags.append(chosen_tags)
+
+        # created_at/updated_at are auto fields; bulk_create overwrites them,
+        # bulk_update does not.
+        dates = [(post.created_at, post.updated_at) for post in posts]
+        posts = Post.objects.bulk_create(posts, batch_size=options["batch_size"])
+        for post, (created_at, updated_at) in zip(posts, dates, strict=True):
+            post.created_at, post.updated_at = created_at, min(updated_at, now)
+        Post.objects.bulk_update(posts, ["created_at", "updated_at"], batch_size=options["batch_size"])
+        Post.tags.through.objects.bulk_create(
+            (
+                Post.tags.through(post_id=post.id, tag_id=tag.id)
+                for post, chosen in zip(posts, post_tags, strict=True)
+                for tag in chosen
+            ),
+            batch_size=options["batch_size"] * 5,
+        )
+        return posts
+
+    def seed_comments(
+        self, rng: random.Random, options: dict[str, Any], users: list[User], posts: list[Post]
+    ) -> int:
+        published = [post for post in posts if post.status == Post.Status.PUBLISHED]
+        if not published or not options["comments"]:
+            return 0
+        # Newest posts collect most comments, with a long tail of old ones.
+        published.sort(key=lambda post: post.created_at, reverse=True)
+        post_weights = zipf_weights(len(published), exponent=0.9)
+        now = timezone.now()
+        counts: dict[int, int] = {}
+        comments, dates = [], []
+        for post in rng.choices(published, post_weights, k=options["comments"]):
+            counts[post.id] = counts.get(post.id, 0) + 1
+            comments.append(
+                Comment(post_id=post.id, author=rng.choice(users), body=sentence(rng, 3, 40))
+            )
+            dates.append(post.created_at + (now - post.created_at) * rng.random())
+
+        comments = Comment.objects.bulk_create(comments, batch_size=options["batch_size"])
+        for comment, created_at in zip(comments, dates, strict=True):
+            comment.created_at = created_at
+        Comment.objects.bulk_update(comments, ["created_at"], batch_size=options["batch_size"])
+        for post in published:
+            post.comment_count = counts.get(post.id, 0)
+        Post.objects.bulk_update(published, ["comment_count"], batch_size=options["batch_size"])
+        return len(comments)
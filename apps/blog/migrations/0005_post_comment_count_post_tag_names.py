@@ -0,0 +1,52 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:00
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    comment_counts = (
+        Comment.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Post.objects.update(comment_count=Coalesce(Subquery(comment_counts), 0))
+
+    tag_names = defaultdict(list)
+    for post_id, name in (
+        Post.tags.through.objects.order_by("id").values_list("post_id", "tag__name").iterator()
+    ):
+        tag_names[post_id].append(name)
+    Post.objects.bulk_update(
+        [Post(id=post_id, tag_names=names) for post_id, names in tag_names.items()],
+        ["tag_names"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = (
+        ("blog", "0004_category_name_kk_category_name_ru"),
+    )
+
+    operations = (
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="tag_names",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    )
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+# The document covers every search config (english, russian, simple), title
+# weighted A and body B; the query side picks the config per request.
+POSTGRES_INSTALL_SQL = (
+    (
+        "ALTER TABLE blog_post ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(body, '')), 'B') || "
+        "setweight(to_tsvector('russian'::regconfig, coalesce(body, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(body, '')), 'B')"
+        ") STORED"
+    ),
+    "CREATE INDEX blog_post_search_vector_idx ON blog_post USING GIN (search_vector)",
+)
+POSTGRES_UNINSTALL_SQL = (
+    "DROP INDEX IF EXISTS blog_post_search_vector_idx",
+    "ALTER TABLE blog_post DROP COLUMN IF EXISTS search_vector",
+)
+
+SQLITE_INSTALL_SQL = (
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5("
+        "title, body, content='blog_post', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS blog_post_fts_insert AFTER INSERT ON blog_post BEGIN "
+        "INSERT INTO blog_post_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS blog_post_fts_delete AFTER DELETE ON blog_post BEGIN "
+        "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS blog_post_fts_update AFTER UPDATE OF title, body ON blog_post BEGIN "
+        "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO blog_post_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+        "END"
+    ),
+    "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')",
+)
+SQLITE_UNINSTALL_SQL = (
+    "DROP TRIGGER IF EXISTS blog_post_fts_insert",
+    "DROP TRIGGER IF EXISTS blog_post_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_post_fts_update",
+    "DROP TABLE IF EXISTS blog_post_fts",
+)
+
+INSTALL_SQL = {"postgresql": POSTGRES_INSTALL_SQL, "sqlite": SQLITE_INSTALL_SQL}
+UNINSTALL_SQL = {"postgresql": POSTGRES_UNINSTALL_SQL, "sqlite": SQLITE_UNINSTALL_SQL}
+
+
+def install_search(apps, schema_editor):
+    for statement in INSTALL_SQL.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def uninstall_search(apps, schema_editor):
+    for statement in UNINSTALL_SQL.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = (
+        ("blog", "0006_post_comment_hot_query_indexes"),
+    )
+
+    operations = (
+        migrations.RunPython(install_search, uninstall_search),
+    )
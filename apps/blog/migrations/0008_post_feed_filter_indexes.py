@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = (
+        ("blog", "0007_post_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    )
+
+    operations = (
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["category", "-created_at", "-id"],
+                name="post_pub_category_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["author", "-created_at", "-id"],
+                name="post_pub_author_created_idx",
+            ),
+        ),
+    )
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = (
+        ("blog", "0008_post_feed_filter_indexes"),
+    )
+
+    operations = (
+        migrations.AddField(
+            model_name="post",
+            name="counters_updated_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    )
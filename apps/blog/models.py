@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Now
 
 
 class Category(models.Model):
@@ -41,10 +43,53 @@ class Post(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized for the read path; maintained by refresh_tag_names() and
+    # adjust_comment_count(), rebuilt by the rebuild_post_counters command.
+    comment_count = models.PositiveIntegerField(default=0)
+    tag_names = models.JSONField(default=list, blank=True)
+    # Counter changes leave updated_at alone (it versions the cached post);
+    # incremental exports read this watermark to pick them up.
+    counters_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = (
+            # Published feed: WHERE status = 'published' ORDER BY created_at DESC, id DESC.
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=Q(status="published"),
+                name="post_published_created_idx",
+            ),
+            # Feed filters: ?category= and ?author= on published posts.
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                condition=Q(status="published"),
+                name="post_pub_category_created_idx",
+            ),
+            models.Index(
+                fields=["author", "-created_at", "-id"],
+                condition=Q(status="published"),
+                name="post_pub_author_created_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title
 
+    def refresh_tag_names(self) -> None:
+        self.tag_names = list(
+            Post.tags.through.objects.filter(post_id=self.pk)
+            .order_by("id")
+            .values_list("tag__name", flat=True)
+        )
+        Post.objects.filter(pk=self.pk).update(tag_names=self.tag_names)
+
+    @staticmethod
+    def adjust_comment_count(post_id: int, delta: int) -> None:
+        Post.objects.filter(pk=post_id).update(
+            comment_count=Greatest(F("comment_count") + delta, 0),
+            counters_updated_at=Now(),
+        )
+
 
 class Comment(models.Model):
     id = models.AutoField(primary_key=True)
@@ -55,5 +100,12 @@ class Comment(models.Model):
     body = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=["post", "-created_at", "-id"], name="comment_post_created_idx"
+            ),
+        )
+
     def __str__(self) -> str:
         return f"Comment {self.id}"
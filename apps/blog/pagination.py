@@ -0,0 +1,215 @@
+import base64
+import json
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+PAGINATION_MODE_QUERY_PARAM = "pagination"
+PAGINATION_MODE_CURSOR = "cursor"
+
+
+class CachedPageNumberPagination(PageNumberPagination):
+    def get_cache_position(self, request: Request) -> str:
+        return f"page:{request.query_params.get(self.page_query_param, '1')}"
+
+    def get_page_state(self) -> dict[str, Any]:
+        return {
+            "count": self.page.paginator.count,
+            "number": self.page.number,
+            "has_next": self.page.has_next(),
+            "has_previous": self.page.has_previous(),
+        }
+
+    def get_cached_paginated_response(
+        self, request: Request, state: dict[str, Any], data: list
+    ) -> Response:
+        url = request.build_absolute_uri()
+        next_link = None
+        if state["has_next"]:
+            next_link = replace_query_param(
+                url, self.page_query_param, state["number"] + 1
+            )
+        previous_link = None
+        if state["has_previous"]:
+            if state["number"] - 1 == 1:
+                previous_link = remove_query_param(url, self.page_query_param)
+            else:
+                previous_link = replace_query_param(
+                    url, self.page_query_param, state["number"] - 1
+                )
+        return Response(
+            {
+                "count": state["count"],
+                "next": next_link,
+                "previous": previous_link,
+                "results": data,
+            }
+        )
+
+
+class KeysetPagination(BasePagination):
+    # Seeks on (created_at, id) instead of COUNT(*) + OFFSET, so every page
+    # costs the same as the first one. Opt in with ?pagination=cursor.
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def is_requested(cls, request: Request | None) -> bool:
+        if request is None:
+            return False
+        return (
+            request.query_params.get(PAGINATION_MODE_QUERY_PARAM) == PAGINATION_MODE_CURSOR
+            or cls.cursor_query_param in request.query_params
+        )
+
+    def get_cache_position(self, request: Request) -> str:
+        return f"cursor:{request.query_params.get(self.cursor_query_param) or 'first'}"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list:
+        self.request = request
+        position = self.decode_cursor(request)
+        reverse = position is not None and position[2]
+        if position is None:
+            queryset = queryset.order_by("-created_at", "-id")
+        else:
+            created_at, pk, _ = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                ).order_by("created_at", "id")
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                ).order_by("-created_at", "-id")
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_cursor = self.encode_cursor(rows[-1], False) if has_next and rows else None
+        self.previous_cursor = (
+            self.encode_cursor(rows[0], True) if has_previous and rows else None
+        )
+        return rows
+
+    def decode_cursor(self, request: Request) -> tuple[datetime, int, bool] | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            return datetime.fromisoformat(decoded["c"]), int(decoded["i"]), bool(decoded["r"])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    @staticmethod
+    def encode_cursor(obj: Any, reverse: bool) -> str:
+        payload = {"c": obj.created_at.isoformat(), "i": obj.id, "r": int(reverse)}
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("ascii")
+        ).decode("ascii")
+
+    def get_page_state(self) -> dict[str, Any]:
+        return {"next": self.next_cursor, "previous": self.previous_cursor}
+
+    def get_cursor_link(self, request: Request, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        url = replace_query_param(
+            request.build_absolute_uri(), PAGINATION_MODE_QUERY_PARAM, PAGINATION_MODE_CURSOR
+        )
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_cached_paginated_response(
+        self, request: Request, state: dict[str, Any], data: list
+    ) -> Response:
+        return Response(
+            {
+                "next": self.get_cursor_link(request, state["next"]),
+                "previous": self.get_cursor_link(request, state["previous"]),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response(self, data: list) -> Response:
+        return self.get_cached_paginated_response(self.request, self.get_page_state(), data)
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class SearchKeysetPagination(BasePagination):
+    # Seeks on (rank, id) over full-text search results. Forward only: a
+    # ranked result set has no stable "previous" anchor worth paying for.
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_search(
+        self, request: Request, search: Callable[[tuple[float, int] | None, int], list]
+    ) -> list:
+        self.request = request
+        rows = search(self.decode_cursor(request), self.page_size + 1)
+        has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_cursor = self.encode_cursor(rows[-1]) if has_next else None
+        return rows
+
+    def decode_cursor(self, request: Request) -> tuple[float, int] | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            return float(decoded["s"]), int(decoded["i"])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    @staticmethod
+    def encode_cursor(obj: Any) -> str:
+        payload = {"s": obj.rank, "i": obj.id}
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("ascii")
+        ).decode("ascii")
+
+    def get_paginated_response(self, data: list) -> Response:
+        next_link = None
+        if self.next_cursor is not None:
+            next_link = replace_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor
+            )
+        return Response({"next": next_link, "results": data})
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -1,14 +1,28 @@
 import json
 from typing import Any
 
+from django.conf import settings
 from django_redis import get_redis_connection
 
+from apps.core.metrics import record_comment_event
+
 CHANNEL_NAME = "comments"
 EVENT_TYPE_COMMENT_CREATED = "comment.created"
 
+COMMENT_EVENTS_PUBSUB = "pubsub"
+COMMENT_EVENTS_STREAM = "stream"
 
-def publish_comment_created(comment: Any) -> None:
-    payload = {
+# Stream backend: events are appended to the CHANNEL_NAME stream under the
+# "data" field with the same JSON payload PUBLISH sends, and consumed by the
+# listen_comments consumer group. Entries that keep failing move to the
+# dead-letter stream.
+STREAM_DATA_FIELD = "data"
+STREAM_CONSUMER_GROUP = "listen_comments"
+STREAM_DEAD_LETTER_NAME = f"{CHANNEL_NAME}:dead"
+
+
+def comment_created_payload(comment: Any) -> dict[str, Any]:
+    return {
         "type": EVENT_TYPE_COMMENT_CREATED,
         "comment_id": comment.id,
         "post_id": comment.post_id,
@@ -16,5 +30,21 @@ def publish_comment_created(comment: Any) -> None:
         "body": comment.body,
         "created_at": comment.created_at.isoformat(),
     }
+
+
+def publish_comment_created(comment: Any) -> None:
+    data = json.dumps(comment_created_payload(comment), ensure_ascii=False)
     redis_connection = get_redis_connection("default")
-    redis_connection.publish(CHANNEL_NAME, json.dumps(payload, ensure_ascii=False))
+    if settings.COMMENT_EVENTS_BACKEND == COMMENT_EVENTS_STREAM:
+        # Approximate trimming lets Redis drop whole macro nodes, which keeps
+        # XADD O(1); the stream stays at or slightly above the limit.
+        redis_connection.xadd(
+            CHANNEL_NAME,
+            {STREAM_DATA_FIELD: data},
+            maxlen=settings.COMMENT_EVENTS_STREAM_MAXLEN,
+            approximate=True,
+        )
+    else:
+        redis_connection.publish(CHANNEL_NAME, data)
+    record_comment_event()
+
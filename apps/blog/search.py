@@ -0,0 +1,143 @@
+import re
+from typing import Any
+
+from django.db import connection, connections
+from django.db.models import FloatField, Q, Value
+
+from apps.blog.models import Post
+
+# Posts carry no language of their own, so the PostgreSQL document (the
+# search_vector column added by migration 0007) is built with every config
+# and the query side picks the one matching the request.
+SEARCH_CONFIGS = {"en": "english", "ru": "russian", "kk": "simple"}
+DEFAULT_SEARCH_CONFIG = "simple"
+
+# External-content FTS5 table kept in sync with blog_post by triggers, both
+# created by migration 0007. Table rebuilds done by later SQLite migrations
+# drop the triggers, so install_sqlite_search() recreates them on post_migrate.
+SQLITE_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5("
+    "title, body, content='blog_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+SQLITE_TRIGGERS = {
+    "blog_post_fts_insert": (
+        "AFTER INSERT ON blog_post BEGIN "
+        "INSERT INTO blog_post_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+        "END"
+    ),
+    "blog_post_fts_delete": (
+        "AFTER DELETE ON blog_post BEGIN "
+        "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "END"
+    ),
+    "blog_post_fts_update": (
+        "AFTER UPDATE OF title, body ON blog_post BEGIN "
+        "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO blog_post_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+        "END"
+    ),
+}
+
+POSTGRES_SEARCH_SQL = """
+    SELECT id, updated_at, comment_count, rank FROM (
+        SELECT p.id, p.updated_at, p.comment_count, ts_rank(p.search_vector, q.query) AS rank
+        FROM blog_post p, websearch_to_tsquery(%s::regconfig, %s) AS q(query)
+        WHERE p.status = %s AND p.search_vector @@ q.query
+    ) ranked
+    {seek}
+    ORDER BY rank DESC, id DESC
+    LIMIT %s
+"""
+POSTGRES_SEEK_SQL = "WHERE (rank, id) < (%s::real, %s)"
+
+SQLITE_SEARCH_SQL = """
+    SELECT id, updated_at, comment_count, rank FROM (
+        SELECT p.id, p.updated_at, p.comment_count, -bm25(blog_post_fts, 10.0, 1.0) AS rank
+        FROM blog_post_fts JOIN blog_post p ON p.id = blog_post_fts.rowid
+        WHERE blog_post_fts MATCH %s AND p.status = %s
+    ) ranked
+    {seek}
+    ORDER BY rank DESC, id DESC
+    LIMIT %s
+"""
+SQLITE_SEEK_SQL = "WHERE rank < %s OR (rank = %s AND id < %s)"
+
+FTS_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_config(lang: str) -> str:
+    return SEARCH_CONFIGS.get(lang, DEFAULT_SEARCH_CONFIG)
+
+
+def fts5_query(query: str) -> str:
+    # Every token is quoted so user input can never be parsed as FTS5 syntax.
+    return " ".join(f'"{token}"' for token in FTS_TOKEN_RE.findall(query))
+
+
+def install_sqlite_search(db: Any = connection) -> None:
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'blog_post'"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing >= set(SQLITE_TRIGGERS):
+            return
+        cursor.execute(SQLITE_TABLE_SQL)
+        for name, body in SQLITE_TRIGGERS.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        # Rows written while triggers were missing are not indexed yet.
+        cursor.execute("INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')")
+
+
+def search_posts(
+    query: str, lang: str, after: tuple[float, int] | None, limit: int
+) -> list[Post]:
+    # Returns published posts ordered by (rank, id) descending with only
+    # id/updated_at/comment_count loaded and the score on .rank.
+    if connection.vendor not in ("postgresql", "sqlite"):
+        return _search_posts_unranked(query, after, limit)
+    status = Post.Status.PUBLISHED
+    if connection.vendor == "postgresql":
+        sql = POSTGRES_SEARCH_SQL.format(seek=POSTGRES_SEEK_SQL if after else "")
+        params: list[Any] = [search_config(lang), query, status]
+        if after:
+            params += [after[0], after[1]]
+    elif connection.vendor == "sqlite":
+        match = fts5_query(query)
+        if not match:
+            return []
+        sql = SQLITE_SEARCH_SQL.format(seek=SQLITE_SEEK_SQL if after else "")
+        params = [match, status]
+        if after:
+            params += [after[0], after[0], after[1]]
+    return list(Post.objects.raw(sql, [*params, limit]))
+
+
+def _search_posts_unranked(
+    query: str, after: tuple[float, int] | None, limit: int
+) -> list[Post]:
+    # Databases without a full-text index: every token has to appear in the
+    # title or body, case-insensitively. All rows rank 0, newest id first,
+    # so the (rank, id) cursor seeks on id alone.
+    tokens = FTS_TOKEN_RE.findall(query)
+    if not tokens:
+        return []
+    queryset = Post.objects.filter(status=Post.Status.PUBLISHED)
+    for token in tokens:
+        queryset = queryset.filter(Q(title__icontains=token) | Q(body__icontains=token))
+    if after:
+        queryset = queryset.filter(id__lt=after[1])
+    return list(
+        queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+        .only("id", "updated_at", "comment_count")
+        .order_by("-id")[:limit]
+    )
+
+
+def restore_sqlite_search(sender: Any, using: str, **kwargs: Any) -> None:
+    db = connections[using]
+    if db.vendor == "sqlite" and "blog_post_fts" in db.introspection.table_names():
+        install_sqlite_search(db)
@@ -1,19 +1,41 @@
 import logging
-import zoneinfo
-from babel.dates import format_datetime
-from typing import Any
+from typing import Any, ClassVar
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+from django.db import transaction
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
+from apps.blog.cache import cache_language
+from apps.blog.formatting import format_dt, resolve_date_locale, to_canonical
 from apps.blog.models import Category, Comment, Post, Tag
 
 logger = logging.getLogger("blog")
 
 
+def localized_category_name(name: str, name_ru: str, name_kk: str, lang: str) -> str:
+    if lang == "ru":
+        return name_ru or name
+    if lang == "kk":
+        return name_kk or name
+    return name
+
+
+def context_language(context: dict[str, Any]) -> str:
+    # The read views fold the request language once and pass it as "lang",
+    # the value their cache keys use, so a cached payload always matches
+    # its key. Other callers get the same folding.
+    lang = context.get("lang")
+    if lang is None:
+        lang = cache_language(getattr(context.get("request"), "LANGUAGE_CODE", None))
+    return lang
+
+
 class PostReadSerializer(serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source="author.email")
     category = serializers.SerializerMethodField()
-    tags = serializers.StringRelatedField(many=True, read_only=True)
+    tags = serializers.ReadOnlyField(source="tag_names")
     created_at = serializers.SerializerMethodField()
     updated_at = serializers.SerializerMethodField()
 
@@ -31,34 +53,113 @@ class PostReadSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
             "updated_at",
+            "comment_count",
         ]
         read_only_fields = fields
 
+    FAST_VALUE_FIELDS = (
+        "id",
+        "author__email",
+        "title",
+        "slug",
+        "body",
+        "category_id",
+        "category__name",
+        "category__name_ru",
+        "category__name_kk",
+        "tag_names",
+        "status",
+        "created_at",
+        "updated_at",
+        "comment_count",
+    )
+
+    @classmethod
+    def fast_values(cls, queryset):
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .values_list(*cls.FAST_VALUE_FIELDS)
+        )
+
+    @classmethod
+    def fast_data(cls, queryset, context: dict[str, Any]) -> list[dict[str, Any]]:
+        # Same output as ``cls(queryset, many=True, context=context).data``,
+        # built from values_list() tuples without model instances or DRF
+        # field machinery.
+        return cls.fast_data_from_rows(list(cls.fast_values(queryset)), context)
+
+    @classmethod
+    async def afast_data(cls, queryset, context: dict[str, Any]) -> list[dict[str, Any]]:
+        rows = [row async for row in cls.fast_values(queryset)]
+        return cls.fast_data_from_rows(rows, context)
+
+    @classmethod
+    def fast_data_from_rows(
+        cls, rows: list[tuple], context: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        serializer = cls(context=context)
+        lang = context_language(context)
+
+        data = []
+        for (
+            post_id,
+            author_email,
+            title,
+            slug,
+            body,
+            category_id,
+            category_name,
+            category_name_ru,
+            category_name_kk,
+            tag_names,
+            post_status,
+            created_at,
+            updated_at,
+            comment_count,
+        ) in rows:
+            data.append(
+                {
+                    "id": post_id,
+                    "author": author_email,
+                    "title": title,
+                    "slug": slug,
+                    "body": body,
+                    "category": None
+                    if category_id is None
+                    else localized_category_name(
+                        category_name, category_name_ru, category_name_kk, lang
+                    ),
+                    "tags": tag_names,
+                    "status": post_status,
+                    "created_at": serializer._format_dt(created_at),
+                    "updated_at": serializer._format_dt(updated_at),
+                    "comment_count": comment_count,
+                }
+            )
+        return data
+
     def get_category(self, obj):
         if obj.category is None:
             return None
-        request = self.context.get("request")
-        lang = getattr(request, "LANGUAGE_CODE", "en") if request else "en"
-        if lang == "ru":
-            return obj.category.name_ru or obj.category.name
-        if lang == "kk":
-            return obj.category.name_kk or obj.category.name
-        return obj.category.name
+        return localized_category_name(
+            obj.category.name,
+            obj.category.name_ru,
+            obj.category.name_kk,
+            context_language(self.context),
+        )
 
     def _format_dt(self, dt):
-        request = self.context.get("request")
+        # Cached payloads keep raw UTC timestamps; they are localized per
+        # caller by apps.blog.formatting.localize_post_dates after the read.
+        if self.context.get("canonical_dates"):
+            return to_canonical(dt)
+        lang, tz_name = self._date_locale
+        return format_dt(dt, lang, tz_name)
 
-        if request and request.user.is_authenticated:
-            lang = request.LANGUAGE_CODE
-            tz_name = request.user.timezone or "UTC"
-        else:
-            lang = "en"
-            tz_name = "UTC"
-
-        tz = zoneinfo.ZoneInfo(tz_name)
-        dt_local = dt.astimezone(tz)
-
-        return format_datetime(dt_local, format="long", locale=lang)
+    @cached_property
+    def _date_locale(self) -> tuple[str, str]:
+        return resolve_date_locale(self.context.get("request"))
 
     def get_created_at(self, obj):
         return self._format_dt(obj.created_at)
@@ -67,6 +168,41 @@ class PostReadSerializer(serializers.ModelSerializer):
         return self._format_dt(obj.updated_at)
 
 
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    # ManyRelatedField looks every pk up with its own query; this resolves
+    # the whole list with one in_bulk() and keeps the same error messages.
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+        queryset = self.child_relation.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in data:
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pks.append(pk_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError):
+                self.child_relation.fail("incorrect_type", data_type=type(item).__name__)
+        found = queryset.in_bulk(pks)
+        for pk in pks:
+            if pk not in found:
+                self.child_relation.fail("does_not_exist", pk_value=pk)
+        return [found[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key, value in kwargs.items():
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = value
+        return BulkManyRelatedField(**list_kwargs)
+
+
 class PostWriteSerializer(serializers.ModelSerializer):
     category_id = serializers.PrimaryKeyRelatedField(
         source="category",
@@ -74,7 +210,7 @@ class PostWriteSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
-    tag_ids = serializers.PrimaryKeyRelatedField(
+    tag_ids = BulkPrimaryKeyRelatedField(
         source="tags", queryset=Tag.objects.all(), many=True, required=False
     )
 
@@ -88,17 +224,34 @@ class PostWriteSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(_("Title cannot be empty."))
         return value
 
+    @transaction.atomic
     def create(self, validated_data: dict[str, Any]) -> Post:
         post = super().create(validated_data)
+        post.refresh_tag_names()
         logger.info("Post serializer created post_id=%s", post.id)
         return post
 
+    @transaction.atomic
     def update(self, instance: Post, validated_data: dict[str, Any]) -> Post:
         post = super().update(instance, validated_data)
+        if "tags" in validated_data:
+            post.refresh_tag_names()
         logger.info("Post serializer updated post_id=%s", post.id)
         return post
 
 
+class PostImportItemSerializer(PostWriteSerializer):
+    # One bulk import item. Relation ids and slug uniqueness are checked for
+    # the whole batch at once by bulk_import_posts(), not per item.
+    category_id = serializers.IntegerField(required=False, allow_null=True, min_value=1)
+    tag_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
+
+    class Meta(PostWriteSerializer.Meta):
+        extra_kwargs: ClassVar[dict[str, dict]] = {"slug": {"validators": []}}
+
+
 class CommentReadSerializer(serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source="author.email")
     post = serializers.ReadOnlyField(source="post.slug")
@@ -1,23 +1,25 @@
-import asyncio
-
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 
-from apps.blog.models import Post
-from apps.users.models import User
+from apps.core.query_budget import query_budget
+from apps.core.stats import aget_stats, reconcile_stats
 
 
 @extend_schema(
     tags=["Stats"],
     summary="Get API stats",
-    description="Returns total number of published posts and registered users.",
+    description=(
+        "Returns total number of published posts, registered users and comments. "
+        "Counts come from counters maintained on writes and are reconciled periodically."
+    ),
     responses={
         200: OpenApiResponse(description="Stats returned"),
     },
 )
+@query_budget(3)
 async def stats_view(request):
-    post_count, user_count = await asyncio.gather(
-        Post.objects.acount(),
-        User.objects.acount(),
-    )
-    return JsonResponse({"posts": post_count, "users": user_count})
+    stats = await aget_stats()
+    if stats is None:
+        stats = await sync_to_async(reconcile_stats)()
+    return JsonResponse(stats)
@@ -1 +1,1005 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import io
+import json
+import re
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock, skipIf, skipUnless
+
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.blog import async_views, stats_view, views
+from apps.blog.cache import (
+    bump_list_cache_generation,
+    fragment_version,
+    get_or_rebuild,
+    set_fragments,
+)
+from apps.blog.importing import validate_import_items
+from apps.blog.management.commands import listen_comments
+from apps.blog.models import Category, Comment, Post, Tag
+from apps.blog.redis_events import (
+    CHANNEL_NAME,
+    STREAM_DATA_FIELD,
+    STREAM_DEAD_LETTER_NAME,
+)
+from apps.blog.serializers import PostReadSerializer
+from apps.blog.views import PostViewSet
+from apps.core.query_budget import assert_max_queries
+from apps.core.stats import STATS_COMMENTS_KEY, count_stats_from_db, reconcile_stats
+from apps.users.models import User
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+def fake_redis_caches(server: Any = None, **options: Any) -> dict:
+    # The real cache backend, its client and apps.core.async_cache against an
+    # in-process fake server, so cache behaviour is tested without a Redis
+    # instance. django-redis
+    # keeps one pool per URL for the whole process, hence a URL per server.
+    server = server or fakeredis.FakeServer()
+    return {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": f"redis://fakeredis-{id(server)}:6379/1",
+            "KEY_PREFIX": "blog_api_test",
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "CONNECTION_POOL_KWARGS": {
+                    "connection_class": fakeredis.FakeConnection,
+                    "server": server,
+                },
+                "ASYNC_CONNECTION_POOL_KWARGS": {
+                    "connection_class": fakeredis.aioredis.FakeConnection,
+                    "server": server,
+                },
+                **options,
+            },
+        }
+    }
+
+
+class RebuildCounter:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> dict[str, int]:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.delay)
+        return {"rebuild": call}
+
+
+def hammer(key: str, counter: RebuildCounter, workers: int) -> list[Any]:
+    results: list[Any] = []
+    barrier = threading.Barrier(workers)
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(get_or_rebuild(key, counter))
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class GetOrRebuildSingleFlightTests(SimpleTestCase):
+    workers = 16
+    delay = 0.2
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.key = f"singleflight:test:{uuid.uuid4().hex}"
+
+    def test_cold_miss_rebuilds_once(self) -> None:
+        counter = RebuildCounter(self.delay)
+        results = hammer(self.key, counter, self.workers)
+        self.assertEqual(counter.calls, 1)
+        self.assertEqual(results, [{"rebuild": 1}] * self.workers)
+
+    def test_soft_expiry_serves_stale_and_refreshes_once(self) -> None:
+        cache.set(self.key, {"value": {"rebuild": 0}, "fresh_until": 0}, 60)
+        counter = RebuildCounter(self.delay)
+        results = hammer(self.key, counter, self.workers)
+        self.assertEqual(results, [{"rebuild": 0}] * self.workers)
+        deadline = time.monotonic() + self.delay * 10
+        while cache.get(self.key)["value"] != {"rebuild": 1} and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(counter.calls, 1)
+        self.assertEqual(cache.get(self.key)["value"], {"rebuild": 1})
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class PostQueryBudgetTests(TransactionTestCase):
+    # The worst path of each hot action (cold cache, JWT user lookup, tags
+    # added and removed) must fit PostViewSet.query_budgets. A transaction
+    # test case so writes open a real transaction, not a savepoint pair.
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.author = User.objects.create_user("budget@example.com", "budget-password")
+        self.reader = User.objects.create_user("reader@example.com", "budget-password")
+        self.category = Category.objects.create(name="Budget", slug="budget-category")
+        self.tags = Tag.objects.bulk_create(
+            Tag(name=f"budget-tag-{index}", slug=f"budget-tag-{index}") for index in range(6)
+        )
+        self.post = Post.objects.create(
+            author=self.author,
+            category=self.category,
+            title="Budget post",
+            slug="budget-post",
+            body="Lorem ipsum",
+            status=Post.Status.PUBLISHED,
+        )
+        self.post.tags.set(self.tags[:3])
+        self.post.refresh_tag_names()
+        self.client = APIClient()
+
+    def request(self, user: User | None, action: str, method: str, path: str, data: Any = None) -> Any:
+        if user is None:
+            self.client.credentials()
+        else:
+            token = RefreshToken.for_user(user).access_token
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        cache.clear()
+        with assert_max_queries(PostViewSet.query_budgets[action], f"PostViewSet.{action}"):
+            return getattr(self.client, method)(path, data, format="json")
+
+    def test_list(self) -> None:
+        response = self.request(
+            self.reader, "list", "get", "/api/posts/", {"category": "budget-category", "tag": "budget-tag-0"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_retrieve(self) -> None:
+        response = self.request(self.reader, "retrieve", "get", "/api/posts/budget-post/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_create(self) -> None:
+        response = self.request(
+            self.author,
+            "create",
+            "post",
+            "/api/posts/",
+            {
+                "title": "Created",
+                "slug": "created-post",
+                "body": "Lorem ipsum",
+                "status": "published",
+                "category_id": self.category.id,
+                "tag_ids": [tag.id for tag in self.tags],
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_partial_update_slug_category_and_tags(self) -> None:
+        category = Category.objects.create(name="Moved", slug="moved-category")
+        response = self.request(
+            self.author,
+            "partial_update",
+            "patch",
+            "/api/posts/budget-post/",
+            {
+                "slug": "renamed-post",
+                "category_id": category.id,
+                "tag_ids": [tag.id for tag in self.tags[2:]],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            Post.objects.get(id=self.post.id).tag_names, [tag.name for tag in self.tags[2:]]
+        )
+
+    def test_comment_create(self) -> None:
+        response = self.request(
+            self.reader, "comments", "post", "/api/posts/budget-post/comments/", {"body": "Nice"}
+        )
+        self.assertEqual(response.status_code, 201)
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class GetOrRebuildUnavailableCacheTests(SimpleTestCase):
+    # With IGNORE_EXCEPTIONS a dead Redis looks like a miss; the rebuild has
+    # to happen right away instead of waiting for a lock nobody can hold.
+
+    def setUp(self) -> None:
+        self.server = fakeredis.FakeServer()
+        overrides = override_settings(
+            CACHES=fake_redis_caches(self.server, IGNORE_EXCEPTIONS=True)
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.key = f"singleflight:test:{uuid.uuid4().hex}"
+
+    def test_cold_miss_rebuilds_without_waiting(self) -> None:
+        self.server.connected = False
+        counter = RebuildCounter(0)
+        with mock.patch("apps.blog.cache.time", wraps=time) as cache_time:
+            self.assertEqual(get_or_rebuild(self.key, counter), {"rebuild": 1})
+        cache_time.sleep.assert_not_called()
+        self.assertEqual(counter.calls, 1)
+
+    def test_waiter_stops_when_cache_goes_away(self) -> None:
+        cache.add(f"{self.key}:lock", "other-worker", 60)
+        counter = RebuildCounter(0)
+
+        def disconnect(seconds: float) -> None:
+            self.server.connected = False
+
+        with mock.patch("apps.blog.cache.time", wraps=time) as cache_time:
+            cache_time.sleep.side_effect = disconnect
+            self.assertEqual(get_or_rebuild(self.key, counter), {"rebuild": 1})
+        self.assertEqual(cache_time.sleep.call_count, 1)
+
+
+# Plan fragments that mean a hot query fell back to a full table scan or an
+# explicit sort instead of walking an index in order. EXPLAIN output is
+# vendor specific, so other backends skip the plan tests.
+@skipUnless(fakeredis, "fakeredis is not installed")
+class CachedPostLanguageTests(TestCase):
+    # Cached payloads are keyed by the folded language, so a request that
+    # spells it differently must not store another language's category name.
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        author = User.objects.create_user("language@example.com", "language-password")
+        category = Category.objects.create(name="Tech", name_ru="Техника", slug="tech")
+        Post.objects.create(
+            author=author,
+            category=category,
+            title="Language post",
+            slug="language-post",
+            body="Lorem ipsum",
+            status=Post.Status.PUBLISHED,
+        )
+
+    def test_mixed_case_language_then_canonical(self) -> None:
+        for lang in ("RU", "ru"):
+            response = self.client.get("/api/posts/", {"lang": lang})
+            self.assertEqual(response.json()["results"][0]["category"], "Техника", lang)
+            response = self.client.get("/api/posts/language-post/", {"lang": lang})
+            self.assertEqual(response.json()["category"], "Техника", lang)
+
+    async def test_async_reads_mixed_case_language_then_canonical(self) -> None:
+        # The async list only serves pages the sync view has cached.
+        await self.async_client.get("/api/posts/")
+        for lang in ("RU", "ru"):
+            request = AsyncRequestFactory().get("/api/posts/")
+            request.LANGUAGE_CODE = lang
+            response = await async_views.post_list(request)
+            self.assertEqual(
+                json.loads(response.content)["results"][0]["category"], "Техника", lang
+            )
+            request = AsyncRequestFactory().get("/api/posts/language-post/")
+            request.LANGUAGE_CODE = lang
+            response = await async_views.post_detail(request, "language-post")
+            self.assertEqual(json.loads(response.content)["category"], "Техника", lang)
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class PostFragmentCacheTests(TestCase):
+    # List pages are assembled from per-post fragments keyed by post version
+    # and language; only missing fragments are serialized again.
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.author = User.objects.create_user("fragments@example.com", "fragments-password")
+        category = Category.objects.create(name="Tech", name_ru="Техника", slug="fragments-tech")
+        self.posts = [
+            Post.objects.create(
+                author=self.author,
+                category=category,
+                title=f"Fragment post {index}",
+                slug=f"fragment-post-{index}",
+                body="Lorem ipsum",
+                status=Post.Status.PUBLISHED,
+            )
+            for index in range(3)
+        ]
+
+    def list_posts(self, **params: str) -> tuple[dict[int, dict], list[int]]:
+        # The page payload by post id and the ids serialized for it.
+        with mock.patch.object(views, "set_fragments", wraps=set_fragments) as stored:
+            response = self.client.get("/api/posts/", params)
+        self.assertEqual(response.status_code, 200)
+        built = [post_id for call in stored.call_args_list for post_id, _ in call.args[0]]
+        return {item["id"]: item for item in response.json()["results"]}, built
+
+    def test_edit_rebuilds_only_the_edited_post(self) -> None:
+        _, built = self.list_posts()
+        self.assertCountEqual(built, [post.id for post in self.posts])
+        edited = self.posts[0]
+        version = fragment_version(edited)
+        client = APIClient()
+        client.force_authenticate(self.author)
+        response = client.patch(
+            f"/api/posts/{edited.slug}/", {"title": "Edited title"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        edited.refresh_from_db()
+        self.assertNotEqual(fragment_version(edited), version)
+
+        payload, built = self.list_posts()
+        self.assertEqual(built, [edited.id])
+        self.assertEqual(payload[edited.id]["title"], "Edited title")
+        self.assertEqual(payload[self.posts[1].id]["title"], "Fragment post 1")
+
+    def test_each_language_has_its_own_fragments(self) -> None:
+        ids = [post.id for post in self.posts]
+        payload, built = self.list_posts(lang="en")
+        self.assertCountEqual(built, ids)
+        self.assertEqual({item["category"] for item in payload.values()}, {"Tech"})
+
+        payload, built = self.list_posts(lang="ru")
+        self.assertCountEqual(built, ids)
+        self.assertEqual({item["category"] for item in payload.values()}, {"Техника"})
+
+        for lang, category in (("en", "Tech"), ("ru", "Техника")):
+            payload, built = self.list_posts(lang=lang)
+            self.assertEqual(built, [])
+            self.assertEqual({item["category"] for item in payload.values()}, {category})
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class PostETagTests(TestCase):
+    # The list and detail ETags cover the cached payloads and their counters,
+    # so a stored validator stops matching as soon as either changes.
+    paths = ("/api/posts/", "/api/posts/etag-post/")
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.author = User.objects.create_user("etag@example.com", "etag-password")
+        Post.objects.create(
+            author=self.author,
+            title="ETag post",
+            slug="etag-post",
+            body="Lorem ipsum",
+            status=Post.Status.PUBLISHED,
+        )
+        self.writer = APIClient()
+        self.writer.force_authenticate(self.author)
+
+    def etags(self) -> dict[str, str]:
+        etags = {}
+        for path in self.paths:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            etags[path] = response["ETag"]
+        return etags
+
+    def assert_etags_changed(self, before: dict[str, str]) -> None:
+        after = self.etags()
+        for path in self.paths:
+            self.assertNotEqual(after[path], before[path], path)
+            response = self.client.get(path, headers={"If-None-Match": before[path]})
+            self.assertEqual(response.status_code, 200, path)
+
+    def test_if_none_match_returns_not_modified(self) -> None:
+        for path, etag in self.etags().items():
+            response = self.client.get(path, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304, path)
+            self.assertEqual(response["ETag"], etag)
+            self.assertEqual(response.content, b"")
+
+    def test_etag_changes_after_edit(self) -> None:
+        before = self.etags()
+        response = self.writer.patch(
+            "/api/posts/etag-post/", {"body": "Edited body"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assert_etags_changed(before)
+
+    def test_etag_changes_after_comment(self) -> None:
+        before = self.etags()
+        response = self.writer.post(
+            "/api/posts/etag-post/comments/", {"body": "A comment"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assert_etags_changed(before)
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class PostCounterTests(TestCase):
+    # comment_count and tag_names are denormalized onto Post for the read
+    # path; every writer has to keep them equal to the related rows.
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.author = User.objects.create_user("counters@example.com", "counters-password")
+        self.tags = Tag.objects.bulk_create(
+            Tag(name=f"counter-tag-{index}", slug=f"counter-tag-{index}") for index in range(3)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def create_post(self, slug: str, tags: list[Tag]) -> Post:
+        response = self.client.post(
+            "/api/posts/",
+            {
+                "title": slug,
+                "slug": slug,
+                "body": "Lorem ipsum",
+                "tag_ids": [tag.id for tag in tags],
+                "status": Post.Status.PUBLISHED,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return Post.objects.get(slug=slug)
+
+    def assert_counters(self, post: Post) -> None:
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, post.comments.count())
+        self.assertEqual(
+            post.tag_names,
+            list(
+                Post.tags.through.objects.filter(post=post)
+                .order_by("id")
+                .values_list("tag__name", flat=True)
+            ),
+        )
+        response = self.client.get(f"/api/posts/{post.slug}/")
+        self.assertEqual(response.data["comment_count"], post.comment_count)
+        self.assertEqual(response.data["tags"], post.tag_names)
+
+    def test_comment_create_and_delete(self) -> None:
+        post = self.create_post("counter-comments", self.tags[:1])
+        path = f"/api/posts/{post.slug}/comments/"
+        ids = [
+            self.client.post(path, {"body": f"Comment {index}"}, format="json").data["id"]
+            for index in range(3)
+        ]
+        self.assert_counters(post)
+        self.assertEqual(post.comment_count, 3)
+
+        response = self.client.delete(f"{path}{ids[0]}/")
+        self.assertEqual(response.status_code, 204)
+        self.assert_counters(post)
+        self.assertEqual(post.comment_count, 2)
+
+    def test_tag_change(self) -> None:
+        post = self.create_post("counter-tags", self.tags[:2])
+        self.assert_counters(post)
+        self.assertEqual(post.tag_names, ["counter-tag-0", "counter-tag-1"])
+
+        response = self.client.patch(
+            f"/api/posts/{post.slug}/",
+            {"tag_ids": [self.tags[2].id, self.tags[0].id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assert_counters(post)
+        self.assertCountEqual(post.tag_names, ["counter-tag-0", "counter-tag-2"])
+
+        response = self.client.patch(f"/api/posts/{post.slug}/", {"tag_ids": []}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assert_counters(post)
+        self.assertEqual(post.tag_names, [])
+
+    def test_migration_backfill(self) -> None:
+        migration = importlib.import_module(
+            "apps.blog.migrations.0005_post_comment_count_post_tag_names"
+        )
+        tagged = self.create_post("counter-backfill", self.tags)
+        untagged = self.create_post("counter-backfill-empty", [])
+        Comment.objects.bulk_create(
+            Comment(post=tagged, author=self.author, body=f"Comment {index}") for index in range(2)
+        )
+        Post.objects.update(comment_count=0, tag_names=[])
+
+        migration.backfill_counters(apps, None)
+        tagged.refresh_from_db()
+        untagged.refresh_from_db()
+        self.assertEqual(tagged.comment_count, 2)
+        self.assertEqual(tagged.tag_names, [tag.name for tag in self.tags])
+        self.assertEqual((untagged.comment_count, untagged.tag_names), (0, []))
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class PostBulkImportTests(TestCase):
+    # A batch is validated as a whole and created in one transaction, so it
+    # either lands entirely, with one list cache invalidation, or not at all.
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.author = User.objects.create_user("bulk@example.com", "bulk-password")
+        self.category = Category.objects.create(name="Bulk", slug="bulk-category")
+        self.tags = Tag.objects.bulk_create(
+            Tag(name=f"bulk-tag-{index}", slug=f"bulk-tag-{index}") for index in range(3)
+        )
+        Post.objects.create(author=self.author, title="Taken", slug="bulk-taken", body="Lorem")
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def item(self, slug: str, **fields: Any) -> dict[str, Any]:
+        return {"title": slug, "slug": slug, "body": "Lorem ipsum", **fields}
+
+    def bulk_import(self, items: Any) -> tuple[Any, mock.Mock]:
+        with mock.patch.object(
+            views, "bump_list_cache_generation", wraps=bump_list_cache_generation
+        ) as bumped:
+            response = self.client.post("/api/posts/bulk/", items, format="json")
+        return response, bumped
+
+    def test_creates_posts_with_tags_and_invalidates_once(self) -> None:
+        first, second, third = self.tags
+        response, bumped = self.bulk_import(
+            [
+                self.item(
+                    "bulk-one",
+                    category_id=self.category.id,
+                    tag_ids=[third.id, first.id, third.id],
+                    status=Post.Status.PUBLISHED,
+                ),
+                self.item("bulk-two", tag_ids=[second.id]),
+                self.item("bulk-three"),
+            ]
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(bumped.call_count, 1)
+
+        posts = {post.slug: post for post in Post.objects.filter(slug__startswith="bulk-")}
+        self.assertEqual(
+            [item["id"] for item in response.data["posts"]],
+            [posts[slug].id for slug in ("bulk-one", "bulk-two", "bulk-three")],
+        )
+        for slug, tags in (
+            ("bulk-one", [third, first]),
+            ("bulk-two", [second]),
+            ("bulk-three", []),
+        ):
+            rows = Post.tags.through.objects.filter(post=posts[slug]).order_by("id")
+            self.assertEqual([row.tag_id for row in rows], [tag.id for tag in tags], slug)
+            self.assertEqual(posts[slug].tag_names, [tag.name for tag in tags], slug)
+        self.assertEqual(posts["bulk-one"].status, Post.Status.PUBLISHED)
+        self.assertEqual(posts["bulk-two"].status, Post.Status.DRAFT)
+
+    def test_reports_errors_per_item(self) -> None:
+        response, bumped = self.bulk_import(
+            [
+                self.item("bulk-valid"),
+                self.item("bulk-empty-title", title=" "),
+                self.item("bulk-category", category_id=999_999),
+                self.item("bulk-tags", tag_ids=[self.tags[0].id, 999_999]),
+                self.item("bulk-taken"),
+                self.item("bulk-valid"),
+                "not an object",
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = {error["index"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {1, 2, 3, 4, 5, 6})
+        self.assertIn("title", errors[1])
+        self.assertIn("category_id", errors[2])
+        self.assertEqual(len(errors[3]["tag_ids"]), 1)
+        self.assertIn("999999", str(errors[3]["tag_ids"][0]))
+        self.assertIn("slug", errors[4])
+        self.assertIn("slug", errors[5])
+        self.assertIn("non_field_errors", errors[6])
+        self.assertFalse(Post.objects.filter(slug="bulk-valid").exists())
+        bumped.assert_not_called()
+
+    def test_slug_taken_after_validation_returns_conflict(self) -> None:
+        def validate_then_race(items: list[Any]) -> tuple[list[dict], list[dict]]:
+            result = validate_import_items(items)
+            Post.objects.create(author=self.author, title="Race", slug="bulk-race", body="Lorem")
+            return result
+
+        with mock.patch.object(views, "validate_import_items", validate_then_race):
+            response, bumped = self.bulk_import(
+                [self.item("bulk-first", tag_ids=[self.tags[0].id]), self.item("bulk-race")]
+            )
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Post.objects.filter(slug="bulk-first").exists())
+        self.assertFalse(Post.tags.through.objects.exists())
+        bumped.assert_not_called()
+
+
+class PostReadFastDataTests(TestCase):
+    # fast_data() skips the serializer fields, so it has to be checked
+    # against them for every shape a post and a request can take.
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(
+            "fast@example.com", "fast-password", timezone="Asia/Almaty"
+        )
+        category = Category.objects.create(
+            name="Tech", name_ru="Техника", name_kk="Техника KK", slug="fast-tech"
+        )
+        tags = Tag.objects.bulk_create(
+            Tag(name=f"fast-tag-{index}", slug=f"fast-tag-{index}") for index in range(3)
+        )
+        for slug, post_category, post_tags in (
+            ("fast-tagged", category, tags),
+            ("fast-uncategorized", None, tags[:1]),
+            ("fast-plain", category, []),
+        ):
+            post = Post.objects.create(
+                author=cls.author,
+                category=post_category,
+                title=slug,
+                slug=slug,
+                body="Lorem ipsum",
+                status=Post.Status.PUBLISHED,
+            )
+            post.tags.set(post_tags)
+            post.refresh_tag_names()
+
+    def test_matches_serializer_data(self) -> None:
+        queryset = Post.objects.select_related("author", "category").order_by("id")
+        for user in (AnonymousUser(), self.author):
+            for lang in ("en", "ru", "kk"):
+                for canonical_dates in (False, True):
+                    request = RequestFactory().get("/api/posts/")
+                    request.user = user
+                    request.LANGUAGE_CODE = lang
+                    context = {"request": request, "canonical_dates": canonical_dates}
+                    with self.subTest(user=user, lang=lang, canonical_dates=canonical_dates):
+                        self.assertEqual(
+                            PostReadSerializer.fast_data(queryset, context),
+                            PostReadSerializer(queryset, many=True, context=context).data,
+                        )
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class StatsCounterTests(TestCase):
+    # /api/stats/ reads counters that writes move after commit; a missing
+    # counter makes the read rebuild all of them from the database.
+
+    def setUp(self) -> None:
+        overrides = override_settings(CACHES=fake_redis_caches())
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.author = User.objects.create_user("stats@example.com", "stats-password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def write(self, method: str, path: str, data: Any = None, status: int = 201) -> Any:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method)(path, data, format="json")
+        self.assertEqual(response.status_code, status, response.content)
+        return response.data
+
+    def assert_stats_match_db(self, reconciled: bool = False) -> None:
+        with mock.patch.object(stats_view, "reconcile_stats", wraps=reconcile_stats) as reconcile:
+            response = self.client.get("/api/stats/")
+        self.assertEqual(response.json(), count_stats_from_db())
+        self.assertEqual(reconcile.called, reconciled)
+
+    def test_counters_follow_writes(self) -> None:
+        self.assert_stats_match_db(reconciled=True)
+        post = {"title": "Stats", "body": "Lorem ipsum", "status": Post.Status.PUBLISHED}
+        self.write("post", "/api/posts/", {**post, "slug": "stats-published"})
+        self.write("post", "/api/posts/", {**post, "slug": "stats-draft", "status": "draft"})
+        self.assert_stats_match_db()
+
+        self.write("patch", "/api/posts/stats-draft/", {"status": Post.Status.PUBLISHED}, 200)
+        comment_ids = [
+            self.write("post", "/api/posts/stats-published/comments/", {"body": "Stats"})["id"]
+            for _ in range(3)
+        ]
+        self.assert_stats_match_db()
+
+        self.write("delete", f"/api/posts/stats-published/comments/{comment_ids[0]}/", status=204)
+        self.assert_stats_match_db()
+
+        self.write("delete", "/api/posts/stats-published/", status=204)
+        self.assert_stats_match_db()
+        self.assertEqual(count_stats_from_db()["comments"], 0)
+
+        self.client.force_authenticate(None)
+        self.write(
+            "post",
+            "/api/auth/register/",
+            {
+                "email": "stats-new@example.com",
+                "first_name": "Stats",
+                "last_name": "Reader",
+                "password": "Stats-password-42",
+                "password2": "Stats-password-42",
+            },
+        )
+        self.assert_stats_match_db()
+
+    def test_missing_counter_reconciles_on_read(self) -> None:
+        self.assert_stats_match_db(reconciled=True)
+        cache.delete(STATS_COMMENTS_KEY)
+        Post.objects.create(author=self.author, title="Stats", slug="stats-post", body="Lorem")
+        self.write("post", "/api/posts/stats-post/comments/", {"body": "Stats"})
+        self.assertIsNone(cache.get(STATS_COMMENTS_KEY))
+
+        self.assert_stats_match_db(reconciled=True)
+        self.assertEqual(cache.get(STATS_COMMENTS_KEY), 1)
+        self.assert_stats_match_db()
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class StreamConsumerTests(SimpleTestCase):
+    # The listen_comments stream consumer against a fake Redis, with the
+    # webhook replaced by a mock whose result decides the ack.
+    group = "listen_comments_test"
+
+    def setUp(self) -> None:
+        self.redis = fakeredis.aioredis.FakeRedis(
+            server=fakeredis.FakeServer(), decode_responses=True
+        )
+        self.webhook = mock.AsyncMock(return_value=True)
+        patcher = mock.patch.object(listen_comments, "notify", self.webhook)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def consumer(self, name: str, **options: int) -> listen_comments.StreamConsumer:
+        return listen_comments.StreamConsumer(
+            self.redis,
+            None,
+            io.StringIO(),
+            group=self.group,
+            consumer=name,
+            **{"batch": 10, "block_ms": 0, "claim_idle_ms": 0, "max_deliveries": 3, **options},
+        )
+
+    async def publish(self, *events: dict) -> list[str]:
+        return [
+            await self.redis.xadd(CHANNEL_NAME, {STREAM_DATA_FIELD: json.dumps(event)})
+            for event in events
+        ]
+
+    async def reclaim(self, consumer: listen_comments.StreamConsumer) -> None:
+        # Even with claim_idle_ms=0 an entry has to be idle for a moment.
+        await asyncio.sleep(0.005)
+        await consumer.reclaim()
+
+    async def pending(self) -> dict[str, tuple[str, int]]:
+        entries = await self.redis.xpending_range(CHANNEL_NAME, self.group, "-", "+", 100)
+        return {
+            entry["message_id"]: (entry["consumer"], entry["times_delivered"])
+            for entry in entries
+        }
+
+    async def test_acks_only_after_webhook_success(self) -> None:
+        consumer = self.consumer("worker")
+        await consumer.ensure_group()
+        _, failed = await self.publish({"id": 1}, {"id": 2})
+        self.webhook.side_effect = lambda client, payload: payload["id"] == 1
+
+        await consumer.process(await consumer.read(">"))
+        self.assertEqual(self.webhook.await_count, 2)
+        self.assertEqual(await self.pending(), {failed: ("worker", 1)})
+
+        self.webhook.side_effect = None
+        await self.reclaim(consumer)
+        self.assertEqual(await self.pending(), {})
+        self.assertEqual(
+            [call.args[1] for call in self.webhook.await_args_list], [{"id": 1}, {"id": 2}, {"id": 2}]
+        )
+
+    async def test_claims_entries_of_a_dead_consumer(self) -> None:
+        dead, alive = self.consumer("dead"), self.consumer("alive")
+        await dead.ensure_group()
+        entry_ids = await self.publish({"id": 1}, {"id": 2})
+        # Read but never processed: the consumer died mid-batch.
+        self.assertEqual(len(await dead.read(">")), 2)
+        self.assertEqual({owner for owner, _ in (await self.pending()).values()}, {"dead"})
+
+        await self.reclaim(alive)
+        self.assertEqual(self.webhook.await_count, len(entry_ids))
+        self.assertEqual(await self.pending(), {})
+
+        await alive.prune_consumers()
+        consumers = await self.redis.xinfo_consumers(CHANNEL_NAME, self.group)
+        self.assertEqual([info["name"] for info in consumers], ["alive"])
+
+    async def test_prune_keeps_consumers_with_pending_entries(self) -> None:
+        busy = self.consumer("busy")
+        await busy.ensure_group()
+        await self.publish({"id": 1})
+        await busy.read(">")
+
+        await self.consumer("other", claim_idle_ms=60_000).prune_consumers()
+        consumers = await self.redis.xinfo_consumers(CHANNEL_NAME, self.group)
+        self.assertEqual([info["name"] for info in consumers], ["busy"])
+
+    async def test_dead_letters_after_max_deliveries(self) -> None:
+        consumer = self.consumer("worker", max_deliveries=2)
+        await consumer.ensure_group()
+        (entry_id,) = await self.publish({"id": 1})
+        self.webhook.return_value = False
+
+        await consumer.process(await consumer.read(">"))
+        await self.reclaim(consumer)
+        self.assertEqual(await self.pending(), {entry_id: ("worker", 2)})
+
+        await self.reclaim(consumer)
+        self.assertEqual(self.webhook.await_count, 2)
+        self.assertEqual(await self.pending(), {})
+        ((_, fields),) = await self.redis.xrange(STREAM_DEAD_LETTER_NAME)
+        self.assertEqual(fields["id"], entry_id)
+        self.assertEqual(fields["deliveries"], "2")
+        self.assertEqual(json.loads(fields[STREAM_DATA_FIELD]), {"id": 1})
+
+    async def test_acks_trimmed_entries(self) -> None:
+        # XREADGROUP "0" and XCLAIM return a pending entry that MAXLEN trimmed
+        # away with its fields set to None.
+        consumer = self.consumer("worker")
+        await consumer.ensure_group()
+        trimmed, kept = await self.publish({"id": 1}, {"id": 2})
+        await consumer.read(">")
+        self.webhook.return_value = False
+
+        await consumer.process([(trimmed, None), (kept, {STREAM_DATA_FIELD: '{"id": 2}'})])
+        self.assertEqual(self.webhook.await_count, 1)
+        self.assertEqual(await self.pending(), {kept: ("worker", 1)})
+
+
+FORBIDDEN_PLAN_PATTERNS = {
+    "sqlite": [r"\bSCAN (blog_post|blog_comment)\b(?! USING)", r"USE TEMP B-TREE"],
+    "postgresql": [r"Seq Scan on (blog_post|blog_comment)\b", r"(^|->)\s*(Incremental )?Sort\b"],
+}
+
+
+def viewset_queryset(action: str, user: Any, **params: str) -> QuerySet[Post]:
+    request = SimpleNamespace(user=user, query_params=params)
+    view = PostViewSet(action=action, request=request, format_kwarg=None)
+    return view.filter_queryset(view.get_queryset())
+
+
+@skipUnless(connection.vendor in FORBIDDEN_PLAN_PATTERNS, "no plan assertions for this database")
+class HotQueryPlanTests(TestCase):
+    # Large enough that PostgreSQL prefers the indexes over sequential scans.
+    posts = 20_000
+    draft_every = 10
+    comment_posts = 500
+    comments_per_post = 20
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user("plans@example.com", "plans-password")
+        category = Category.objects.create(name="Plans", slug="plans-category")
+        tags = Tag.objects.bulk_create(
+            Tag(name=f"plans-tag-{index}", slug=f"plans-tag-{index}") for index in range(3)
+        )
+        posts = Post.objects.bulk_create(
+            (
+                Post(
+                    author=cls.author,
+                    category=category,
+                    title=f"Plans post {index}",
+                    slug=f"plans-post-{index}",
+                    body="Lorem ipsum " * 20,
+                    status=Post.Status.DRAFT
+                    if index % cls.draft_every == 0
+                    else Post.Status.PUBLISHED,
+                    tag_names=[tag.name for tag in tags],
+                )
+                for index in range(cls.posts)
+            ),
+            batch_size=1000,
+        )
+        Post.tags.through.objects.bulk_create(
+            (Post.tags.through(post_id=post.id, tag_id=tag.id) for post in posts for tag in tags),
+            batch_size=5000,
+        )
+        Comment.objects.bulk_create(
+            (
+                Comment(post=post, author=cls.author, body=f"Plans comment {index}")
+                for post in posts[: cls.comment_posts]
+                for index in range(cls.comments_per_post)
+            ),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def hot_queries(self) -> list[tuple[str, Callable[[], QuerySet], str | None]]:
+        anonymous = AnonymousUser()
+        newest = Post.objects.filter(status=Post.Status.PUBLISHED).latest("created_at", "id")
+        commented = Comment.objects.order_by("id").values_list("post", flat=True).first()
+        draft = Post.objects.filter(status=Post.Status.DRAFT).first()
+
+        def list_page() -> QuerySet:
+            return (
+                viewset_queryset("list", anonymous)
+                .select_related(None)
+                .only("id", "created_at", "updated_at")[200:220]
+            )
+
+        def list_cursor() -> QuerySet:
+            return (
+                viewset_queryset("list", anonymous)
+                .filter(
+                    Q(created_at__lt=newest.created_at)
+                    | Q(created_at=newest.created_at, id__lt=newest.id)
+                )
+                .select_related(None)
+                .only("id", "created_at", "updated_at")[:21]
+            )
+
+        def list_filtered(**params: str) -> Callable[[], QuerySet]:
+            return lambda: (
+                viewset_queryset("list", anonymous, **params)
+                .select_related(None)
+                .only("id", "created_at", "updated_at")[:20]
+            )
+
+        def retrieve_visible() -> QuerySet:
+            return viewset_queryset("retrieve", self.author).filter(slug=draft.slug)
+
+        def comments_page() -> QuerySet:
+            return (
+                Post(id=commented)
+                .comments.select_related("author")
+                .order_by("-created_at", "-id")[:20]
+            )
+
+        return [
+            ("post list page", list_page, "post_published_created_idx"),
+            ("post list cursor", list_cursor, "post_published_created_idx"),
+            (
+                "post list by category",
+                list_filtered(category="plans-category"),
+                "post_pub_category_created_idx",
+            ),
+            (
+                "post list by author",
+                list_filtered(author=self.author.email),
+                "post_pub_author_created_idx",
+            ),
+            ("post list by tag", list_filtered(tag="plans-tag-0"), "post_published_created_idx"),
+            ("post retrieve visibility", retrieve_visible, None),
+            ("comment list", comments_page, "comment_post_created_idx"),
+        ]
+
+    def test_hot_queries_walk_indexes(self) -> None:
+        for name, build, expected_index in self.hot_queries():
+            with self.subTest(name):
+                plan = build().explain()
+                for pattern in FORBIDDEN_PLAN_PATTERNS[connection.vendor]:
+                    self.assertIsNone(re.search(pattern, plan, re.MULTILINE), plan)
+                if expected_index is not None:
+                    self.assertIn(expected_index, plan)
@@ -1,12 +1,19 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from apps.blog.async_views import with_async_reads
 from apps.blog.stats_view import stats_view
 from apps.blog.views import PostViewSet
 
 router = DefaultRouter()
 router.register(r"posts", PostViewSet, basename="post")
 
-urlpatterns = router.urls + [
+post_urls = router.urls
+if settings.ASYNC_READ_VIEWS_ENABLED:
+    post_urls = with_async_reads(post_urls)
+
+urlpatterns = [
+    *post_urls,
     path("stats/", stats_view, name="stats"),
 ]
@@ -1,36 +1,86 @@
 import logging
-from typing import Any
+from typing import Any, ClassVar
 
-from django.core.cache import cache
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.db.models import Q, QuerySet
-from rest_framework import status, viewsets
+from rest_framework import serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.request import Request
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse, extend_schema_view
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema_view, inline_serializer
 
-from apps.blog.models import Comment, Post
+from apps.blog.cache import (
+    bump_list_cache_generation,
+    cache_language,
+    comments_token_datetime,
+    delete_post_detail,
+    delete_post_fragments,
+    fragment_version,
+    get_comments_token,
+    get_fragments,
+    get_list_cache_modified,
+    get_or_rebuild,
+    get_post_detail,
+    list_modified_datetime,
+    list_page_cache_key,
+    list_page_stale_key,
+    payload_counters,
+    set_fragments,
+    set_post_detail,
+    touch_comments_token,
+)
+from apps.blog.facets import facet_state, get_facet_counts, record_facet_change
+from apps.core.stats import STATS_COMMENTS_KEY, STATS_POSTS_KEY, record_stat_change
+from apps.blog.filters import PostFeedFilter
+from apps.blog.exporting import (
+    accepts_gzip,
+    aiter_chunks,
+    iter_export_records,
+    iter_gzip,
+    iter_ndjson,
+    parse_since,
+)
+from apps.blog.importing import bulk_import_posts, validate_import_items
+from apps.blog.formatting import localize_post_dates, resolve_date_locale
+from apps.blog.models import Category, Comment, Post, Tag
+from apps.blog.pagination import (
+    CachedPageNumberPagination,
+    KeysetPagination,
+    SearchKeysetPagination,
+)
 from apps.blog.permissions import IsPostPublishedOrOwner
 from apps.blog.redis_events import publish_comment_created
+from apps.blog.search import search_posts
 from apps.blog.serializers import (
     CommentReadSerializer,
     CommentWriteSerializer,
+    PostImportItemSerializer,
     PostReadSerializer,
     PostWriteSerializer,
+    localized_category_name,
 )
+from apps.core.conditional import conditional_response, make_etag, set_validators
+from apps.core.parsers import NDJSONParser
+from apps.core.renderers import NDJSONRenderer
 from apps.core.ratelimit import ratelimit_or_429, user_or_ip
+from apps.core.timing import timed
 
 logger = logging.getLogger("blog")
-LIST_CACHE_KEY_PREFIX = "post:list:published"
-LIST_CACHE_TTL_SECONDS = 60
 
 @extend_schema_view(
     retrieve=extend_schema(
         tags=["Posts"],
         summary="Get post details",
-        description="Returns a single post by slug. Authenticated users can also see their own draft posts. Dates formatted by user locale and timezone.",
+        description="Returns a single post by slug. Authenticated users can also see their own draft posts. Dates formatted by user locale and timezone. Published posts are cached in Redis per slug and language; the cache entry is evicted when the post is updated or deleted.",
         responses={
             200: PostReadSerializer,
             404: OpenApiResponse(description="Post not found"),
@@ -56,16 +106,36 @@ LIST_CACHE_TTL_SECONDS = 60
 )
 class PostViewSet(viewsets.ModelViewSet):
     lookup_field = "slug"
-    queryset = Post.objects.select_related("author", "category").prefetch_related(
-        "tags"
-    )
+    queryset = Post.objects.select_related("author", "category")
     permission_classes = [IsAuthenticatedOrReadOnly, IsPostPublishedOrOwner]
+    pagination_class = CachedPageNumberPagination
+    filter_backends = (PostFeedFilter,)
+    # Worst-case queries per request (cache misses, JWT user lookup
+    # included), checked by QueryBudgetMiddleware. Measured on SQLite, whose
+    # explicit BEGIN makes writes cost one query more than on PostgreSQL.
+    # None of them may grow with page size or the number of tags.
+    query_budgets: ClassVar[dict[str, int]] = {
+        "list": 4,
+        "retrieve": 2,
+        "search": 3,
+        "facets": 5,
+        "create": 11,
+        "bulk_import": 7,
+        "export": 3,
+        "update": 13,
+        "partial_update": 13,
+        "destroy": 6,
+        "comments": 5,
+        "comment_detail": 6,
+    }
 
     def get_queryset(self) -> QuerySet[Post]:
         base_queryset = super().get_queryset()
         user = self.request.user
         if self.action == "list":
-            return base_queryset.filter(status=Post.Status.PUBLISHED)
+            return base_queryset.filter(status=Post.Status.PUBLISHED).order_by(
+                "-created_at", "-id"
+            )
         if self.action == "retrieve":
             if user.is_authenticated:
                 return base_queryset.filter(
@@ -74,15 +144,39 @@ class PostViewSet(viewsets.ModelViewSet):
             return base_queryset.filter(status=Post.Status.PUBLISHED)
         return base_queryset
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and KeysetPagination.is_requested(
+            getattr(self, "request", None)
+        ):
+            self._paginator = KeysetPagination()
+        return super().paginator
+
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return PostReadSerializer
         return PostWriteSerializer
 
+    def _assemble_post_fragments(
+        self, request: Request, entries: list[tuple[int, str]], lang: str
+    ) -> list[dict]:
+        fragments = get_fragments(entries, lang)
+        versions = {
+            post_id: version for post_id, version in entries if post_id not in fragments
+        }
+        if versions:
+            built = PostReadSerializer.fast_data(
+                self.get_queryset().filter(id__in=list(versions)),
+                context={"request": request, "lang": lang, "canonical_dates": True},
+            )
+            set_fragments({(item["id"], versions[item["id"]]): item for item in built}, lang)
+            fragments.update({item["id"]: item for item in built})
+        return [fragments[post_id] for post_id, _ in entries if post_id in fragments]
+
     @extend_schema(
         tags=["Posts"],
         summary="List published posts",
-        description="Returns paginated list of published posts. Dates are formatted by user locale and timezone. Response is cached in Redis per language. Anonymous users see UTC dates. Cache is invalidated when any post is created, updated or deleted.",
+        description="Returns paginated list of published posts, newest first. Pass pagination=cursor to use keyset pagination with opaque next/previous cursors instead of page numbers; it skips COUNT(*) and costs the same on every page. Dates are formatted by user locale and timezone. The ordered post ids of each page are cached in Redis and each post is cached separately per language with raw UTC timestamps, so only missing posts are serialized again. Dates are formatted for the caller after the cache read, so one cached page serves every timezone. Anonymous users see UTC dates. Page id lists are invalidated when any post is created, updated or deleted; an edited post only drops its own cached representation.",
         responses={
             200: PostReadSerializer,
         },
@@ -105,6 +199,7 @@ class PostViewSet(viewsets.ModelViewSet):
                             "status": "published",
                             "created_at": "March 10, 2026, 2:30:00 PM UTC",
                             "updated_at": "March 10, 2026, 2:30:00 PM UTC",
+                            "comment_count": 3,
                         }
                     ],
                 },
@@ -114,30 +209,198 @@ class PostViewSet(viewsets.ModelViewSet):
         ],
     )
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        page_number = request.query_params.get("page", "1")
-        lang = getattr(request, "LANGUAGE_CODE", "en")
-        cache_key = f"{LIST_CACHE_KEY_PREFIX}:lang:{lang}:page:{page_number}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            logger.debug("Post list cache hit page=%s", page_number)
-            return Response(cached)
-
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = PostReadSerializer(page, many=True, context={"request": request})
-            data = serializer.data
-            cache.set(cache_key, data, LIST_CACHE_TTL_SECONDS)
-            return self.get_paginated_response(data)
-
-        serializer = PostReadSerializer(queryset, many=True, context={"request": request})
-        data = serializer.data
-        cache.set(cache_key, data, LIST_CACHE_TTL_SECONDS)
-        return Response(data)
+        position = ":".join(
+            (
+                self.paginator.get_cache_position(request),
+                PostFeedFilter().get_cache_fragment(request),
+            )
+        )
+        lang = cache_language(getattr(request, "LANGUAGE_CODE", None))
+
+        def rebuild_page() -> dict[str, Any]:
+            logger.debug("Post list cache rebuild position=%s", position)
+            paginator = type(self.paginator)()
+            queryset = (
+                self.filter_queryset(self.get_queryset())
+                .select_related(None)
+                .prefetch_related(None)
+                .only("id", "created_at", "updated_at")
+            )
+            posts = paginator.paginate_queryset(queryset, request, view=self)
+            return {
+                "ids": [(post.id, fragment_version(post)) for post in posts],
+                "page": paginator.get_page_state(),
+                "modified": get_list_cache_modified(),
+            }
+
+        entry = get_or_rebuild(
+            list_page_cache_key(position),
+            rebuild_page,
+            stale_key=list_page_stale_key(position),
+        )
+        with timed("serialize"):
+            fragments = self._assemble_post_fragments(request, entry["ids"], lang)
+        etag = make_etag(
+            request.get_full_path(),
+            lang,
+            *resolve_date_locale(request),
+            entry["ids"],
+            entry["page"],
+            [payload_counters(item) for item in fragments],
+        )
+        last_modified = list_modified_datetime(entry)
+        # Last-Modified is informational; a page only counts as unchanged
+        # when its ETag matches.
+        not_modified = conditional_response(request, etag, None)
+        if not_modified is not None:
+            return not_modified
+
+        with timed("serialize"):
+            data = localize_post_dates(fragments, request)
+        response = self.paginator.get_cached_paginated_response(request, entry["page"], data)
+        return set_validators(response, etag, last_modified)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        slug = kwargs[self.lookup_field]
+        lang = cache_language(getattr(request, "LANGUAGE_CODE", None))
+        entry = get_post_detail(slug, lang)
+        if entry is None:
+            instance = self.get_object()
+            with timed("serialize"):
+                serializer = PostReadSerializer(
+                    instance,
+                    context={"request": request, "lang": lang, "canonical_dates": True},
+                )
+                entry = {"version": fragment_version(instance), "data": serializer.data}
+            # Drafts are only visible to their author and never cached.
+            if instance.status == Post.Status.PUBLISHED:
+                set_post_detail(slug, lang, entry)
+
+        # No Last-Modified: updated_at misses comment count changes, and the
+        # ETag already covers everything the body is built from.
+        etag = make_etag(
+            slug,
+            entry["version"],
+            payload_counters(entry["data"]),
+            lang,
+            *resolve_date_locale(request),
+        )
+        not_modified = conditional_response(request, etag, None)
+        if not_modified is not None:
+            return not_modified
+
+        with timed("serialize"):
+            data = localize_post_dates([entry["data"]], request)[0]
+        return set_validators(Response(data), etag, None)
+
+    @extend_schema(
+        tags=["Posts"],
+        summary="Search published posts",
+        description="Full-text search over post titles and bodies, best match first. Titles weigh more than bodies. The query is stemmed with the config for the request language (english for en, russian for ru, simple for kk) on PostgreSQL and matched token by token with SQLite FTS5 locally; other databases fall back to unranked case-insensitive matching of every token, newest first. Results are paginated with an opaque next cursor and use the same cached post representation as the list endpoint.",
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Search query"),
+            OpenApiParameter("cursor", str, description="Cursor from the previous page's next link"),
+        ],
+        responses={
+            200: inline_serializer(
+                "PostSearchPage",
+                {
+                    "next": serializers.URLField(allow_null=True),
+                    "results": PostReadSerializer(many=True),
+                },
+            ),
+            400: OpenApiResponse(description="Missing search query"),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="search",
+        pagination_class=SearchKeysetPagination,
+        filter_backends=[],
+    )
+    def search(self, request: Request) -> Response:
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This query parameter is required."]})
+        lang = cache_language(getattr(request, "LANGUAGE_CODE", None))
+        paginator = SearchKeysetPagination()
+        posts = paginator.paginate_search(
+            request, lambda after, limit: search_posts(query, lang, after, limit)
+        )
+        with timed("serialize"):
+            data = localize_post_dates(
+                self._assemble_post_fragments(
+                    request, [(post.id, fragment_version(post)) for post in posts], lang
+                ),
+                request,
+            )
+        return paginator.get_paginated_response(data)
+
+    @extend_schema(
+        tags=["Posts"],
+        summary="Post counts per category and tag",
+        description="Returns how many published posts each category and tag has, largest first, with slugs usable as the category and tag filters of the post list. Counts are kept in Redis and adjusted on every post create, update and delete instead of being aggregated per request; they are recomputed from the database once a day or when Redis loses them. Category names are localized to the request language.",
+        responses={
+            200: inline_serializer(
+                "PostFacets",
+                {
+                    "categories": inline_serializer(
+                        "PostCategoryFacet",
+                        {
+                            "slug": serializers.CharField(),
+                            "name": serializers.CharField(),
+                            "count": serializers.IntegerField(),
+                        },
+                        many=True,
+                    ),
+                    "tags": inline_serializer(
+                        "PostTagFacet",
+                        {
+                            "slug": serializers.CharField(),
+                            "name": serializers.CharField(),
+                            "count": serializers.IntegerField(),
+                        },
+                        many=True,
+                    ),
+                },
+            ),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="facets",
+        pagination_class=None,
+        filter_backends=[],
+    )
+    def facets(self, request: Request) -> Response:
+        category_counts, tag_counts = get_facet_counts()
+        lang = cache_language(getattr(request, "LANGUAGE_CODE", None))
+        categories = [
+            {
+                "slug": category.slug,
+                "name": localized_category_name(
+                    category.name, category.name_ru, category.name_kk, lang
+                ),
+                "count": category_counts[category.id],
+            }
+            for category in Category.objects.filter(id__in=list(category_counts))
+        ]
+        tags = [
+            {"slug": tag.slug, "name": tag.name, "count": tag_counts[tag.name]}
+            for tag in Tag.objects.filter(name__in=list(tag_counts))
+        ]
+        return Response(
+            {
+                "categories": sorted(categories, key=lambda item: (-item["count"], item["slug"])),
+                "tags": sorted(tags, key=lambda item: (-item["count"], item["slug"])),
+            }
+        )
 
     def _invalidate_posts_cache(self) -> None:
         try:
-            cache.delete_pattern(f"{LIST_CACHE_KEY_PREFIX}:*")
+            bump_list_cache_generation()
         except Exception:
             logger.exception("Post list cache invalidation failed")
 
@@ -167,8 +430,180 @@ class PostViewSet(viewsets.ModelViewSet):
         return response
 
 
+    @extend_schema(
+        tags=["Posts"],
+        summary="Bulk import posts",
+        description="Creates many posts for the authenticated user in one request. The body is a JSON array of post objects or NDJSON (application/x-ndjson, one object per line) with the same fields as post create. Category ids, tag ids and slugs are checked with one query each for the whole batch. Nothing is inserted when any item is invalid; the 400 response lists the errors per item index. Valid batches are inserted in one transaction and the posts list cache is invalidated once. Rate limited to 5 requests per minute.",
+        request=PostImportItemSerializer(many=True),
+        responses={
+            201: inline_serializer(
+                "PostBulkImportResult",
+                {
+                    "created": serializers.IntegerField(),
+                    "posts": inline_serializer(
+                        "PostBulkImportCreated",
+                        {"id": serializers.IntegerField(), "slug": serializers.SlugField()},
+                        many=True,
+                    ),
+                },
+            ),
+            400: OpenApiResponse(description="Malformed body or per-item validation errors"),
+            401: OpenApiResponse(description="Authentication required"),
+            429: OpenApiResponse(description="Rate limit exceeded"),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        permission_classes=[IsAuthenticated],
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    @ratelimit_or_429(
+        key=user_or_ip, rate="5/m", method=("POST",), group="post_bulk_import"
+    )
+    def bulk_import(self, request: Request) -> Response:
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of posts."]})
+        if not items or len(items) > settings.BULK_IMPORT_MAX_ITEMS:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Expected between 1 and {settings.BULK_IMPORT_MAX_ITEMS} posts."
+                    ]
+                }
+            )
+        logger.info(
+            "Post bulk import attempt user_id=%s items=%s", request.user.id, len(items)
+        )
+        accepted, errors = validate_import_items(items)
+        if errors:
+            logger.warning(
+                "Post bulk import rejected user_id=%s invalid=%s",
+                request.user.id,
+                len(errors),
+            )
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            posts = bulk_import_posts(request.user, accepted)
+        except IntegrityError:
+            # A slug taken by a concurrent request after validation.
+            logger.warning("Post bulk import conflict user_id=%s", request.user.id)
+            return Response(
+                {"detail": "A post slug was taken while importing; retry the batch."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        self._invalidate_posts_cache()
+        logger.info(
+            "Post bulk import success user_id=%s created=%s", request.user.id, len(posts)
+        )
+        return Response(
+            {
+                "created": len(posts),
+                "posts": [{"id": post.id, "slug": post.slug} for post in posts],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        tags=["Posts"],
+        summary="Export published posts and comments",
+        description="Streams every published post, then their comments, as NDJSON (one JSON object per line with a \"type\" of post or comment), read from the database in chunks without touching the posts cache. The last line is an export trailer with the counts and started_at; pass that value as ?since= next time to export only posts updated or recounted (comment_count changes, tracked by counters_updated_at) and comments created since then. Deletions are not included. Gzipped on the fly when the client's Accept-Encoding accepts gzip (gzip;q=0 does not). Admin only.",
+        parameters=[
+            OpenApiParameter("since", str, description="ISO 8601 datetime; only changes at or after it"),
+            OpenApiParameter("comments", bool, description="Include comments (default true)"),
+        ],
+        responses={
+            (200, "application/x-ndjson"): OpenApiResponse(description="NDJSON stream"),
+            400: OpenApiResponse(description="Invalid since"),
+            403: OpenApiResponse(description="Admin only"),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[IsAdminUser],
+        renderer_classes=[JSONRenderer, NDJSONRenderer],
+        pagination_class=None,
+        filter_backends=[],
+    )
+    def export(self, request: Request) -> StreamingHttpResponse:
+        try:
+            since = parse_since(request.query_params.get("since"))
+        except ValueError:
+            raise ValidationError({"since": ["Expected an ISO 8601 datetime."]}) from None
+        include_comments = request.query_params.get("comments", "true").lower() not in (
+            "0",
+            "false",
+            "no",
+        )
+        logger.info(
+            "Post export start user_id=%s since=%s comments=%s",
+            request.user.id,
+            since,
+            include_comments,
+        )
+        chunks = iter_ndjson(iter_export_records(since, include_comments))
+        gzipped = accepts_gzip(request.headers.get("Accept-Encoding", ""))
+        if gzipped:
+            chunks = iter_gzip(chunks)
+        if isinstance(request._request, ASGIRequest):
+            chunks = aiter_chunks(chunks)
+        response = StreamingHttpResponse(
+            chunks,
+            content_type="application/x-ndjson; charset=utf-8",
+        )
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        patch_cache_control(response, no_store=True)
+        return response
+
     def perform_create(self, serializer: PostWriteSerializer) -> None:
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        record_facet_change(None, facet_state(post))
+        record_stat_change(STATS_POSTS_KEY, post.status == Post.Status.PUBLISHED)
+
+    def perform_update(self, serializer: PostWriteSerializer) -> None:
+        old_slug, version = serializer.instance.slug, fragment_version(serializer.instance)
+        old_facets = facet_state(serializer.instance)
+        was_published = serializer.instance.status == Post.Status.PUBLISHED
+        post = serializer.save()
+        record_facet_change(old_facets, facet_state(post))
+        record_stat_change(
+            STATS_POSTS_KEY, (post.status == Post.Status.PUBLISHED) - was_published
+        )
+        self._invalidate_post_cache(post.id, version, old_slug, post.slug)
+        self._invalidate_comments_cache(post.id)
+
+    def perform_destroy(self, instance: Post) -> None:
+        post_id, slug, version = instance.id, instance.slug, fragment_version(instance)
+        old_facets = facet_state(instance)
+        instance.delete()
+        record_facet_change(old_facets, None)
+        record_stat_change(STATS_POSTS_KEY, -(instance.status == Post.Status.PUBLISHED))
+        record_stat_change(STATS_COMMENTS_KEY, -instance.comment_count)
+        self._invalidate_post_cache(post_id, version, slug)
+
+    def _invalidate_comments_cache(self, post_id: int) -> None:
+        try:
+            touch_comments_token(post_id)
+        except Exception:
+            logger.exception("Comments cache token update failed post_id=%s", post_id)
+
+    def _invalidate_comment_count(self, post: Post) -> None:
+        # comment_count is in the post payload but not in its version or the
+        # list pages, so only this post's entries go.
+        self._invalidate_post_cache(post.id, fragment_version(post), post.slug)
+
+    def _invalidate_post_cache(self, post_id: int, version: str, *slugs: str) -> None:
+        try:
+            delete_post_fragments(post_id, version)
+            delete_post_detail(*slugs)
+        except Exception:
+            logger.exception("Post cache invalidation failed post_id=%s", post_id)
 
     @extend_schema(
         tags=["Posts"],
@@ -263,7 +698,7 @@ class PostViewSet(viewsets.ModelViewSet):
     @extend_schema(
         tags=["Comments"],
         summary="List or create comments",
-        description="GET: Returns paginated comments for a post. POST: Creates a new comment. Authentication required for POST.",
+        description="GET: Returns paginated comments for a post, newest first. Pass pagination=cursor for keyset pagination. POST: Creates a new comment. Authentication required for POST.",
         request=CommentWriteSerializer,
         responses={
             200: CommentReadSerializer,
@@ -299,15 +734,24 @@ class PostViewSet(viewsets.ModelViewSet):
         if request.method == "GET":
             if not post_visible:
                 return Response(status=status.HTTP_404_NOT_FOUND)
+            token = get_comments_token(post.id)
+            etag = make_etag(post.id, token, request.get_full_path())
+            last_modified = comments_token_datetime(token)
+            not_modified = conditional_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
             comments_queryset: QuerySet[Comment] = post.comments.select_related(
                 "author"
-            ).order_by("-created_at")
+            ).order_by("-created_at", "-id")
             page = self.paginate_queryset(comments_queryset)
-            if page is not None:
-                serializer = CommentReadSerializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
-            serializer = CommentReadSerializer(comments_queryset, many=True)
-            return Response(serializer.data)
+            with timed("serialize"):
+                if page is not None:
+                    serializer = CommentReadSerializer(page, many=True)
+                    response = self.get_paginated_response(serializer.data)
+                else:
+                    serializer = CommentReadSerializer(comments_queryset, many=True)
+                    response = Response(serializer.data)
+            return set_validators(response, etag, last_modified)
 
         if not post_visible:
             return Response(status=status.HTTP_403_FORBIDDEN)
@@ -320,7 +764,12 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer = CommentWriteSerializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
-            comment = serializer.save(author=request.user, post=post)
+            with transaction.atomic():
+                comment = serializer.save(author=request.user, post=post)
+                Post.adjust_comment_count(post.id, 1)
+                record_stat_change(STATS_COMMENTS_KEY, 1)
+            self._invalidate_comment_count(post)
+            self._invalidate_comments_cache(post.id)
             publish_comment_created(comment)
         except Exception:
             logger.exception(
@@ -384,6 +833,7 @@ class PostViewSet(viewsets.ModelViewSet):
             try:
                 serializer.is_valid(raise_exception=True)
                 updated_comment = serializer.save()
+                self._invalidate_comments_cache(post.id)
             except Exception:
                 logger.exception(
                     "Comment update exception comment_id=%s user_id=%s",
@@ -405,7 +855,12 @@ class PostViewSet(viewsets.ModelViewSet):
             comment.id,
             request.user.id,
         )
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
+            Post.adjust_comment_count(post.id, -1)
+            record_stat_change(STATS_COMMENTS_KEY, -1)
+        self._invalidate_comment_count(post)
+        self._invalidate_comments_cache(post.id)
         logger.info(
             "Comment delete success comment_id=%s user_id=%s",
             comment.id,
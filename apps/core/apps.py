@@ -0,0 +1,13 @@
+import atexit
+
+from django.apps import AppConfig
+
+from apps.core.log import start_queue_listeners, stop_queue_listeners
+
+
+class CoreConfig(AppConfig):
+    name = "apps.core"
+
+    def ready(self) -> None:
+        start_queue_listeners()
+        atexit.register(stop_queue_listeners)
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import weakref
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger("blog")
+
+
+class AsyncRedisCache:
+    # Async twin of the django-redis "default" cache for the async read views.
+    # Keys go through the sync backend's make_key() and values through its
+    # client's encode()/decode(), so both sides read each other's entries.
+    # Errors are swallowed like IGNORE_EXCEPTIONS does for the sync cache.
+
+    def __init__(self, alias: str = "default") -> None:
+        self.alias = alias
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def backend(self) -> Any:
+        return caches[self.alias]
+
+    def _client(self) -> aioredis.Redis:
+        # redis.asyncio connections are bound to the loop that opened them.
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            config = settings.CACHES[self.alias]
+            options = config.get("OPTIONS", {})
+            location = config["LOCATION"]
+            pool = aioredis.ConnectionPool.from_url(
+                location[0] if isinstance(location, (list, tuple)) else location,
+                socket_connect_timeout=options.get("SOCKET_CONNECT_TIMEOUT"),
+                socket_timeout=options.get("SOCKET_TIMEOUT"),
+                **options.get("ASYNC_CONNECTION_POOL_KWARGS", {}),
+            )
+            client = aioredis.Redis(connection_pool=pool)
+            self._clients[loop] = client
+        return client
+
+    @staticmethod
+    def _timeout(timeout: int | None) -> int | None:
+        return None if timeout is None else max(int(timeout), 1)
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = await self._client().get(self.backend.make_key(key))
+        except RedisError:
+            logger.exception("Async cache get failed key=%s", key)
+            return default
+        return default if value is None else self.backend.client.decode(value)
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        try:
+            values = await self._client().mget([self.backend.make_key(key) for key in keys])
+        except RedisError:
+            logger.exception("Async cache get_many failed")
+            return {}
+        return {
+            key: self.backend.client.decode(value)
+            for key, value in zip(keys, values, strict=True)
+            if value is not None
+        }
+
+    async def set(self, key: str, value: Any, timeout: int | None) -> None:
+        try:
+            await self._client().set(
+                self.backend.make_key(key),
+                self.backend.client.encode(value),
+                ex=self._timeout(timeout),
+            )
+        except RedisError:
+            logger.exception("Async cache set failed key=%s", key)
+
+    async def set_many(self, values: dict[str, Any], timeout: int | None) -> None:
+        if not values:
+            return
+        try:
+            pipe = self._client().pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.set(
+                    self.backend.make_key(key),
+                    self.backend.client.encode(value),
+                    ex=self._timeout(timeout),
+                )
+            await pipe.execute()
+        except RedisError:
+            logger.exception("Async cache set_many failed")
+
+    async def add(self, key: str, value: Any, timeout: int | None) -> bool:
+        try:
+            return bool(
+                await self._client().set(
+                    self.backend.make_key(key),
+                    self.backend.client.encode(value),
+                    ex=self._timeout(timeout),
+                    nx=True,
+                )
+            )
+        except RedisError:
+            logger.exception("Async cache add failed key=%s", key)
+            return False
+
+
+async_cache = AsyncRedisCache()
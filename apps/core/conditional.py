@@ -0,0 +1,39 @@
+import hashlib
+from datetime import datetime
+from typing import Any
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.request import Request
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_response(
+    request: Request, etag: str | None, last_modified: datetime | None
+) -> HttpResponseBase | None:
+    response = get_conditional_response(
+        getattr(request, "_request", request),
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    # A 304 repeats the validators so clients keep their stored ETag.
+    if response is not None and response.status_code == 304:
+        set_validators(response, etag, None)
+    return response
+
+
+def set_validators(
+    response: HttpResponseBase, etag: str | None, last_modified: datetime | None
+) -> HttpResponseBase:
+    if etag is not None:
+        response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
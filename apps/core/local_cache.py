@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+import redis
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger("blog")
+
+MISSING = object()
+
+SUBSCRIBER_HEALTH_CHECK_SECONDS = 30
+
+
+class LocalCache:
+    # Per-process LRU in front of the shared Redis cache. Entries are bounded
+    # by total pickled size and a short TTL; cross-worker coherence comes from
+    # invalidation messages on a Redis pub/sub channel.
+
+    def __init__(self, max_bytes: int, ttl: float, channel: str) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.channel = channel
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._subscriber_pid: int | None = None
+
+    def get(self, key: str) -> Any:
+        self._ensure_subscriber()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._pop(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, keys: Iterable[str] = (), prefixes: Iterable[str] = ()) -> None:
+        keys, prefixes = list(keys), list(prefixes)
+        self._drop(keys, prefixes)
+        try:
+            get_redis_connection("default").publish(
+                self.channel, json.dumps({"keys": keys, "prefixes": prefixes})
+            )
+        except Exception:
+            logger.exception("Local cache invalidation publish failed")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+    def _drop(self, keys: list[str], prefixes: list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+            if prefixes:
+                prefixes_tuple = tuple(prefixes)
+                for key in [key for key in self._entries if key.startswith(prefixes_tuple)]:
+                    self._pop(key)
+
+    def _ensure_subscriber(self) -> None:
+        # Started lazily so every pre-forked worker runs its own subscriber.
+        if self._subscriber_pid == os.getpid():
+            return
+        with self._lock:
+            if self._subscriber_pid == os.getpid():
+                return
+            self._subscriber_pid = os.getpid()
+            self._entries.clear()
+            self._size = 0
+        threading.Thread(
+            target=self._listen, name="local-cache-invalidation", daemon=True
+        ).start()
+
+    @staticmethod
+    def _subscriber_client() -> redis.Redis:
+        # A connection of its own: the cache client's SOCKET_TIMEOUT would
+        # cut the blocking read on a quiet channel every few seconds. A dead
+        # connection is found by the periodic health check PING instead.
+        config = settings.CACHES["default"]
+        options = config.get("OPTIONS", {})
+        location = config["LOCATION"]
+        pool = redis.ConnectionPool.from_url(
+            location[0] if isinstance(location, (list, tuple)) else location,
+            socket_connect_timeout=options.get("SOCKET_CONNECT_TIMEOUT"),
+            socket_timeout=None,
+            socket_keepalive=True,
+            health_check_interval=SUBSCRIBER_HEALTH_CHECK_SECONDS,
+            **options.get("CONNECTION_POOL_KWARGS", {}),
+        )
+        return redis.Redis(connection_pool=pool)
+
+    def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            client = self._subscriber_client()
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Messages may have been missed while disconnected.
+                self.clear()
+                backoff = 1.0
+                while True:
+                    # Wakes up at least once per interval so the health
+                    # check runs on an idle channel too.
+                    message = pubsub.get_message(timeout=SUBSCRIBER_HEALTH_CHECK_SECONDS)
+                    if message is None or message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    self._drop(payload.get("keys", []), payload.get("prefixes", []))
+            except Exception:
+                logger.exception("Local cache invalidation subscriber failed")
+                self.clear()
+                client.close()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+_local_cache: LocalCache | None = None
+
+
+def get_local_cache() -> LocalCache | None:
+    global _local_cache
+    if not getattr(settings, "L1_CACHE_ENABLED", False):
+        return None
+    if _local_cache is None:
+        _local_cache = LocalCache(
+            max_bytes=settings.L1_CACHE_MAX_BYTES,
+            ttl=settings.L1_CACHE_TTL_SECONDS,
+            channel=settings.L1_CACHE_INVALIDATION_CHANNEL,
+        )
+    return _local_cache
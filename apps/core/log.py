@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import queue
+import threading
+import weakref
+from collections import Counter
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from apps.core.metrics import record_log_drop
+
+LOG_QUEUE_DROP_NEW = "drop_new"
+LOG_QUEUE_DROP_OLDEST = "drop_oldest"
+LOG_QUEUE_BLOCK = "block"
+LOG_QUEUE_POLICIES = (LOG_QUEUE_DROP_NEW, LOG_QUEUE_DROP_OLDEST, LOG_QUEUE_BLOCK)
+
+_queue_handlers: "weakref.WeakSet[BoundedQueueHandler]" = weakref.WeakSet()
+
+# Attributes every LogRecord has; anything else came in through extra=.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class BoundedQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The stock put_nowait() fails on a full queue and stop() would hang.
+        self.queue.put(self._sentinel)
+
+
+class BoundedQueueHandler(QueueHandler):
+    # Hands records to a background thread that writes them to the real
+    # handlers, so a slow disk or stdout never blocks the request thread.
+    # The queue is bounded; when it is full `policy` decides: "drop_new"
+    # discards the incoming record, "drop_oldest" evicts the oldest queued
+    # one, "block" waits (the pre-queue behaviour). Drops are counted per
+    # level in `dropped`, exported to /metrics, and reported through the
+    # handlers once the queue has room again.
+    # Configured through dictConfig's own QueueHandler support ("class",
+    # "handlers", "queue", "listener"; "." sets the policy), which builds
+    # the target handlers first and attaches the listener. The listener
+    # thread is started by CoreConfig.ready().
+
+    def __init__(self, log_queue: queue.Queue, policy: str = LOG_QUEUE_DROP_NEW) -> None:
+        super().__init__(log_queue)
+        self.policy = policy
+        self.listener: QueueListener | None = None
+        self.dropped: Counter = Counter()
+        self._unreported = 0
+        self._drop_lock = threading.Lock()
+        self._started = False
+        _queue_handlers.add(self)
+
+    @classmethod
+    def for_handlers(
+        cls,
+        handlers: Iterable[logging.Handler],
+        maxsize: int = 10000,
+        policy: str = LOG_QUEUE_DROP_NEW,
+    ) -> "BoundedQueueHandler":
+        # What dictConfig does with the LOGGING entry, for handlers built in code.
+        handler = cls(queue.Queue(maxsize), policy)
+        handler.listener = BoundedQueueListener(
+            handler.queue, *handlers, respect_handler_level=True
+        )
+        return handler
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy: str) -> None:
+        if policy not in LOG_QUEUE_POLICIES:
+            raise ValueError(f"Unknown log queue policy {policy!r}; expected one of {LOG_QUEUE_POLICIES}")
+        self._policy = policy
+
+    def start(self) -> None:
+        if self._started or self.listener is None:
+            return
+        self.listener.start()
+        self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            self.listener.stop()
+            self._started = False
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == LOG_QUEUE_BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            if self._unreported:
+                self._report_drops()
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.policy == LOG_QUEUE_DROP_OLDEST:
+            try:
+                oldest = self.queue.get_nowait()
+            except queue.Empty:
+                oldest = None
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                oldest = record
+            if oldest is not None:
+                self._drop(oldest)
+        else:
+            self._drop(record)
+
+    def _drop(self, record: logging.LogRecord) -> None:
+        with self._drop_lock:
+            self.dropped[record.levelname] += 1
+            self._unreported += 1
+        record_log_drop(self.name or "queue", record.levelname)
+
+    def _report_drops(self) -> None:
+        # Raises queue.Full while there is still no room; the count is kept.
+        count = self._unreported
+        notice = logging.LogRecord(
+            name=__name__,
+            level=logging.WARNING,
+            pathname=__file__,
+            lineno=0,
+            msg="Log queue full, dropped records count=%s policy=%s total=%s",
+            args=(count, self.policy, sum(self.dropped.values())),
+            exc_info=None,
+        )
+        self.queue.put_nowait(self.prepare(notice))
+        with self._drop_lock:
+            self._unreported -= count
+
+    def _restart_after_fork(self) -> None:
+        # The listener thread does not survive fork and the old queue's
+        # lock may have been held by it; start over in the child.
+        if not self._started:
+            return
+        listener = self.listener
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.listener = type(listener)(
+            self.queue, *listener.handlers, respect_handler_level=listener.respect_handler_level
+        )
+        self._started = False
+        self.start()
+
+
+def start_queue_listeners() -> None:
+    for handler in list(_queue_handlers):
+        handler.start()
+
+
+def stop_queue_listeners() -> None:
+    # Flushes what is still queued; registered with atexit.
+    for handler in list(_queue_handlers):
+        handler.stop()
+
+
+def _restart_queue_listeners() -> None:
+    for handler in list(_queue_handlers):
+        handler._restart_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_listeners)
+
+
+class JSONFormatter(logging.Formatter):
+    # One JSON object per line; extra= fields are included as top-level keys.
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in event:
+                event[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            event["exc_info"] = record.exc_text
+        if record.stack_info:
+            event["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+def log_queue_stats() -> dict[str, Any]:
+    return {
+        handler.name or "queue": {
+            "queued": handler.queue.qsize(),
+            "maxsize": handler.queue.maxsize,
+            "policy": handler.policy,
+            "dropped": dict(handler.dropped),
+        }
+        for handler in _queue_handlers
+    }
@@ -0,0 +1,153 @@
+import os
+import time
+from collections.abc import Callable
+from contextlib import ExitStack
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from apps.core.query_budget import view_name
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    Counter = Histogram = None
+
+# With PROMETHEUS_MULTIPROC_DIR set before this import (gunicorn.conf.py does
+# it), every worker writes its samples to mmap files in that directory and
+# /metrics aggregates all of them. Without it the values are per process.
+
+CALL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+if Counter is not None:
+    REQUEST_SECONDS = Histogram(
+        "blog_http_request_duration_seconds",
+        "Request latency by resolved view and action.",
+        ["method", "view", "status"],
+    )
+    LIST_CACHE_EVENTS = Counter(
+        "blog_list_cache_events",
+        "Post list page cache lookups (hit, stale, miss) and invalidations.",
+        ["event"],
+    )
+    RATELIMIT_REJECTIONS = Counter(
+        "blog_ratelimit_rejections",
+        "Requests answered with 429 by ratelimit_or_429.",
+        ["group"],
+    )
+    COMMENT_EVENTS = Counter(
+        "blog_comment_events_published",
+        "comment.created events published to Redis.",
+    )
+    DB_QUERY_SECONDS = Histogram(
+        "blog_db_query_duration_seconds",
+        "Duration of SQL statements run while serving requests.",
+        ["alias"],
+        buckets=CALL_BUCKETS,
+    )
+    LOG_RECORDS_DROPPED = Counter(
+        "blog_log_records_dropped",
+        "Log records discarded by a full BoundedQueueHandler queue.",
+        ["handler", "level"],
+    )
+    REDIS_COMMAND_SECONDS = Histogram(
+        "blog_redis_command_duration_seconds",
+        "Duration of Redis commands and pipelines sent through django-redis.",
+        buckets=CALL_BUCKETS,
+    )
+
+
+def metrics_enabled() -> bool:
+    return Counter is not None and settings.METRICS_ENABLED
+
+
+def multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def record_list_cache_event(event: str) -> None:
+    if metrics_enabled():
+        LIST_CACHE_EVENTS.labels(event).inc()
+
+
+def record_ratelimit_rejection(group: str) -> None:
+    if metrics_enabled():
+        RATELIMIT_REJECTIONS.labels(group).inc()
+
+
+def record_comment_event() -> None:
+    if metrics_enabled():
+        COMMENT_EVENTS.inc()
+
+
+def record_log_drop(handler: str, level: str) -> None:
+    if metrics_enabled():
+        LOG_RECORDS_DROPPED.labels(handler, level).inc()
+
+
+def observe_redis_command(seconds: float) -> None:
+    if metrics_enabled():
+        REDIS_COMMAND_SECONDS.observe(seconds)
+
+
+class _DBTimer:
+    def __init__(self, alias: str) -> None:
+        self.histogram = DB_QUERY_SECONDS.labels(alias)
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.histogram.observe(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    # Request latency per view/action and SQL durations for /metrics.
+    # Removed from the chain unless BLOG_METRICS_ENABLED is on and
+    # prometheus_client is installed. Views are labelled by their resolved
+    # name, never the raw path, to keep the label set bounded; unresolved
+    # requests (404s) share view="unresolved". Queries of async views run
+    # on executor threads and are not observed.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.db_timers = {alias: _DBTimer(alias) for alias in settings.DATABASES}
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: Any) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self.db_timers[alias]))
+            response = self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    async def __acall__(self, request: Any) -> Any:
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    def process_view(self, request: Any, view_func: Callable, view_args: Any, view_kwargs: Any) -> None:
+        request.metrics_view = view_name(view_func, request.method)
+        return None
+
+    @staticmethod
+    def _observe(request: Any, response: Any, started: float) -> None:
+        REQUEST_SECONDS.labels(
+            request.method,
+            getattr(request, "metrics_view", "unresolved"),
+            response.status_code,
+        ).observe(time.perf_counter() - started)
@@ -0,0 +1,40 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from apps.core.metrics import metrics_enabled, multiprocess_dir
+from apps.core.query_budget import query_budget
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        generate_latest,
+    )
+    from prometheus_client.multiprocess import MultiProcessCollector
+except ImportError:
+    generate_latest = None
+
+
+@require_GET
+@query_budget(0)
+def metrics_view(request):
+    # Prometheus scrape endpoint, outside the API schema. Protected by a
+    # bearer token when BLOG_METRICS_TOKEN is set.
+    if not metrics_enabled():
+        raise Http404
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+    if multiprocess_dir():
+        # A fresh registry per scrape: the collector reads every worker's files.
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
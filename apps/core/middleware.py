@@ -1,39 +1,45 @@
-import logging
-from typing import Any, Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.utils import translation
 
-request_logger = logging.getLogger("debug.request")
+from apps.core.timing import timed
+
 
+class LanguageDetectionMiddleware:
+    # Runs natively in sync and async chains so async views are not pushed
+    # back onto a thread under ASGI; the async branch uses request.auser().
+    sync_capable = True
+    async_capable = True
 
-class DebugRequestsMiddleware:
-    def __init__(self, get_response: Callable) -> None:
+    def __init__(self, get_response) -> None:
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request: Any) -> Any:
-        request_logger.debug(
-            "IN %s %s user=%s",
-            request.method,
-            request.get_full_path(),
-            getattr(request.user, "id", None),
-        )
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with timed("lang"):
+            self._activate(request, self._detect_language(request, request.user))
         return self.get_response(request)
 
+    async def __acall__(self, request: Any) -> Any:
+        user = await request.auser()
+        with timed("lang"):
+            self._activate(request, self._detect_language(request, user))
+        return await self.get_response(request)
 
-class LanguageDetectionMiddleware:
-    def __init__(self, get_response) -> None:
-        self.get_response = get_response
-
-    def __call__(self, request: Any) -> Any:
-        language = self._detect_language(request)
+    @staticmethod
+    def _activate(request: Any, language: str) -> None:
         request.LANGUAGE_CODE = language
         translation.activate(language)
-        return self.get_response(request)
 
     @staticmethod
-    def _detect_language(request):
-        if request.user.is_authenticated and request.user.language:
-            return request.user.language
+    def _detect_language(request, user):
+        if user.is_authenticated and user.language:
+            return user.language
 
         lang = request.GET.get("lang")
         if lang:
@@ -44,8 +50,3 @@ class LanguageDetectionMiddleware:
             return accept_language.split(",")[0].split("-")[0].strip()
 
         return settings.LANGUAGE_CODE
-
-
-
-
-
@@ -0,0 +1,164 @@
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("blog")
+
+QUERY_BUDGET_OFF = "off"
+QUERY_BUDGET_LOG = "log"
+QUERY_BUDGET_RAISE = "raise"
+
+_IN_LIST = re.compile(r"\((?:%s, )+%s\)")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(sql: str) -> str:
+    # Parameters are never inlined by execute wrappers; only IN lists of
+    # different lengths need folding to spot the same query repeated.
+    return _IN_LIST.sub("(%s, ...)", sql)
+
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self) -> list[tuple[str, int]]:
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    with _wrap_all_connections(stats):
+        yield stats
+
+
+@contextmanager
+def _wrap_all_connections(stats: QueryStats) -> Iterator[None]:
+    wrappers = [connections[alias].execute_wrapper(stats) for alias in connections]
+    for wrapper in wrappers:
+        wrapper.__enter__()
+    try:
+        yield
+    finally:
+        for wrapper in reversed(wrappers):
+            wrapper.__exit__(None, None, None)
+
+
+def check_budget(name: str, stats: QueryStats, budget: int | None, mode: str) -> None:
+    if budget is None or stats.count <= budget:
+        return
+    duplicates = "; ".join(f"{count}x {sql[:200]}" for sql, count in stats.duplicates[:3])
+    message = (
+        f"Query budget exceeded view={name} queries={stats.count} budget={budget} "
+        f"db_ms={stats.duration * 1000:.1f} duplicates=[{duplicates}]"
+    )
+    if mode == QUERY_BUDGET_RAISE:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+@contextmanager
+def assert_max_queries(budget: int, name: str = "block") -> Iterator[QueryStats]:
+    # Test helper: fails when the block runs more than `budget` queries.
+    with record_queries() as stats:
+        yield stats
+    check_budget(name, stats, budget, QUERY_BUDGET_RAISE)
+
+
+def query_budget(budget: int) -> Callable:
+    # Declares the budget of a plain function view; viewsets use a
+    # query_budgets = {"action": n} class attribute instead.
+    def decorator(view: Callable) -> Callable:
+        view.query_budget = budget
+        return view
+
+    return decorator
+
+
+def _view_action(view_func: Callable, method: str) -> str:
+    actions = getattr(view_func, "actions", None) or {}
+    return actions.get(method.lower(), method.lower())
+
+
+def view_name(view_func: Callable, method: str) -> str:
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return view_func.__qualname__
+    return f"{view_class.__name__}.{_view_action(view_func, method)}"
+
+
+def resolve_budget(view_func: Callable, method: str) -> tuple[str, int | None]:
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return view_name(view_func, method), getattr(view_func, "query_budget", None)
+    budgets = getattr(view_class, "query_budgets", {})
+    return view_name(view_func, method), budgets.get(_view_action(view_func, method))
+
+
+class QueryBudgetMiddleware:
+    # Counts queries, DB time and repeated statements per request and checks
+    # them against the budget declared for the resolved view and action.
+    # BLOG_QUERY_BUDGET_MODE: "log" warns (production), "raise" fails the
+    # request with QueryBudgetExceeded (CI), "off" skips the wrapper.
+    # Under ASGI, ORM calls run on executor threads whose connections this
+    # wrapper does not see, so async requests pass through unrecorded.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: Any) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = settings.QUERY_BUDGET_MODE
+        if mode == QUERY_BUDGET_OFF:
+            return self.get_response(request)
+        with record_queries() as stats:
+            request.query_stats = stats
+            response = self.get_response(request)
+        name, budget = getattr(request, "query_budget", (None, None))
+        if name is not None:
+            logger.debug(
+                "Queries view=%s count=%s budget=%s db_ms=%.1f duplicates=%s",
+                name,
+                stats.count,
+                budget,
+                stats.duration * 1000,
+                len(stats.duplicates),
+            )
+            check_budget(name, stats, budget, mode)
+        return response
+
+    async def __acall__(self, request: Any) -> Any:
+        return await self.get_response(request)
+
+    def process_view(self, request: Any, view_func: Callable, view_args: Any, view_kwargs: Any) -> None:
+        request.query_budget = resolve_budget(view_func, request.method)
+        return None
@@ -7,6 +7,8 @@ from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.core.metrics import record_ratelimit_rejection
+
 RATE_LIMIT_ERROR_MESSAGE = "Too many requests. Try again later."
 
 
@@ -26,6 +28,7 @@ def ratelimit_or_429(
 ) -> Callable:
     def decorator(view_func: Callable) -> Callable:
         limited = ratelimit(key=key, rate=rate, method=method, group=group, block=False)
+        metric_group = group or view_func.__qualname__
 
         @limited
         def _ratelimit_check(request: Any) -> None:
@@ -46,6 +49,7 @@ def ratelimit_or_429(
                 _ratelimit_check(request)
 
             if getattr(request, "limited", False):
+                record_ratelimit_rejection(metric_group)
                 return too_many_requests_response()
             return view_func(*args, **kwargs)
 
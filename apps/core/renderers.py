@@ -0,0 +1,17 @@
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    # Lets clients ask for application/x-ndjson on streaming endpoints; views
+    # stream the body themselves, so this only renders error responses.
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data: Any, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        if data is None:
+            return b""
+        return (DjangoJSONEncoder(ensure_ascii=False).encode(data) + "\n").encode()
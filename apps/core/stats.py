@@ -0,0 +1,58 @@
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.blog.models import Comment, Post
+from apps.core.async_cache import async_cache
+from apps.users.models import User
+
+logger = logging.getLogger("blog")
+
+STATS_POSTS_KEY = "stats:posts"
+STATS_USERS_KEY = "stats:users"
+STATS_COMMENTS_KEY = "stats:comments"
+STATS_KEYS = {
+    "posts": STATS_POSTS_KEY,
+    "users": STATS_USERS_KEY,
+    "comments": STATS_COMMENTS_KEY,
+}
+
+
+def record_stat_change(key: str, delta: int) -> None:
+    # Applied after commit so rolled back writes never move the counters.
+    if delta:
+        transaction.on_commit(lambda: _increment(key, int(delta)))
+
+
+def _increment(key: str, delta: int) -> None:
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # django-redis only increments existing keys; a missing counter is
+        # rebuilt from the database on the next read instead.
+        logger.debug("Stats counter missing key=%s", key)
+    except Exception:
+        logger.exception("Stats counter update failed key=%s", key)
+
+
+def count_stats_from_db() -> dict[str, int]:
+    return {
+        "posts": Post.objects.filter(status=Post.Status.PUBLISHED).count(),
+        "users": User.objects.count(),
+        "comments": Comment.objects.count(),
+    }
+
+
+def reconcile_stats() -> dict[str, int]:
+    counts = count_stats_from_db()
+    cache.set_many({STATS_KEYS[name]: value for name, value in counts.items()}, timeout=None)
+    return counts
+
+
+async def aget_stats() -> dict[str, int] | None:
+    # None when any counter is missing (cold cache, eviction, Redis down).
+    values = await async_cache.get_many(list(STATS_KEYS.values()))
+    if len(values) != len(STATS_KEYS):
+        return None
+    return {name: max(values[key], 0) for name, key in STATS_KEYS.items()}
@@ -0,0 +1,108 @@
+import logging
+import queue
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from apps.core.log import (
+    LOG_QUEUE_DROP_NEW,
+    LOG_QUEUE_DROP_OLDEST,
+    BoundedQueueHandler,
+    BoundedQueueListener,
+)
+
+
+def make_record(level: int, message: str) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {"name": "blog", "levelno": level, "levelname": logging.getLevelName(level), "msg": message}
+    )
+
+
+class BoundedQueueHandlerTests(SimpleTestCase):
+    # The listener is never started, so the queue only empties when a test
+    # takes records out of it.
+
+    def handler(self, policy: str) -> BoundedQueueHandler:
+        handler = BoundedQueueHandler(queue.Queue(2), policy)
+        handler.name = "queue_test"
+        patcher = mock.patch("apps.core.log.record_log_drop")
+        self.recorded = patcher.start()
+        self.addCleanup(patcher.stop)
+        return handler
+
+    def emit(self, handler: BoundedQueueHandler, *levels: int) -> None:
+        for index, level in enumerate(levels):
+            handler.handle(make_record(level, f"record {index}"))
+
+    def queued(self, handler: BoundedQueueHandler) -> list[str]:
+        messages = []
+        while not handler.queue.empty():
+            messages.append(handler.queue.get_nowait().getMessage())
+        return messages
+
+    def test_drop_new_discards_incoming_records(self) -> None:
+        handler = self.handler(LOG_QUEUE_DROP_NEW)
+        self.emit(handler, logging.INFO, logging.INFO, logging.WARNING, logging.ERROR, logging.ERROR)
+
+        self.assertEqual(self.queued(handler), ["record 0", "record 1"])
+        self.assertEqual(handler.dropped, {"WARNING": 1, "ERROR": 2})
+        self.assertEqual(
+            self.recorded.call_args_list,
+            [
+                mock.call("queue_test", "WARNING"),
+                mock.call("queue_test", "ERROR"),
+                mock.call("queue_test", "ERROR"),
+            ],
+        )
+
+        # Once there is room the drops are reported ahead of the next record.
+        self.emit(handler, logging.INFO)
+        self.assertEqual(
+            self.queued(handler),
+            [
+                "Log queue full, dropped records count=3 policy=drop_new total=3",
+                "record 0",
+            ],
+        )
+        self.assertEqual(handler._unreported, 0)
+
+    def test_drop_oldest_evicts_queued_records(self) -> None:
+        handler = self.handler(LOG_QUEUE_DROP_OLDEST)
+        self.emit(handler, logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR)
+
+        self.assertEqual(self.queued(handler), ["record 2", "record 3"])
+        self.assertEqual(handler.dropped, {"DEBUG": 1, "INFO": 1})
+        self.assertEqual(
+            self.recorded.call_args_list,
+            [mock.call("queue_test", "DEBUG"), mock.call("queue_test", "INFO")],
+        )
+
+    def test_report_waits_for_room(self) -> None:
+        handler = self.handler(LOG_QUEUE_DROP_NEW)
+        self.emit(handler, logging.INFO, logging.INFO, logging.INFO)
+        handler.queue.get_nowait()
+
+        # Room for the notice only: the record after it is dropped as well.
+        self.emit(handler, logging.WARNING)
+        self.assertEqual(
+            self.queued(handler),
+            ["record 1", "Log queue full, dropped records count=1 policy=drop_new total=1"],
+        )
+        self.assertEqual(handler.dropped, {"INFO": 1, "WARNING": 1})
+        self.assertEqual(handler._unreported, 1)
+
+    def test_rejects_unknown_policy(self) -> None:
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(queue.Queue(), "drop_everything")
+
+    @skipUnless(settings.LOG_QUEUE_ENABLED, "the log queue is disabled")
+    def test_logging_settings_configure_the_queue(self) -> None:
+        handler = logging.getHandlerByName("queue_app")
+        self.assertIsInstance(handler, BoundedQueueHandler)
+        self.assertIsInstance(handler.listener, BoundedQueueListener)
+        self.assertEqual(
+            [target.name for target in handler.listener.handlers], ["console", "file"]
+        )
+        self.assertEqual(handler.queue.maxsize, settings.LOG_QUEUE_MAXSIZE)
+        self.assertEqual(handler.policy, settings.LOG_QUEUE_POLICY)
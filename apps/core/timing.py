@@ -0,0 +1,193 @@
+import logging
+import random
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from redis import Redis
+from redis.client import Pipeline
+
+from apps.core.metrics import observe_redis_command
+from apps.core.query_budget import view_name
+
+timing_logger = logging.getLogger("request.timing")
+
+_current: ContextVar["RequestTimings | None"] = ContextVar("request_timings", default=None)
+_untimed = nullcontext()
+
+# Server-Timing metric names and descriptions, in header order.
+PHASES = {
+    "auth": "JWT authentication",
+    "lang": "Language detection",
+    "db": "Database",
+    "cache": "Redis",
+    "serialize": "Serialization",
+    "render": "Rendering",
+}
+
+
+class RequestTimings:
+    # Exclusive time per phase: entering a nested phase pauses the outer
+    # one, so the DB queries a serializer triggers count as "db", not
+    # "serialize", and the phases add up to at most the request total.
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.totals: dict[str, float] = defaultdict(float)
+        self.counts: dict[str, int] = defaultdict(int)
+        self._stack: list[list[Any]] = []
+
+    def start(self, phase: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.totals[outer[0]] += now - outer[1]
+        self._stack.append([phase, now])
+
+    def stop(self) -> None:
+        now = time.perf_counter()
+        phase, started = self._stack.pop()
+        self.totals[phase] += now - started
+        self.counts[phase] += 1
+        if self._stack:
+            self._stack[-1][1] = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def db_wrapper(self, execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+        with self.phase("db"):
+            return execute(sql, params, many, context)
+
+    def header(self, total: float) -> str:
+        metrics = [
+            f'{name};dur={self.totals[name] * 1000:.2f};desc="{description}"'
+            for name, description in PHASES.items()
+            if name in self.totals
+        ]
+        metrics.append(f'total;dur={total * 1000:.2f};desc="Total"')
+        return ", ".join(metrics)
+
+
+def timed(phase: str) -> Any:
+    # Cheap no-op unless the current request was sampled.
+    timings = _current.get()
+    return _untimed if timings is None else timings.phase(phase)
+
+
+class TimedPipeline(Pipeline):
+    def execute(self, raise_on_error: bool = True) -> list:
+        started = time.perf_counter()
+        try:
+            with timed("cache"):
+                return super().execute(raise_on_error)
+        finally:
+            observe_redis_command(time.perf_counter() - started)
+
+
+class TimedRedis(Redis):
+    # redis-py client for django-redis (OPTIONS["REDIS_CLIENT_CLASS"]) that
+    # books every round trip, scripts and pipelines included, as "cache" and
+    # in the Redis duration histogram of /metrics.
+
+    def execute_command(self, *args: Any, **options: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            with timed("cache"):
+                return super().execute_command(*args, **options)
+        finally:
+            observe_redis_command(time.perf_counter() - started)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None) -> Pipeline:
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class ServerTimingMiddleware:
+    # Samples SERVER_TIMING_SAMPLE_RATE of requests and breaks their time
+    # down into auth, language detection, DB, Redis, serialization and
+    # rendering. Sampled requests get a Server-Timing header (unless
+    # SERVER_TIMING_HEADER is off) and one "request.timing" log line. With a
+    # rate of 0 the middleware removes itself from the chain at startup.
+    # Async views only report what runs on the request's own thread.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if settings.SERVER_TIMING_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        self.add_header = settings.SERVER_TIMING_HEADER
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: Any) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timings.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    async def __acall__(self, request: Any) -> Any:
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    def process_view(self, request: Any, view_func: Callable, view_args: Any, view_kwargs: Any) -> None:
+        if _current.get() is not None:
+            request.timing_view = view_name(view_func, request.method)
+        return None
+
+    def process_template_response(self, request: Any, response: Any) -> Any:
+        # Called right before the handler renders a DRF Response.
+        timings = _current.get()
+        if timings is not None:
+            timings.start("render")
+            response.add_post_render_callback(lambda rendered: timings.stop())
+        return response
+
+    def _finish(self, request: Any, response: Any, timings: RequestTimings) -> Any:
+        total = time.perf_counter() - timings.started
+        if self.add_header:
+            response["Server-Timing"] = timings.header(total)
+        timing_logger.info(
+            "method=%s path=%s view=%s status=%s total_ms=%.2f %s app_ms=%.2f",
+            request.method,
+            request.path,
+            getattr(request, "timing_view", None),
+            response.status_code,
+            total * 1000,
+            " ".join(
+                f"{name}_ms={timings.totals[name] * 1000:.2f} {name}_count={timings.counts[name]}"
+                for name in PHASES
+            ),
+            (total - sum(timings.totals.values())) * 1000,
+        )
+        return response
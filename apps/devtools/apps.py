@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class DevtoolsConfig(AppConfig):
+    # Benchmark commands; installed by settings.env.local only, never in prod.
+    name = "apps.devtools"
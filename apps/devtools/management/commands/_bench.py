@@ -0,0 +1,54 @@
+from apps.blog.models import Category, Comment, Post, Tag
+from apps.users.models import User
+
+
+def seed_bench_posts(
+    count: int, timezone: str = "UTC", tags_per_post: int = 3, draft_every: int = 0
+) -> User:
+    # Callers run this inside transaction.atomic() and roll back afterwards.
+    author = User.objects.create_user(
+        "bench@example.com", "bench-password", timezone=timezone
+    )
+    category = Category.objects.create(
+        name="Bench category", name_ru="Бенчмарк", slug="bench-category"
+    )
+    tags = Tag.objects.bulk_create(
+        Tag(name=f"bench-tag-{index}", slug=f"bench-tag-{index}")
+        for index in range(tags_per_post)
+    )
+    posts = Post.objects.bulk_create(
+        (
+            Post(
+                author=author,
+                category=category,
+                title=f"Bench post {index}",
+                slug=f"bench-post-{index}",
+                body="Lorem ipsum " * 20,
+                status=(
+                    Post.Status.DRAFT
+                    if draft_every and index % draft_every == 0
+                    else Post.Status.PUBLISHED
+                ),
+                tag_names=[tag.name for tag in tags],
+            )
+            for index in range(count)
+        ),
+        batch_size=1000,
+    )
+    Post.tags.through.objects.bulk_create(
+        (Post.tags.through(post_id=post.id, tag_id=tag.id) for post in posts for tag in tags),
+        batch_size=5000,
+    )
+    return author
+
+
+def seed_bench_comments(author: User, posts: int, per_post: int) -> None:
+    post_ids = Post.objects.filter(author=author).order_by("id").values_list("id", flat=True)[:posts]
+    Comment.objects.bulk_create(
+        (
+            Comment(post_id=post_id, author=author, body=f"Bench comment {index}")
+            for post_id in post_ids
+            for index in range(per_post)
+        ),
+        batch_size=5000,
+    )
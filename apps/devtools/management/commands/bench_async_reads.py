@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.blog.management.commands.loadtest import latency_summary
+from apps.blog.models import Post
+
+
+def summarize(mode: str, latencies: list[float], elapsed: float, errors: int) -> dict[str, Any]:
+    summary = latency_summary(latencies)
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": summary["p50_ms"],
+        "p95_ms": summary["p95_ms"],
+        "p99_ms": summary["p99_ms"],
+    }
+
+
+def run_async_client(
+    mode: str, paths: list[str], concurrency: int, requests: int, base_url: str | None = None
+) -> dict[str, Any]:
+    # In-process through the ASGI app, or against a running server.
+    async def main() -> dict[str, Any]:
+        if base_url:
+            client_options = {"base_url": base_url, "limits": httpx.Limits(max_connections=concurrency)}
+        else:
+            client_options = {
+                "base_url": "http://localhost",
+                "transport": httpx.ASGITransport(app=ASGIHandler()),
+            }
+        latencies: list[float] = []
+        errors = 0
+        async with httpx.AsyncClient(**client_options) as client:
+
+            async def worker(offset: int) -> None:
+                nonlocal errors
+                for index in range(offset, requests, concurrency):
+                    started = time.perf_counter()
+                    response = await client.get(paths[index % len(paths)])
+                    latencies.append(time.perf_counter() - started)
+                    errors += response.status_code != 200
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+            return summarize(mode, latencies, time.perf_counter() - started, errors)
+
+    return asyncio.run(main())
+
+
+def run_wsgi_threads(paths: list[str], concurrency: int, requests: int) -> dict[str, Any]:
+    transport = httpx.WSGITransport(app=WSGIHandler())
+    latencies: list[float] = []
+    errors = 0
+
+    def worker(offset: int) -> None:
+        nonlocal errors
+        with httpx.Client(transport=transport, base_url="http://localhost") as client:
+            for index in range(offset, requests, concurrency):
+                started = time.perf_counter()
+                response = client.get(paths[index % len(paths)])
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code != 200
+        close_old_connections()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize("wsgi", latencies, time.perf_counter() - started, errors)
+
+
+def bench_paths() -> list[str]:
+    published = Post.objects.filter(status=Post.Status.PUBLISHED)
+    slugs = list(published.order_by("-created_at").values_list("slug", flat=True)[:20])
+    if not slugs:
+        raise CommandError("No published posts; create some first")
+    paths = ["/api/posts/", "/api/posts/?pagination=cursor"]
+    if published.count() > settings.REST_FRAMEWORK["PAGE_SIZE"]:
+        paths.append("/api/posts/?page=2")
+    paths += [f"/api/posts/{slug}/" for slug in slugs]
+    paths += [f"/api/posts/{slug}/comments/" for slug in slugs[:5]]
+    return paths
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the cached post read endpoints through the ASGI app (native async "
+        "views) and the WSGI app (sync viewset). Runs in-process by default; pass "
+        "--wsgi-url/--asgi-url to hit running gunicorn and uvicorn servers instead."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--mode", choices=["both", "asgi", "wsgi"], default="both")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--wsgi-url", help="Base URL of a running WSGI server.")
+        parser.add_argument("--asgi-url", help="Base URL of a running ASGI server.")
+        parser.add_argument("--json", action="store_true", help="Print one JSON result line.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        concurrency, requests = options["concurrency"], options["requests"]
+        if options["wsgi_url"] or options["asgi_url"]:
+            paths = bench_paths()
+            results = []
+            for mode in ("wsgi", "asgi"):
+                url = options[f"{mode}_url"]
+                if url:
+                    run_async_client(mode, paths, 1, len(paths), url)
+                    results.append(run_async_client(mode, paths, concurrency, requests, url))
+            self.write_table(results)
+            return
+
+        if options["mode"] == "both":
+            self.write_table([self.run_child(mode, options) for mode in ("wsgi", "asgi")])
+            return
+
+        if options["mode"] == "asgi" and not settings.ASYNC_READ_VIEWS_ENABLED:
+            raise CommandError("Set BLOG_ASYNC_READ_VIEWS_ENABLED=True for the asgi mode")
+        paths = bench_paths()
+        if options["mode"] == "asgi":
+            run_async_client("asgi", paths, 1, len(paths))
+            result = run_async_client("asgi", paths, concurrency, requests)
+        else:
+            run_wsgi_threads(paths, 1, len(paths))
+            result = run_wsgi_threads(paths, concurrency, requests)
+        self.stdout.write(json.dumps(result) if options["json"] else str(result))
+
+    def write_table(self, results: list[dict[str, Any]]) -> None:
+        self.stdout.write(
+            f"{'mode':<5} {'req':>7} {'err':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<5} {result['requests']:>7} {result['errors']:>5} "
+                f"{result['rps']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{result['p99_ms']:>8.2f}"
+            )
+
+    def run_child(self, mode: str, options: dict[str, Any]) -> dict[str, Any]:
+        env = dict(os.environ, BLOG_ASYNC_READ_VIEWS_ENABLED=str(mode == "asgi"))
+        command = [
+            sys.executable,
+            sys.argv[0],
+            "bench_async_reads",
+            "--mode",
+            mode,
+            "--json",
+            "--concurrency",
+            str(options["concurrency"]),
+            "--requests",
+            str(options["requests"]),
+        ]
+        output = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+        return json.loads(output.stdout.strip().splitlines()[-1])
@@ -0,0 +1,61 @@
+import time
+from typing import Any
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+from apps.blog.cache import LIST_CACHE_KEY_PREFIX, bump_list_cache_generation
+
+FILLER_KEY_PREFIX = "bench:filler"
+
+
+def fill_keyspace(redis_connection, count: int, batch_size: int = 10_000) -> None:
+    for start in range(0, count, batch_size):
+        pipe = redis_connection.pipeline(transaction=False)
+        for index in range(start, min(start + batch_size, count)):
+            pipe.set(f"{FILLER_KEY_PREFIX}:{index}", b"x")
+        pipe.execute()
+
+
+def clear_keyspace(redis_connection) -> None:
+    for key in redis_connection.scan_iter(match=f"{FILLER_KEY_PREFIX}:*", count=10_000):
+        redis_connection.delete(key)
+
+
+def time_writes(invalidate, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        invalidate()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+class Command(BaseCommand):
+    help = "Compare post list cache invalidation latency: SCAN delete_pattern vs generation INCR."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--keyspace",
+            default="1000,10000,100000",
+            help="Comma separated numbers of unrelated keys to put in Redis.",
+        )
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        redis_connection = get_redis_connection("default")
+        sizes = [int(size) for size in options["keyspace"].split(",") if size]
+        iterations = options["iterations"]
+
+        self.stdout.write(f"{'keys':>10} {'delete_pattern ms':>18} {'incr ms':>10}")
+        try:
+            for size in sizes:
+                clear_keyspace(redis_connection)
+                fill_keyspace(redis_connection, size)
+                pattern_ms = time_writes(
+                    lambda: cache.delete_pattern(f"{LIST_CACHE_KEY_PREFIX}:*"),
+                    iterations,
+                )
+                incr_ms = time_writes(bump_list_cache_generation, iterations)
+                self.stdout.write(f"{size:>10} {pattern_ms:>18.3f} {incr_ms:>10.3f}")
+        finally:
+            clear_keyspace(redis_connection)
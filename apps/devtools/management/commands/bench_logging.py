@@ -0,0 +1,147 @@
+import io
+import json
+import logging
+import tempfile
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.blog.management.commands.loadtest import latency_summary
+from apps.core.log import LOG_QUEUE_POLICIES, BoundedQueueHandler
+
+VERBOSE_FORMAT = "{asctime} {levelname} {name} {module} {message}"
+
+
+class StalledHandler(logging.Handler):
+    # Sleeps before every `stall_every`-th write, holding the handler lock
+    # like a blocked write(2) on a slow disk or a full stdout pipe would.
+
+    def __init__(self, target: logging.Handler, delay: float, stall_every: int) -> None:
+        super().__init__(target.level)
+        self.target = target
+        self.delay = delay
+        self.stall_every = stall_every
+        self.writes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.writes += 1
+        if self.writes % self.stall_every == 0:
+            time.sleep(self.delay)
+        self.target.handle(record)
+
+    def close(self) -> None:
+        self.target.close()
+        super().close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Request latency attributable to logging when stdout and the log file stall. "
+        "Worker threads each run simulated requests that emit the log lines of the post "
+        "create path (attempt, success, timing line) while every Nth write sleeps, once "
+        "with the handlers called directly and once through BoundedQueueHandler."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per thread.")
+        parser.add_argument("--delay-ms", type=float, default=5.0, help="Length of one write stall.")
+        parser.add_argument("--stall-every", type=int, default=1, help="Stall every Nth write per handler.")
+        parser.add_argument("--queue-maxsize", type=int, default=10000)
+        parser.add_argument("--policy", choices=LOG_QUEUE_POLICIES, default="drop_new")
+        parser.add_argument("--modes", default="direct,queue")
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in options["modes"].split(","):
+                results.append(self.run_mode(mode.strip(), Path(directory), options))
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'mode':<7} {'req':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+            f"{'drain s':>8} {'written':>8} {'dropped':>8}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<7} {result['requests']:>7} {result['p50_ms']:>8.2f} "
+                f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['max_ms']:>8.2f} "
+                f"{result['drain_s']:>8.2f} {result['written']:>8} {result['dropped']:>8}"
+            )
+
+    def build_handlers(self, directory: Path, mode: str, options: dict[str, Any]) -> list[logging.Handler]:
+        formatter = logging.Formatter(VERBOSE_FORMAT, style="{")
+        console = logging.StreamHandler(io.StringIO())
+        log_file = RotatingFileHandler(
+            directory / f"{mode}.log", maxBytes=5 * 1024 * 1024, backupCount=3
+        )
+        handlers = []
+        for target in (console, log_file):
+            target.setFormatter(formatter)
+            handlers.append(
+                StalledHandler(target, options["delay_ms"] / 1000, options["stall_every"])
+            )
+        return handlers
+
+    def run_mode(self, mode: str, directory: Path, options: dict[str, Any]) -> dict[str, Any]:
+        stalled = self.build_handlers(directory, mode, options)
+        if mode == "direct":
+            handlers = stalled
+            queue_handler = None
+        elif mode == "queue":
+            queue_handler = BoundedQueueHandler.for_handlers(
+                stalled, maxsize=options["queue_maxsize"], policy=options["policy"]
+            )
+            queue_handler.start()
+            handlers = [queue_handler]
+        else:
+            raise ValueError(f"Unknown mode {mode!r}; expected direct or queue")
+
+        logger = logging.getLogger(f"bench.logging.{mode}")
+        logger.handlers = handlers
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        latencies: list[float] = []
+        lock = threading.Lock()
+
+        def worker(number: int) -> None:
+            own = []
+            for index in range(options["requests"]):
+                started = time.perf_counter()
+                logger.info("Post create attempt user_id=%s", number)
+                logger.info("Post create success post_id=%s user_id=%s", index, number)
+                logger.info(
+                    "method=POST path=/api/posts/ view=PostViewSet.create status=201 total_ms=%.2f",
+                    (time.perf_counter() - started) * 1000,
+                )
+                own.append(time.perf_counter() - started)
+            with lock:
+                latencies.extend(own)
+
+        threads = [threading.Thread(target=worker, args=(number,)) for number in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        drain_started = time.perf_counter()
+        if queue_handler is not None:
+            queue_handler.stop()
+        drain = time.perf_counter() - drain_started
+        for handler in {*handlers, *stalled}:
+            handler.close()
+        logger.handlers = []
+        return {
+            "mode": mode,
+            "requests": len(latencies),
+            "drain_s": drain,
+            "written": stalled[0].writes,
+            "dropped": sum(queue_handler.dropped.values()) if queue_handler is not None else 0,
+            **latency_summary(latencies),
+        }
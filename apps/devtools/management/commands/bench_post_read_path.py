@@ -0,0 +1,59 @@
+import json
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.blog.models import Post
+from apps.blog.serializers import PostReadSerializer
+from apps.devtools.management.commands._bench import seed_bench_posts
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+class Command(BaseCommand):
+    help = "Compare the DRF PostReadSerializer path with PostReadSerializer.fast_data."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--posts", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--lang", default="ru")
+        parser.add_argument("--canonical", action="store_true", help="Use cached UTC date output.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            author = seed_bench_posts(options["posts"], timezone="Asia/Almaty")
+            request = SimpleNamespace(user=author, LANGUAGE_CODE=options["lang"])
+            context = {"request": request, "canonical_dates": options["canonical"]}
+            queryset = (
+                Post.objects.filter(author=author)
+                .select_related("author", "category")
+                .order_by("-created_at", "-id")
+            )
+
+            drf_ms, drf_data = best_of(
+                options["repeat"],
+                lambda: PostReadSerializer(queryset.all(), many=True, context=context).data,
+            )
+            fast_ms, fast_data = best_of(
+                options["repeat"],
+                lambda: PostReadSerializer.fast_data(queryset.all(), context),
+            )
+            transaction.set_rollback(True)
+
+        if json.dumps(drf_data) != json.dumps(fast_data):
+            raise CommandError("fast_data output differs from the DRF serializer output")
+        self.stdout.write(f"posts={options['posts']} (query + serialization, best of {options['repeat']})")
+        self.stdout.write(f"drf:  {drf_ms:.1f} ms")
+        self.stdout.write(f"fast: {fast_ms:.1f} ms")
+        self.stdout.write(f"speedup: {drf_ms / fast_ms:.2f}x, output identical")
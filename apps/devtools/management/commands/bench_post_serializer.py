@@ -0,0 +1,56 @@
+import time
+import zoneinfo
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+from babel.dates import format_datetime
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.blog.models import Post
+from apps.blog.serializers import PostReadSerializer
+from apps.devtools.management.commands._bench import seed_bench_posts
+
+
+def legacy_format_dt(dt, lang: str, tz_name: str) -> str:
+    tz = zoneinfo.ZoneInfo(tz_name)
+    return format_datetime(dt.astimezone(tz), format="long", locale=lang)
+
+
+def time_serializer(posts: list[Post], request: Any, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _ = PostReadSerializer(posts, many=True, context={"request": request}).data
+        best = min(best, time.perf_counter() - started)
+    return best / len(posts) * 1000 * 1000
+
+
+class Command(BaseCommand):
+    help = "Measure PostReadSerializer time per 1,000 posts with and without the formatter registry."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--lang", default="ru")
+        parser.add_argument("--timezone", default="Asia/Almaty")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            author = seed_bench_posts(options["posts"], timezone=options["timezone"])
+            posts = list(
+                Post.objects.filter(author=author)
+                .select_related("author", "category")
+            )
+            request = SimpleNamespace(user=author, LANGUAGE_CODE=options["lang"])
+
+            with mock.patch("apps.blog.serializers.format_dt", legacy_format_dt):
+                before = time_serializer(posts, request, options["repeat"])
+            after = time_serializer(posts, request, options["repeat"])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"posts={len(posts)} lang={options['lang']} tz={options['timezone']}")
+        self.stdout.write(f"before: {before:.2f} ms per 1,000 posts")
+        self.stdout.write(f"after:  {after:.2f} ms per 1,000 posts")
+        self.stdout.write(f"speedup: {before / after:.2f}x")
@@ -0,0 +1,102 @@
+import random
+import statistics
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.blog.models import Post
+from apps.blog.search import search_posts
+from apps.users.models import User
+
+VOCABULARY = {
+    "en": [
+        "python", "django", "database", "query", "index", "search", "ranking", "cache",
+        "server", "request", "response", "migration", "model", "serializer", "cursor",
+        "page", "token", "language", "release",
+    ],
+    "ru": [
+        "программирование", "база", "данных", "запрос", "индекс", "поиск", "сервер", "кеш",
+        "ответ", "миграция", "модель", "страница", "язык", "выпуск", "разработка",
+    ],
+    "kk": [
+        "бағдарлама", "дерекқор", "сұраныс", "индекс", "іздеу", "сервер", "жауап", "үлгі",
+        "бет", "тіл", "шығарылым", "әзірлеу",
+    ],
+}
+QUERIES = {
+    "en": ["python", "database index", "ranking server"],
+    "ru": ["программирование", "база данных", "поиск"],
+    "kk": ["дерекқор", "іздеу сервер", "тіл"],
+}
+
+
+def seed_search_posts(count: int, batch_size: int = 5000) -> User:
+    author = User.objects.create_user("search-bench@example.com", "bench-password")
+    rng = random.Random(42)
+    languages = list(VOCABULARY)
+    for start in range(0, count, batch_size):
+        posts = []
+        for index in range(start, min(start + batch_size, count)):
+            words = VOCABULARY[languages[index % len(languages)]]
+            posts.append(
+                Post(
+                    author=author,
+                    title=" ".join(rng.choices(words, k=4)),
+                    slug=f"search-bench-{index}",
+                    body=" ".join(rng.choices(words, k=60)),
+                    status=Post.Status.PUBLISHED,
+                )
+            )
+        Post.objects.bulk_create(posts)
+    return author
+
+
+def time_query(query: str, lang: str, pages: int, repeat: int, page_size: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        after = None
+        for _ in range(pages):
+            started = time.perf_counter()
+            rows = search_posts(query, lang, after, page_size + 1)
+            timings.append((time.perf_counter() - started) * 1000)
+            if len(rows) <= page_size:
+                break
+            after = (rows[page_size - 1].rank, rows[page_size - 1].id)
+    return timings
+
+
+class Command(BaseCommand):
+    help = "Seed posts in three languages and time ranked full-text search pages."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--posts", type=int, default=1_000_000)
+        parser.add_argument("--pages", type=int, default=5)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=10)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            started = time.perf_counter()
+            seed_search_posts(options["posts"])
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            self.stdout.write(
+                f"seeded posts={options['posts']} vendor={connection.vendor} "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+            self.stdout.write(f"{'lang':<5} {'query':<22} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+            for lang, queries in QUERIES.items():
+                for query in queries:
+                    timings = sorted(
+                        time_query(
+                            query, lang, options["pages"], options["repeat"], options["page_size"]
+                        )
+                    )
+                    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                    self.stdout.write(
+                        f"{lang:<5} {query:<22} {statistics.median(timings):>8.2f} "
+                        f"{p95:>8.2f} {timings[-1]:>8.2f}"
+                    )
+            transaction.set_rollback(True)
@@ -0,0 +1,269 @@
+import json
+import platform
+import statistics
+import timeit
+from collections.abc import Callable
+from contextlib import ExitStack
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+
+from apps.blog.cache import bump_list_cache_generation
+from apps.blog.models import Post
+from apps.blog.redis_events import publish_comment_created
+from apps.blog.serializers import CommentReadSerializer, PostReadSerializer
+from apps.blog.views import PostViewSet
+from apps.core.metrics import MetricsMiddleware, metrics_enabled, multiprocess_dir
+from apps.core.middleware import LanguageDetectionMiddleware
+from apps.core.ratelimit import ratelimit_or_429
+from apps.devtools.management.commands._bench import (
+    seed_bench_comments,
+    seed_bench_posts,
+)
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+PAGE_SIZES = (10, 50, 200)
+
+
+def fake_redis_caches() -> dict[str, Any]:
+    # A LOCATION no real cache uses: django-redis keeps connection pools in
+    # a process-global dict keyed by URL.
+    caches = {
+        alias: {**config, "OPTIONS": dict(config.get("OPTIONS", {}))}
+        for alias, config in settings.CACHES.items()
+    }
+    options = caches["default"]["OPTIONS"]
+    caches["default"]["LOCATION"] = "redis://bench-fakeredis:6379/0"
+    options["CONNECTION_POOL_KWARGS"] = {
+        "connection_class": fakeredis.FakeConnection,
+        "server": fakeredis.FakeServer(),
+    }
+    return caches
+
+
+def measure(func: Callable[[], Any], rounds: int) -> dict[str, float]:
+    # timeit's autorange picks a loop count that runs for at least 0.2s; the
+    # median of the rounds is what gets saved and compared.
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [total / number for total in timer.repeat(repeat=rounds, number=number)]
+    return {
+        "median_us": statistics.median(timings) * 1e6,
+        "min_us": min(timings) * 1e6,
+        "number": number,
+        "rounds": rounds,
+    }
+
+
+def build_benchmarks(author: Any) -> dict[str, Callable[[], Any]]:
+    factory = RequestFactory()
+    context_request = SimpleNamespace(user=author, LANGUAGE_CODE="ru")
+    posts = list(Post.objects.filter(author=author).select_related("author", "category")[:200])
+    commented = Post.objects.filter(author=author, comment_count__gt=0).order_by("id").first()
+    benchmarks: dict[str, Callable[[], Any]] = {}
+
+    for size in PAGE_SIZES:
+        page = posts[:size]
+        post_ids = [post.id for post in page]
+        benchmarks[f"serializer.post_read[{size}]"] = lambda page=page: PostReadSerializer(
+            page, many=True, context={"request": context_request}
+        ).data
+        benchmarks[f"serializer.post_read_fast[{size}]"] = (
+            lambda post_ids=post_ids: PostReadSerializer.fast_data(
+                Post.objects.filter(id__in=post_ids),
+                context={"request": context_request, "canonical_dates": True},
+            )
+        )
+        # Same queryset shape as PostViewSet.comments, evaluated per call.
+        benchmarks[f"serializer.comment_read[{size}]"] = lambda size=size: CommentReadSerializer(
+            commented.comments.select_related("author").order_by("-created_at", "-id")[:size],
+            many=True,
+        ).data
+
+    anonymous = factory.get("/api/posts/", HTTP_ACCEPT_LANGUAGE="ru-RU,ru;q=0.9,en;q=0.8")
+    with_param = factory.get("/api/posts/", {"lang": "kk"})
+    benchmarks["middleware.detect_language[accept_language]"] = (
+        lambda: LanguageDetectionMiddleware._detect_language(anonymous, AnonymousUser())
+    )
+    benchmarks["middleware.detect_language[query_param]"] = (
+        lambda: LanguageDetectionMiddleware._detect_language(with_param, AnonymousUser())
+    )
+    benchmarks["middleware.detect_language[user]"] = (
+        lambda: LanguageDetectionMiddleware._detect_language(anonymous, author)
+    )
+
+    @ratelimit_or_429(key="ip", rate="1000000/m", method=("POST",), group="bench_suite")
+    def limited_view(request: Any) -> None:
+        return None
+
+    limited_request = factory.post("/api/posts/", REMOTE_ADDR="10.0.0.1")
+    limited_request.user = AnonymousUser()
+    benchmarks["ratelimit.ratelimit_or_429[allowed]"] = lambda: limited_view(limited_request)
+
+    comment = SimpleNamespace(
+        id=1,
+        post_id=commented.id,
+        author_id=author.id,
+        body="Benchmark comment body " * 4,
+        created_at=datetime.now(UTC),
+    )
+    benchmarks["events.publish_comment_created"] = lambda: publish_comment_created(comment)
+
+    list_view = PostViewSet.as_view({"get": "list"})
+
+    def list_request(**params: str) -> Callable[[], Any]:
+        def call() -> Any:
+            request = factory.get("/api/posts/", params, HTTP_ACCEPT="application/json")
+            request.LANGUAGE_CODE = "en"
+            response = list_view(request)
+            response.render()
+            if response.status_code != 200:
+                raise CommandError(f"Post list returned {response.status_code}")
+            return response
+
+        return call
+
+    benchmarks["view.post_list_cached[page]"] = list_request()
+    benchmarks["view.post_list_cached[page=2]"] = list_request(page="2")
+    benchmarks["view.post_list_cached[cursor]"] = list_request(pagination="cursor")
+
+    if metrics_enabled():
+        # The list view again, wrapped the way the middleware chain would.
+        list_page = list_request()
+        middleware = MetricsMiddleware(lambda request: list_page())
+        metrics_request = factory.get("/api/posts/")
+        middleware.process_view(metrics_request, list_view, (), {})
+        benchmarks["middleware.metrics[post_list_cached]"] = lambda: middleware(metrics_request)
+    return benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmarks for the post/comment serializers, language detection, the "
+        "rate limit wrapper, comment event publishing and the cached post list. Runs "
+        "against fakeredis by default so no network is needed. Save a baseline with "
+        "--save and check a later run against it with --compare."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--redis",
+            choices=["fake", "settings"],
+            default="fake",
+            help="fakeredis in-process, or the Redis from CACHES settings.",
+        )
+        parser.add_argument("--rounds", type=int, default=7)
+        parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this.")
+        parser.add_argument("--posts", type=int, default=500)
+        parser.add_argument(
+            "--metrics",
+            action="store_true",
+            help="Run with BLOG_METRICS_ENABLED on to measure the Prometheus instrumentation "
+            "against a baseline saved without it.",
+        )
+        parser.add_argument("--save", metavar="PATH", help="Write the results as a baseline file.")
+        parser.add_argument("--compare", metavar="PATH", help="Compare with a saved baseline.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Percent slowdown of the median counted as a regression.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as handle:
+                baseline = json.load(handle)
+
+        with ExitStack() as stack:
+            # DEBUG query logging would be part of every measurement.
+            stack.enter_context(override_settings(DEBUG=False, METRICS_ENABLED=options["metrics"]))
+            if options["metrics"] and not metrics_enabled():
+                raise CommandError("prometheus_client is not installed; pip install -r requirements/prod.txt")
+            if options["redis"] == "fake":
+                if fakeredis is None:
+                    raise CommandError(
+                        "fakeredis is not installed; pip install -r requirements/dev.txt"
+                    )
+                stack.enter_context(override_settings(CACHES=fake_redis_caches()))
+            results = self.run_benchmarks(options)
+
+        report = {
+            "meta": {
+                "created_at": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "redis": options["redis"],
+                "l1_cache": settings.L1_CACHE_ENABLED,
+                "metrics": options["metrics"],
+                "metrics_multiprocess": bool(options["metrics"] and multiprocess_dir()),
+            },
+            "results": results,
+        }
+        if options["save"]:
+            with open(options["save"], "w") as handle:
+                json.dump(report, handle, indent=2, sort_keys=True)
+                handle.write("\n")
+            self.stdout.write(f"Saved {len(results)} results to {options['save']}")
+        if baseline is not None:
+            self.compare(baseline, report, options["threshold"])
+
+    def run_benchmarks(self, options: dict[str, Any]) -> dict[str, dict[str, float]]:
+        results = {}
+        with transaction.atomic():
+            author = seed_bench_posts(options["posts"])
+            seed_bench_comments(author, posts=1, per_post=max(PAGE_SIZES))
+            first = Post.objects.filter(author=author).order_by("id").first()
+            Post.adjust_comment_count(first.id, max(PAGE_SIZES))
+            bump_list_cache_generation()
+
+            for name, func in build_benchmarks(author).items():
+                if options["filter"] not in name:
+                    continue
+                func()
+                results[name] = measure(func, options["rounds"])
+                self.stdout.write(
+                    f"{name:<48} {results[name]['median_us']:>12.1f} us "
+                    f"(min {results[name]['min_us']:.1f}, n={results[name]['number']})"
+                )
+            transaction.set_rollback(True)
+        bump_list_cache_generation()
+        return results
+
+    def compare(self, baseline: dict[str, Any], report: dict[str, Any], threshold: float) -> None:
+        if baseline["meta"].get("redis") != report["meta"]["redis"]:
+            self.stderr.write("Warning: baseline used a different Redis mode")
+        regressions = []
+        self.stdout.write(f"\n{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+        for name, current in report["results"].items():
+            before = baseline["results"].get(name)
+            if before is None:
+                self.stdout.write(f"{name:<48} {'-':>12} {current['median_us']:>12.1f}      new")
+                continue
+            change = (current["median_us"] / before["median_us"] - 1) * 100
+            flag = ""
+            if change > threshold:
+                regressions.append(name)
+                flag = "  REGRESSION"
+            self.stdout.write(
+                f"{name:<48} {before['median_us']:>12.1f} {current['median_us']:>12.1f} "
+                f"{change:>+7.1f}%{flag}"
+            )
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) slower than baseline by more than "
+                f"{threshold:g}%: {', '.join(regressions)}"
+            )
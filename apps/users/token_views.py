@@ -1,5 +1,5 @@
 import logging
-from typing import Any
+from typing import Any, ClassVar
 
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -27,6 +27,8 @@ logger = logging.getLogger("users")
     )
 )
 class TokenObtainPairRateLimitedView(TokenObtainPairView):
+    query_budgets: ClassVar[dict[str, int]] = {"post": 2}
+
     @ratelimit_or_429(key="ip", rate="10/m", method=("POST",), group="auth_token")
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         email = request.data.get("email")
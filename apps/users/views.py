@@ -1,5 +1,5 @@
 import logging
-from typing import Any
+from typing import Any, ClassVar
 
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
@@ -12,6 +12,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse, extend_schema_view
 
+from apps.core.stats import STATS_USERS_KEY, record_stat_change
 from apps.core.ratelimit import ratelimit_or_429
 from apps.users.serializers import UserCreateSerializer, UserSerializer, UserLanguageSerializer, UserTimezoneSerializer
 
@@ -73,6 +74,7 @@ def send_welcome_email(user):
 )
 class RegisterViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
+    query_budgets: ClassVar[dict[str, int]] = {"create": 2}
 
     @ratelimit_or_429(key="ip", rate="5/m", method=("POST",), group="auth_register")
     def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -87,6 +89,7 @@ class RegisterViewSet(viewsets.ViewSet):
         try:
             serializer.is_valid(raise_exception=True)
             user = serializer.save()
+            record_stat_change(STATS_USERS_KEY, 1)
         except Exception:
             logger.exception("Registration failed email=%s", email)
             raise
@@ -110,6 +113,7 @@ class RegisterViewSet(viewsets.ViewSet):
 
 class UserMeViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
+    query_budgets: ClassVar[dict[str, int]] = {"language": 2, "timezone": 2}
 
     @extend_schema(
         tags=["Auth"],
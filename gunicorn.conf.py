@@ -0,0 +1,37 @@
+# gunicorn -c gunicorn.conf.py settings.wsgi
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from settings.conf import env_bool, env_int, env_str
+
+bind = env_str("BLOG_GUNICORN_BIND", "0.0.0.0:8000")
+workers = env_int("BLOG_GUNICORN_WORKERS", default=multiprocessing.cpu_count() * 2 + 1)
+
+# prometheus_client picks its multiprocess value class from this variable
+# when the first metric is created, so it has to be set here, in the master,
+# before any worker imports the app.
+metrics_enabled = env_bool("BLOG_METRICS_ENABLED", default=False)
+if metrics_enabled:
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "blog_api_metrics")
+    )
+
+
+def on_starting(server):
+    # Samples left over from a previous master would be summed with the new ones.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_enabled and path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if not metrics_enabled:
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
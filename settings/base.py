@@ -1,7 +1,7 @@
 from datetime import timedelta
 from pathlib import Path
 
-from settings.conf import env_bool, env_list, env_str
+from settings.conf import env_bool, env_float, env_int, env_list, env_str
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -26,6 +26,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.metrics.MetricsMiddleware",
+    "apps.core.timing.ServerTimingMiddleware",
+    "apps.core.query_budget.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -33,7 +36,6 @@ MIDDLEWARE = [
     "apps.core.middleware.LanguageDetectionMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "apps.core.middleware.DebugRequestsMiddleware",
 ]
 
 ROOT_URLCONF = "settings.urls"
@@ -74,6 +76,7 @@ AUTH_PASSWORD_VALIDATORS = [
 REDIS_URL = env_str("BLOG_REDIS_URL", "redis://127.0.0.1:6379/1")
 
 RATELIMIT_FAIL_OPEN = True
+RATELIMIT_ENABLE = env_bool("BLOG_RATELIMIT_ENABLE", default=True)
 
 CACHES = {
     "default": {
@@ -83,6 +86,7 @@ CACHES = {
         "KEY_PREFIX": "blog_api",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "REDIS_CLIENT_CLASS": "apps.core.timing.TimedRedis",
             "SOCKET_CONNECT_TIMEOUT": 2,
             "SOCKET_TIMEOUT": 2,
             "IGNORE_EXCEPTIONS": True,
@@ -90,9 +94,41 @@ CACHES = {
     }
 }
 
+L1_CACHE_ENABLED = env_bool("BLOG_L1_CACHE_ENABLED", default=False)
+L1_CACHE_MAX_BYTES = 32 * 1024 * 1024
+L1_CACHE_TTL_SECONDS = 5
+L1_CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Serve cached post list/detail/comments GETs from native async views. Only
+# worth enabling under ASGI (settings.asgi); WSGI would run them in a loop.
+ASYNC_READ_VIEWS_ENABLED = env_bool("BLOG_ASYNC_READ_VIEWS_ENABLED", default=False)
+
+BULK_IMPORT_MAX_ITEMS = env_int("BLOG_BULK_IMPORT_MAX_ITEMS", default=1000)
+
+# Comment events: "stream" appends to a Redis stream read by the
+# listen_comments consumer group (nothing is lost while consumers are down,
+# up to MAXLEN entries); "pubsub" is fire-and-forget PUBLISH.
+COMMENT_EVENTS_BACKEND = env_str("BLOG_COMMENT_EVENTS_BACKEND", "stream")
+COMMENT_EVENTS_STREAM_MAXLEN = env_int("BLOG_COMMENT_EVENTS_STREAM_MAXLEN", default=100000)
+
+# Per-view query budgets (QueryBudgetMiddleware): "log" warns on overruns,
+# "raise" fails the request (CI), "off" disables the recording.
+QUERY_BUDGET_MODE = env_str("BLOG_QUERY_BUDGET_MODE", "log")
+
+# Fraction of requests (0..1) timed by ServerTimingMiddleware; 0 removes the
+# middleware. Sampled responses carry a Server-Timing header unless disabled.
+SERVER_TIMING_SAMPLE_RATE = env_float("BLOG_SERVER_TIMING_SAMPLE_RATE", default=0.0)
+SERVER_TIMING_HEADER = env_bool("BLOG_SERVER_TIMING_HEADER", default=True)
+
+# Prometheus metrics (MetricsMiddleware and /metrics); needs prometheus_client
+# (requirements/prod.txt). Under gunicorn, gunicorn.conf.py sets up the
+# multiprocess directory so all workers are aggregated.
+METRICS_ENABLED = env_bool("BLOG_METRICS_ENABLED", default=False)
+METRICS_TOKEN = env_str("BLOG_METRICS_TOKEN", "")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.core.authentication.TimedJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -139,14 +175,18 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 LOG_DIR = BASE_DIR / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# The app loggers write through a bounded queue drained by a background
+# thread (apps.core.log.BoundedQueueHandler) so slow stdout or disk does not
+# add to request latency. Policy when the queue is full: drop_new,
+# drop_oldest or block. BLOG_LOG_FORMAT=json writes one JSON event per line.
+LOG_QUEUE_ENABLED = env_bool("BLOG_LOG_QUEUE_ENABLED", default=True)
+LOG_QUEUE_MAXSIZE = env_int("BLOG_LOG_QUEUE_MAXSIZE", default=10000)
+LOG_QUEUE_POLICY = env_str("BLOG_LOG_QUEUE_POLICY", "drop_new")
+LOG_FORMAT = env_str("BLOG_LOG_FORMAT", "text")
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "filters": {
-        "require_debug_true": {
-            "()": "django.utils.log.RequireDebugTrue",
-        },
-    },
     "formatters": {
         "simple": {
             "format": "{levelname} {message}",
@@ -156,29 +196,31 @@ LOGGING = {
             "format": "{asctime} {levelname} {name} {module} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "apps.core.log.JSONFormatter",
+        },
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "level": "DEBUG",
-            "formatter": "simple",
+            "formatter": "json" if LOG_FORMAT == "json" else "simple",
         },
         "file": {
             "class": "logging.handlers.RotatingFileHandler",
             "level": "WARNING",
-            "formatter": "verbose",
+            "formatter": "json" if LOG_FORMAT == "json" else "verbose",
             "filename": str(LOG_DIR / "app.log"),
             "maxBytes": 5 * 1024 * 1024,
             "backupCount": 3,
         },
-        "debug_requests": {
+        "file_request_timing": {
             "class": "logging.handlers.RotatingFileHandler",
-            "level": "DEBUG",
-            "formatter": "verbose",
-            "filename": str(LOG_DIR / "debug_requests.log"),
+            "level": "INFO",
+            "formatter": "json" if LOG_FORMAT == "json" else "verbose",
+            "filename": str(LOG_DIR / "request_timing.log"),
             "maxBytes": 5 * 1024 * 1024,
             "backupCount": 3,
-            "filters": ["require_debug_true"],
         },
     },
     "loggers": {
@@ -197,10 +239,33 @@ LOGGING = {
             "level": "WARNING",
             "propagate": False,
         },
-        "debug.request": {
-            "handlers": ["debug_requests"],
-            "level": "DEBUG",
+        "request.timing": {
+            "handlers": ["file_request_timing"],
+            "level": "INFO",
             "propagate": False,
         },
     },
 }
+
+if LOG_QUEUE_ENABLED:
+    # dictConfig's QueueHandler support builds the "handlers" first, in any
+    # name order, and attaches a listener feeding them.
+    LOGGING["handlers"]["queue_app"] = {
+        "class": "apps.core.log.BoundedQueueHandler",
+        "handlers": ["console", "file"],
+        "queue": {"()": "queue.Queue", "maxsize": LOG_QUEUE_MAXSIZE},
+        "listener": "apps.core.log.BoundedQueueListener",
+        "respect_handler_level": True,
+        ".": {"policy": LOG_QUEUE_POLICY},
+    }
+    LOGGING["handlers"]["queue_request_timing"] = {
+        "class": "apps.core.log.BoundedQueueHandler",
+        "handlers": ["file_request_timing"],
+        "queue": {"()": "queue.Queue", "maxsize": LOG_QUEUE_MAXSIZE},
+        "listener": "apps.core.log.BoundedQueueListener",
+        "respect_handler_level": True,
+        ".": {"policy": LOG_QUEUE_POLICY},
+    }
+    LOGGING["loggers"]["users"]["handlers"] = ["queue_app"]
+    LOGGING["loggers"]["blog"]["handlers"] = ["queue_app"]
+    LOGGING["loggers"]["request.timing"]["handlers"] = ["queue_request_timing"]
@@ -37,6 +37,15 @@ def env_int(name: str, default: int | None = None) -> int | None:
     return int(value)
 
 
+def env_float(name: str, default: float | None = None) -> float | None:
+    if _CONFIG is not None:
+        return _CONFIG(name, default=default, cast=float)
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return float(value)
+
+
 def env_list(name: str, default: list[str] | None = None) -> list[str]:
     if default is None:
         default = []
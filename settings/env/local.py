@@ -1,7 +1,10 @@
 from settings.base import *
+from settings.base import INSTALLED_APPS
 
 DEBUG = True
 
+INSTALLED_APPS = [*INSTALLED_APPS, "apps.devtools"]
+
 ALLOWED_HOSTS = env_list("BLOG_ALLOWED_HOSTS", default=["localhost", "127.0.0.1"])
 
 DATABASES = {